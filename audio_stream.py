@@ -0,0 +1,100 @@
+import io
+import subprocess
+import wave
+from typing import Iterator, Optional, Tuple
+
+# whisper expects 16kHz mono audio; ffmpeg emits it as signed 16-bit little-endian PCM
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+BYTES_PER_SECOND = SAMPLE_RATE * BYTES_PER_SAMPLE
+
+
+def stream_pcm(audio_file_path: str, chunk_bytes: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Decode an audio file with ffmpeg and yield raw 16kHz mono s16le PCM in fixed-size buffers.
+
+    Nothing is written to disk; ffmpeg's stdout is read incrementally, so memory
+    use is bounded by chunk_bytes regardless of the recording's length. If the
+    consumer stops early, ffmpeg is terminated.
+
+    Args:
+        audio_file_path: Path to the input audio file (any format ffmpeg reads)
+        chunk_bytes: Size of each yielded buffer (the last one may be shorter)
+
+    Yields:
+        PCM byte buffers
+    """
+    chunk_bytes -= chunk_bytes % BYTES_PER_SAMPLE
+    process = subprocess.Popen(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", audio_file_path,
+         "-f", "s16le", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "pipe:1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    completed = False
+    try:
+        while True:
+            chunk = process.stdout.read(chunk_bytes)
+            if not chunk:
+                break
+            yield chunk
+        completed = True
+    finally:
+        if not completed:
+            process.kill()
+        process.stdout.close()
+        stderr = process.stderr.read().decode("utf-8", errors="replace")
+        process.stderr.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {audio_file_path}: {stderr.strip()}")
+
+
+def pcm_windows(chunks: Iterator[bytes], window_seconds: float) -> Iterator[Tuple[float, bytes]]:
+    """
+    Regroup PCM buffers into fixed-length windows.
+
+    Args:
+        chunks: PCM buffers, e.g. from stream_pcm
+        window_seconds: Length of each window
+
+    Yields:
+        (offset in seconds of the window's start, PCM bytes of the window)
+    """
+    window_bytes = int(window_seconds * SAMPLE_RATE) * BYTES_PER_SAMPLE
+    buffer = bytearray()
+    offset_bytes = 0
+    for chunk in chunks:
+        buffer.extend(chunk)
+        while len(buffer) >= window_bytes:
+            yield offset_bytes / BYTES_PER_SECOND, bytes(buffer[:window_bytes])
+            del buffer[:window_bytes]
+            offset_bytes += window_bytes
+    if buffer:
+        yield offset_bytes / BYTES_PER_SECOND, bytes(buffer)
+
+
+def pcm_to_wav_bytes(pcm: bytes) -> bytes:
+    """Wrap raw 16kHz mono s16le PCM in an in-memory WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(BYTES_PER_SAMPLE)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def wav_duration_seconds(wav_path: str) -> Optional[float]:
+    """Length of a WAV file from its header, or None if it cannot be read."""
+    try:
+        with wave.open(wav_path, "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (OSError, wave.Error, EOFError):
+        return None
+
+
+def pcm_to_float32(pcm: bytes):
+    """Convert s16le PCM to a float32 NumPy array in [-1, 1], as openai-whisper expects."""
+    import numpy as np
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
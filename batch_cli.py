@@ -0,0 +1,364 @@
+"""
+Process a directory (or manifest) of recordings through the same pipeline as
+web uploads: ffmpeg preprocessing, whisper transcription and summarization,
+with results written to MongoDB.
+
+Each stage has its own worker pool, so whisper, ffmpeg and Ollama work on
+different files at the same time. Files whose content hash already has a
+record are skipped, results are saved in batches with insert_many, and every
+finished file is appended to a journal, so an interrupted run can simply be
+started again.
+
+Usage:
+    python batch_cli.py recordings/ --whisper-model base --llm-model llama2
+    python batch_cli.py manifest.txt --summarize-workers 4 --journal nightly.jsonl
+
+A manifest lists one audio path per line (relative to the manifest), or JSON
+lines with "path" and optionally "context".
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import main
+from job_queue import Job
+from transcript_cache import hash_file
+from transcript_segments import duration_seconds, parse_segments
+
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".ogg", ".opus", ".flac", ".aac", ".webm", ".mp4", ".wma"}
+PROGRESS_INTERVAL_SECONDS = 30
+
+
+def find_inputs(source: str, context: str) -> List[Dict]:
+    """Audio files from a directory (recursively) or a manifest file, as {"path", "context"} items."""
+    if os.path.isdir(source):
+        items = []
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS:
+                    items.append({"path": os.path.join(root, name), "context": context})
+        return sorted(items, key=lambda item: item["path"])
+
+    base = os.path.dirname(os.path.abspath(source))
+    items = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            item = json.loads(line) if line.startswith("{") else {"path": line}
+            item["path"] = os.path.join(base, item["path"])
+            item.setdefault("context", context)
+            items.append(item)
+    return items
+
+
+class Journal:
+    def __init__(self, path: str):
+        """Append-only JSON lines record of finished files; completed hashes are skipped on the next run."""
+        self.path = path
+        self._lock = threading.Lock()
+        self.completed: set = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Partial line from a crash mid-write
+                        continue
+                    if entry.get("status") in ("done", "duplicate"):
+                        self.completed.add(entry["audio_hash"])
+
+    def write(self, **entry):
+        entry["time"] = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if entry.get("status") in ("done", "duplicate"):
+                self.completed.add(entry["audio_hash"])
+
+
+class BatchPipeline:
+    def __init__(self, args):
+        self.args = args
+        self.journal = Journal(args.journal)
+        self.db_manager = main.get_database_manager()
+        self.pools = {
+            "hash": ThreadPoolExecutor(args.hash_workers, thread_name_prefix="batch-hash"),
+            "preprocess": ThreadPoolExecutor(args.preprocess_workers, thread_name_prefix="batch-preprocess"),
+            "transcribe": ThreadPoolExecutor(args.transcribe_workers, thread_name_prefix="batch-transcribe"),
+            "summarize": ThreadPoolExecutor(args.summarize_workers, thread_name_prefix="batch-summarize"),
+        }
+        # Files past hashing at once; bounds temporary WAVs on disk and work lost on a crash
+        self.in_flight = threading.BoundedSemaphore(args.max_in_flight)
+        self.results: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._seen_hashes: set = set()
+        self.pending = 0
+        self.counts = {"done": 0, "failed": 0, "skipped": 0}
+        self.audio_seconds = 0.0
+        self.all_submitted = threading.Event()
+        self.finished = threading.Event()
+
+    def run(self, items: List[Dict]) -> int:
+        self.started = time.perf_counter()
+        writer = threading.Thread(target=self._write_results, name="batch-writer", daemon=True)
+        writer.start()
+        reporter = threading.Thread(target=self._report_progress, name="batch-progress", daemon=True)
+        reporter.start()
+
+        with self._lock:
+            self.pending = len(items)
+        for item in items:
+            self.pools["hash"].submit(self._hash, item)
+        self.all_submitted.set()
+        with self._lock:
+            # Every file may already have finished while the rest were being submitted
+            if self.pending == 0:
+                self.finished.set()
+        self.finished.wait()
+
+        self.results.put(None)
+        writer.join()
+        for pool in self.pools.values():
+            pool.shutdown(wait=True)
+        self._print_progress(final=True)
+        return 1 if self.counts["failed"] else 0
+
+    # Stages
+
+    def _hash(self, item: Dict):
+        # Stages run on pool threads whose futures are never read, so every error must end in _fail;
+        # a file that never finishes would leave run() waiting forever
+        try:
+            audio_hash = hash_file(item["path"])
+        except OSError as e:
+            return self._fail(item, None, f"Cannot read file: {e}")
+        except Exception as e:
+            return self._fail(item, None, f"hash failed: {e}")
+        try:
+            self._start(item, audio_hash)
+        except Exception as e:
+            self._fail(item, audio_hash, f"hash failed: {e}")
+
+    def _start(self, item: Dict, audio_hash: str):
+        with self._lock:
+            duplicate_in_run = audio_hash in self._seen_hashes
+            self._seen_hashes.add(audio_hash)
+        if duplicate_in_run or audio_hash in self.journal.completed:
+            return self._skip(item, audio_hash, None)
+        if self.db_manager.get_existing_hashes([audio_hash]):
+            self.journal.write(status="duplicate", path=item["path"], audio_hash=audio_hash)
+            return self._skip(item, audio_hash, "already in database")
+
+        job = Job({
+            "audio_path": item["path"],
+            "audio_hash": audio_hash,
+            "audio_filename": os.path.basename(item["path"]),
+            "context": item.get("context", ""),
+            "whisper_model_name": self.args.whisper_model,
+            "llm_model_name": self.args.llm_model,
+            "generation_profile": self.args.profile,
+        }, ["preprocess", "transcribe", "summarize"], owner=self.args.user_id)
+        job.started_at = datetime.now()
+        self.in_flight.acquire()
+        try:
+            self._submit("preprocess", self._detect_and_preprocess, job, "transcribe")
+        except Exception:
+            self.in_flight.release()
+            raise
+
+    @staticmethod
+    def _detect_and_preprocess(job: Job):
+        # Language detection decodes the first seconds of audio, so it shares the ffmpeg pool
+        start = time.perf_counter()
+        main._job_detect(job)
+        job.stage_timings["detect"] = round(time.perf_counter() - start, 3)
+        main._job_preprocess(job)
+
+    def _submit(self, stage: str, function, job: Job, next_stage: Optional[str]):
+        def run():
+            start = time.perf_counter()
+            try:
+                function(job)
+                job.stage_timings[stage] = round(time.perf_counter() - start, 3)
+                if next_stage == "transcribe":
+                    self._submit("transcribe", main._job_transcribe, job, "summarize")
+                elif next_stage == "summarize":
+                    self._submit("summarize", main._job_summarize, job, None)
+                else:
+                    self.results.put(job)
+                    self.in_flight.release()
+            except Exception as e:
+                self._abandon(job, f"{stage} failed: {e}")
+        self.pools[stage].submit(run)
+
+    def _abandon(self, job: Job, error: str):
+        """Fail a job that holds an in-flight slot, removing its temporary WAV."""
+        try:
+            if "audio_wav" in job.state and os.path.exists(job.state["audio_wav"]):
+                os.remove(job.state["audio_wav"])
+        except OSError as e:
+            print(f"Could not remove {job.state['audio_wav']}: {e}")
+        finally:
+            self.in_flight.release()
+        self._fail(job.params, job.params["audio_hash"], error)
+
+    def _write_results(self):
+        """Collect finished jobs and save them with insert_many in batches."""
+        batch: List[Job] = []
+        last_flush = time.monotonic()
+        while True:
+            try:
+                job = self.results.get(timeout=1)
+            except queue.Empty:
+                job = False
+            if job:
+                batch.append(job)
+            due = time.monotonic() - last_flush >= self.args.flush_seconds
+            with self._lock:
+                # Nothing else left to wait for
+                last = len(batch) >= self.pending
+            if batch and (job is None or len(batch) >= self.args.batch_size or due or last):
+                self._save(batch)
+                batch = []
+                last_flush = time.monotonic()
+            if job is None:
+                return
+
+    def _save(self, batch: List[Job]):
+        try:
+            record_ids = self._insert(batch)
+        except Exception as e:
+            for job in batch:
+                self._fail(job.params, job.params["audio_hash"], f"save failed: {e}")
+            return
+        for i, job in enumerate(batch):
+            if i >= len(record_ids):
+                self._fail(job.params, job.params["audio_hash"], "Failed to save transcription to database")
+                continue
+            try:
+                audio_seconds = duration_seconds(parse_segments(job.state["transcript"])) or 0
+                self.journal.write(status="done", path=job.params["audio_path"],
+                                   audio_hash=job.params["audio_hash"], record_id=record_ids[i],
+                                   audio_seconds=audio_seconds, stage_timings=job.stage_timings)
+            except Exception as e:
+                # The record is saved, but without a journal entry the next run would not skip the file
+                self._fail(job.params, job.params["audio_hash"], f"saved as {record_ids[i]} but {e}")
+                continue
+            with self._lock:
+                self.audio_seconds += audio_seconds
+            self._finish("done")
+
+    def _insert(self, batch: List[Job]) -> List[str]:
+        return self.db_manager.save_transcriptions([{
+            "audio_filename": job.params["audio_filename"],
+            "transcript": job.state["transcript"],
+            "summary": job.state["summary"],
+            "whisper_model": job.state["route"].whisper_model,
+            "llm_model": job.state["route"].llm_model,
+            "context": job.params["context"],
+            "user_id": job.owner,
+            "processing_seconds": (datetime.now() - job.started_at).total_seconds(),
+            "audio_hash": job.params["audio_hash"],
+            "language": job.state["route"].language,
+        } for job in batch])
+
+    # Bookkeeping
+
+    def _skip(self, item: Dict, audio_hash: Optional[str], reason: Optional[str]):
+        if reason:
+            print(f"Skipping {item['path']}: {reason}")
+        self._finish("skipped")
+
+    def _fail(self, item: Dict, audio_hash: Optional[str], error: str):
+        path = item.get("path") or item.get("audio_path")
+        print(f"Failed {path}: {error}")
+        try:
+            self.journal.write(status="failed", path=path, audio_hash=audio_hash, error=error)
+        except OSError as e:
+            print(f"Could not write to the journal: {e}")
+        finally:
+            self._finish("failed")
+
+    def _finish(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+            self.pending -= 1
+            done = self.pending == 0
+        if done and self.all_submitted.is_set():
+            self.finished.set()
+
+    def _report_progress(self):
+        while not self.finished.wait(PROGRESS_INTERVAL_SECONDS):
+            self._print_progress()
+
+    def _print_progress(self, final: bool = False):
+        elapsed = time.perf_counter() - self.started
+        with self._lock:
+            counts, audio_seconds, pending = dict(self.counts), self.audio_seconds, self.pending
+        rate = audio_seconds / elapsed if elapsed else 0.0
+        label = "Finished" if final else "Progress"
+        print(f"{label}: {counts['done']} done, {counts['skipped']} skipped, {counts['failed']} failed, "
+              f"{pending} remaining | {audio_seconds / 3600:.2f} audio hours in {elapsed / 3600:.2f} h "
+              f"= {rate:.2f} audio-hours per wall-clock hour")
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Directory of recordings or a manifest file")
+    parser.add_argument("--whisper-model", default=main.AUTO_MODEL, help='Whisper model ("auto" routes by language)')
+    parser.add_argument("--llm-model", default=main.AUTO_MODEL, help='Ollama model ("auto" routes by language)')
+    parser.add_argument("--profile", default=main.DEFAULT_GENERATION_PROFILE, choices=list(main.GENERATION_PROFILES),
+                        help="Ollama generation profile")
+    parser.add_argument("--context", default="", help="Context for every summary (manifest entries can override)")
+    parser.add_argument("--user-id", help="Owner of the saved records (default: visible to every user)")
+    parser.add_argument("--journal", default="batch_journal.jsonl", help="Progress journal used to resume")
+    parser.add_argument("--hash-workers", type=int, default=2)
+    parser.add_argument("--preprocess-workers", type=int, default=cpus, help="ffmpeg conversions at once")
+    parser.add_argument("--transcribe-workers", type=int, default=max(1, cpus // 4),
+                        help="Files transcribed at once (each uses ~4 whisper threads; VAD chunks of a file "
+                             "run in parallel only when this leaves CPUs spare)")
+    parser.add_argument("--summarize-workers", type=int, default=2 * len(main.OLLAMA_SERVER_URLS),
+                        help="Concurrent Ollama generations")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Files between hashing and saving at once (default: 2x all stage workers)")
+    parser.add_argument("--batch-size", type=int, default=20, help="Records per insert_many")
+    parser.add_argument("--flush-seconds", type=float, default=30, help="Save a partial batch after this long")
+    args = parser.parse_args(argv)
+    if args.max_in_flight is None:
+        args.max_in_flight = 2 * (args.preprocess_workers + args.transcribe_workers + args.summarize_workers)
+    # Each transcribe worker fans VAD chunks out to WHISPER_CHUNK_WORKERS whisper runs; size the two
+    # pools together so the whisper threads of both do not oversubscribe the CPU
+    main.WHISPER_CHUNK_WORKERS = max(1, main.WHISPER_CHUNK_WORKERS // args.transcribe_workers)
+
+    main.model_registry.whisper_models()
+    main.model_registry.llm_models()
+    model_error = main.validate_models(args.whisper_model, args.llm_model)
+    if model_error:
+        print(model_error, file=sys.stderr)
+        return 2
+
+    items = find_inputs(args.source, args.context)
+    print(f"Found {len(items)} recordings in {args.source}")
+    main.register_database_listeners()
+    try:
+        return BatchPipeline(args).run(items)
+    finally:
+        main.semantic_search.shutdown()
+        main.transcription_engine.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
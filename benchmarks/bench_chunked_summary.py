@@ -0,0 +1,108 @@
+"""
+Compare wall-clock time of single-prompt and chunked (map-reduce) summarization
+on long synthetic transcripts.
+
+By default the LLM is simulated with a latency model in which prompt evaluation
+grows quadratically with prompt length, so the benchmark runs offline. Pass
+--ollama-url to measure a real Ollama server instead.
+
+Usage:
+    python -m benchmarks.bench_chunked_summary --hours 1 2 4
+    python -m benchmarks.bench_chunked_summary --ollama-url http://localhost:11434 --model llama2 --hours 1
+"""
+import argparse
+import random
+import time
+
+import requests
+
+from chunked_summarizer import ChunkedSummarizer, count_tokens
+
+WORDS = (
+    "budget roadmap release customer feedback deadline hiring design review "
+    "migration database latency incident follow-up owner decision risk estimate"
+).split()
+
+
+def synthetic_transcript(hours: float, words_per_minute: int = 150, seed: int = 0) -> str:
+    """Build a whisper.cpp style transcript with one timestamped segment every 5 seconds."""
+    rng = random.Random(seed)
+    lines = []
+    seconds = 0
+    while seconds < hours * 3600:
+        words = " ".join(rng.choice(WORDS) for _ in range(words_per_minute // 12))
+        start = time.strftime("%H:%M:%S", time.gmtime(seconds))
+        end = time.strftime("%H:%M:%S", time.gmtime(seconds + 5))
+        lines.append(f"[{start}.000 --> {end}.000]   {words}")
+        seconds += 5
+    return "\n".join(lines)
+
+
+def simulated_generate(args):
+    """Latency model: quadratic prompt evaluation plus linear generation, scaled by --time-scale."""
+    def generate(prompt: str) -> str:
+        tokens = count_tokens(prompt)
+        seconds = args.prompt_eval_quadratic * tokens * tokens + args.prompt_eval_linear * tokens
+        seconds += args.output_tokens / args.tokens_per_second
+        time.sleep(seconds * args.time_scale)
+        return "summary " * args.output_tokens
+    return generate
+
+
+def ollama_generate(args):
+    def generate(prompt: str) -> str:
+        response = requests.post(
+            f"{args.ollama_url}/api/generate",
+            json={"model": args.model, "prompt": prompt, "stream": False},
+            timeout=3600,
+        )
+        response.raise_for_status()
+        return response.json()["response"]
+    return generate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, nargs="+", default=[0.5, 1, 2, 4])
+    parser.add_argument("--chunk-tokens", type=int, default=3000)
+    parser.add_argument("--overlap-tokens", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fan-in", type=int, default=8)
+    parser.add_argument("--ollama-url", help="Benchmark a real Ollama server instead of the simulation")
+    parser.add_argument("--model", default="llama2")
+    # Simulation parameters (seconds)
+    parser.add_argument("--prompt-eval-quadratic", type=float, default=5e-8)
+    parser.add_argument("--prompt-eval-linear", type=float, default=5e-3)
+    parser.add_argument("--tokens-per-second", type=float, default=20.0)
+    parser.add_argument("--output-tokens", type=int, default=300)
+    parser.add_argument("--time-scale", type=float, default=0.01, help="Multiply simulated sleeps by this factor")
+    args = parser.parse_args()
+
+    generate = ollama_generate(args) if args.ollama_url else simulated_generate(args)
+    scale = 1.0 if args.ollama_url else 1.0 / args.time_scale
+    summarizer = ChunkedSummarizer(
+        generate,
+        chunk_tokens=args.chunk_tokens,
+        overlap_tokens=args.overlap_tokens,
+        max_concurrency=args.concurrency,
+        reduce_fan_in=args.fan_in,
+    )
+
+    print(f"{'hours':>6} {'tokens':>9} {'single (s)':>11} {'chunked (s)':>12} {'speedup':>8}")
+    for hours in args.hours:
+        transcript = synthetic_transcript(hours)
+        tokens = count_tokens(transcript)
+
+        start = time.perf_counter()
+        generate(f"Please summarize the transcript.\n\n{transcript}")
+        single = (time.perf_counter() - start) * scale
+
+        start = time.perf_counter()
+        summarizer.summarize("", transcript)
+        chunked = (time.perf_counter() - start) * scale
+
+        print(f"{hours:>6} {tokens:>9} {single:>11.1f} {chunked:>12.1f} {single / chunked:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
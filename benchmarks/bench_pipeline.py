@@ -0,0 +1,342 @@
+"""
+End-to-end load test of the web app with local stand-ins for its services.
+
+The FastAPI app runs under uvicorn in this process with a fake Ollama server
+(benchmarks/fakes.py), a fake whisper backend and mongomock (or a local mongod
+with --mongo-uri). Each scenario drives it at several concurrency levels:
+
+    upload   POST /summarize with the sample files in uploads/, then poll /jobs/{id}
+             until the job finishes (ffmpeg, VAD, whisper, summary, save)
+    history  GET /history against --seed-records stored transcriptions (needs --mongo-uri;
+             mongomock does not implement the $substrCP previews)
+
+and reports p50/p95/p99 latency, throughput and peak RSS. Results are saved as
+JSON; pass an earlier file with --compare to print the change per scenario.
+Requires ffmpeg and, without --mongo-uri, `pip install mongomock`. The load
+generator runs in the same process, so RSS includes it.
+
+Usage:
+    python -m benchmarks.bench_pipeline --concurrency 1 4 16 --requests 32
+    python -m benchmarks.bench_pipeline --scenarios upload --rtf 0.05 --tokens-per-second 30 \\
+        --compare benchmarks/results/bench_pipeline-20250101-120000.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import socket
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+import uvicorn
+
+from audio_stream import stream_pcm
+from benchmarks.fakes import FakeOllamaServer, FakeWhisperBackend
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+AUDIO_EXTENSIONS = (".mp3", ".opus", ".wav", ".m4a", ".ogg", ".flac")
+JOB_POLL_SECONDS = 0.05
+
+
+class RssSampler:
+    def __init__(self, interval: float = 0.05):
+        """Tracks the peak resident set size of this process between start() and stop()."""
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def current_bytes() -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            # Lifetime peak in KiB (Linux) or bytes (macOS); only an upper bound per scenario
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if platform.system() == "Darwin" else peak * 1024
+
+    def start(self):
+        self.peak_bytes = self.current_bytes()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> int:
+        self._stop.set()
+        self._thread.join()
+        return self.peak_bytes
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def audio_seconds(path: str) -> float:
+    return sum(len(pcm) for pcm in stream_pcm(path)) / 32000
+
+
+def setup_app(args, workdir: str):
+    """Import the app and point its services at the stand-ins."""
+    import database_manager
+    if args.mongo_uri:
+        database_manager._db_manager = database_manager.DatabaseManager(args.mongo_uri, "meeting_summarizer_bench")
+    else:
+        import mongomock
+        database_manager.MongoClient = mongomock.MongoClient
+
+    import main
+    import summary_cache
+    import transcript_cache
+    from ollama_client import OllamaClient
+    from transcription_engine import TranscriptionEngine
+
+    ollama = FakeOllamaServer(
+        models=[args.llm_model], first_token_seconds=args.first_token_seconds,
+        prompt_tokens_per_second=args.prompt_tokens_per_second, tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+    ).start()
+    main.ollama_client.close()
+    main.ollama_client = OllamaClient([ollama.url], connect_timeout=main.OLLAMA_CONNECT_TIMEOUT,
+                                      read_timeout=main.OLLAMA_READ_TIMEOUT, max_retries=main.OLLAMA_MAX_RETRIES)
+    main.transcription_engine = TranscriptionEngine(
+        FakeWhisperBackend(realtime_factor=args.rtf, load_seconds=args.load_seconds))
+
+    # Keep uploads, caches and the vector index out of the working tree
+    main.UPLOAD_DIR = os.path.join(workdir, "uploads")
+    main.SEMANTIC_INDEX_DIR = os.path.join(workdir, "semantic")
+    main.semantic_search = main.create_semantic_search()
+    transcript_cache._transcript_cache = transcript_cache.TranscriptCache(os.path.join(workdir, "transcripts"))
+    summary_cache._summary_cache = summary_cache.SummaryCache()
+    if not args.warm_cache:
+        transcript_cache._transcript_cache.get = lambda *a, **k: None
+    return main, ollama
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="uvicorn", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def sign_in(client: httpx.AsyncClient):
+    credentials = {"email": "bench@example.com", "password": "benchmark"}
+    # Fails harmlessly once the account exists
+    await client.post("/signup", data={"username": "bench", "confirm_password": "benchmark", **credentials})
+    client.cookies.clear()
+    response = await client.post("/signin", data=credentials)
+    client.cookies.set("access_token", response.cookies["access_token"])
+
+
+async def upload_request(client: httpx.AsyncClient, i: int, files: List[str], args) -> bool:
+    path = files[i % len(files)]
+    # A distinct context per request keeps the summary cache cold unless --warm-cache
+    context = "benchmark" if args.warm_cache else f"benchmark request {i}"
+    with open(path, "rb") as f:
+        response = await client.post(
+            "/summarize",
+            files={"audio_file": (os.path.basename(path), f.read())},
+            data={"context": context, "whisper_model_name": args.whisper_model, "llm_model_name": args.llm_model},
+        )
+    match = re.search(r'data-job-id="([0-9a-f]+)"', response.text)
+    if response.status_code != 200 or not match:
+        return False
+    while True:
+        job = (await client.get(f"/jobs/{match.group(1)}")).json()
+        if job["status"] in ("completed", "failed"):
+            return job["status"] == "completed"
+        await asyncio.sleep(JOB_POLL_SECONDS)
+
+
+async def history_request(client: httpx.AsyncClient, i: int, files: List[str], args) -> bool:
+    response = await client.get("/history")
+    return response.status_code == 200 and "seed-" in response.text
+
+
+SCENARIOS = {"upload": upload_request, "history": history_request}
+
+
+async def run_scenario(base_url: str, name: str, concurrency: int, requests: int, files: List[str], args) -> Dict:
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=3600, limits=limits) as client:
+        await sign_in(client)
+        latencies: List[float] = []
+        errors = 0
+        next_request = 0
+
+        async def worker():
+            nonlocal next_request, errors
+            while next_request < requests:
+                i = next_request
+                next_request += 1
+                start = time.perf_counter()
+                try:
+                    ok = await SCENARIOS[name](client, i, files, args)
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        sampler = RssSampler()
+        sampler.start()
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+        peak_rss = sampler.stop()
+
+    result = {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_per_second": round(len(latencies) / wall, 3) if wall else 0.0,
+        "peak_rss_mb": round(peak_rss / 1024 ** 2, 1),
+    }
+    if latencies:
+        result.update({
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+        })
+    if name == "upload":
+        audio = sum(args.audio_seconds[files[i % len(files)]] for i in range(requests))
+        result["audio_hours_per_hour"] = round(audio / wall, 2) if wall else 0.0
+    return result
+
+
+def seed_history(main, records: int):
+    db_manager = main.get_database_manager()
+    transcript = "\n".join(f"[00:00:{s:02d}.000 --> 00:00:{s + 1:02d}.000]  segment {s}" for s in range(50))
+    db_manager.save_transcriptions([{
+        "audio_filename": f"seed-{i}.mp3", "transcript": transcript, "summary": f"Seeded summary {i}",
+        "whisper_model": "base", "llm_model": "llama2", "context": "", "user_id": None,
+    } for i in range(records)])
+
+
+def compare(results: List[Dict], baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["scenario"], r["concurrency"]): r for r in json.load(f)["scenarios"]}
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        old = baseline.get((result["scenario"], result["concurrency"]))
+        if not old or "p50_ms" not in old or "p50_ms" not in result:
+            continue
+        changes = ", ".join(
+            f"{metric} {old[metric]} -> {result[metric]} ({(result[metric] - old[metric]) / old[metric]:+.1%})"
+            for metric in ("p50_ms", "p95_ms", "throughput_per_second", "peak_rss_mb") if old.get(metric)
+        )
+        print(f"  {result['scenario']} x{result['concurrency']}: {changes}")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS),
+                        help="Default: upload, plus history with --mongo-uri")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=16, help="Requests per scenario and concurrency level")
+    parser.add_argument("--files", nargs="*", help="Audio files to upload (default: the samples in uploads/)")
+    parser.add_argument("--whisper-model", default="base")
+    parser.add_argument("--llm-model", default="llama2")
+    parser.add_argument("--rtf", type=float, default=0.1, help="Fake whisper inference seconds per audio second")
+    parser.add_argument("--load-seconds", type=float, default=1.0, help="Fake whisper model load time")
+    parser.add_argument("--first-token-seconds", type=float, default=0.2)
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=2000)
+    parser.add_argument("--tokens-per-second", type=float, default=50)
+    parser.add_argument("--output-tokens", type=int, default=100)
+    parser.add_argument("--warm-cache", action="store_true", help="Allow transcript and summary cache hits")
+    parser.add_argument("--seed-records", type=int, default=200, help="Records stored before the history scenario")
+    parser.add_argument("--mongo-uri", help="Use this mongod (database meeting_summarizer_bench) instead of mongomock")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/bench_pipeline-<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+    if args.scenarios is None:
+        args.scenarios = ["upload", "history"] if args.mongo_uri else ["upload"]
+    elif "history" in args.scenarios and not args.mongo_uri:
+        print("Skipping history: mongomock cannot run its aggregation, pass --mongo-uri")
+        args.scenarios.remove("history")
+
+    files = args.files or sorted(
+        os.path.join("uploads", name) for name in os.listdir("uploads") if name.lower().endswith(AUDIO_EXTENSIONS)
+    )
+    args.audio_seconds = {path: audio_seconds(path) for path in files}
+
+    workdir = tempfile.mkdtemp(prefix="bench-pipeline-")
+    app_module, ollama = setup_app(args, workdir)
+    if "history" in args.scenarios and args.seed_records:
+        seed_history(app_module, args.seed_records)
+    port = free_port()
+    server = start_server(app_module.app, port)
+
+    results = []
+    try:
+        print(f"{'scenario':<8} {'conc':>4} {'ok':>4} {'err':>4} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} "
+              f"{'req/s':>7} {'RSS (MB)':>9}")
+        for name in args.scenarios:
+            for concurrency in args.concurrency:
+                result = asyncio.run(run_scenario(f"http://127.0.0.1:{port}", name, concurrency, args.requests,
+                                                  files, args))
+                results.append(result)
+                print(f"{name:<8} {concurrency:>4} {args.requests - result['errors']:>4} {result['errors']:>4} "
+                      f"{result.get('p50_ms', 0):>9.1f} {result.get('p95_ms', 0):>9.1f} "
+                      f"{result.get('p99_ms', 0):>9.1f} {result['throughput_per_second']:>7.2f} "
+                      f"{result['peak_rss_mb']:>9.1f}")
+    finally:
+        server.should_exit = True
+        ollama.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    config = {key: value for key, value in vars(args).items() if key not in ("audio_seconds", "output", "compare")}
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "config": config,
+        "scenarios": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_pipeline-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
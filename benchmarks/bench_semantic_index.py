@@ -0,0 +1,82 @@
+"""
+Measure SemanticIndex build time and query latency at different index sizes.
+
+Vectors are random unit vectors, so no embedding model is needed; query cost
+depends only on the number of chunks and the vector dimension.
+
+Usage:
+    python -m benchmarks.bench_semantic_index --chunks 10000 100000
+    python -m benchmarks.bench_semantic_index --chunks 100000 --dim 384 --batch 32 --on-disk
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from semantic_index import SemanticIndex
+
+
+def build_index(chunks: int, dim: int, chunks_per_record: int, directory, seed: int = 0) -> SemanticIndex:
+    """Fill an index with random vectors, chunks_per_record rows per record."""
+    rng = np.random.default_rng(seed)
+    index = SemanticIndex(directory)
+    for record in range(0, chunks, chunks_per_record):
+        rows = min(chunks_per_record, chunks - record)
+        vectors = rng.standard_normal((rows, dim), dtype=np.float32)
+        index.add(f"record-{record}", [{"kind": "transcript", "text": "chunk"}] * rows, vectors,
+                  user_id=f"user-{record % 10}")
+    index.save()
+    return index
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=768, help="768 for nomic-embed-text, 384 for MiniLM")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=16, help="Queries scored together in the batched run")
+    parser.add_argument("--chunks-per-record", type=int, default=50)
+    parser.add_argument("--on-disk", action="store_true", help="Use a memory-mapped index in a temp directory")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    print(f"{'chunks':>8} {'build (s)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+          f"{'user p50':>9} {f'batch{args.batch} (ms/q)':>16}")
+    for chunks in args.chunks:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            index = build_index(chunks, args.dim, args.chunks_per_record, directory if args.on_disk else None)
+            build = time.perf_counter() - start
+
+            queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+            single = []
+            for query in queries:
+                start = time.perf_counter()
+                index.search(query, k=args.k)
+                single.append((time.perf_counter() - start) * 1000)
+
+            scoped = []
+            for query in queries[:50]:
+                start = time.perf_counter()
+                index.search(query, k=args.k, user_id="user-3")
+                scoped.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            for i in range(0, len(queries), args.batch):
+                index.search(queries[i:i + args.batch], k=args.k)
+            batched = (time.perf_counter() - start) * 1000 / len(queries)
+
+            print(f"{chunks:>8} {build:>10.2f} {statistics.median(single):>9.2f} {percentile(single, 95):>9.2f} "
+                  f"{statistics.median(scoped):>9.2f} {batched:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
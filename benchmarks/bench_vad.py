@@ -0,0 +1,107 @@
+"""
+Report how much audio voice activity detection removes from recordings, how
+many 30 second whisper windows the chunks cost compared with the whole file
+and, optionally, the end-to-end transcription speedup from VAD plus parallel chunks.
+
+Without --whisper-model only ffmpeg is needed: each file is decoded and run
+through the detector. With --whisper-model every file is also transcribed
+twice through main.transcribe_audio_file, once with VAD disabled (whole file)
+and once enabled, using the backend configured in main.py.
+
+Usage:
+    python -m benchmarks.bench_vad
+    python -m benchmarks.bench_vad uploads/hindi-audio.mp3 --whisper-model base --workers 4
+"""
+import argparse
+import math
+import os
+import time
+
+from audio_stream import BYTES_PER_SECOND, stream_pcm
+from vad import VoiceActivityDetector
+
+WHISPER_WINDOW_SECONDS = 30
+
+
+def analyze(path: str, options: dict) -> dict:
+    detector = VoiceActivityDetector(**options)
+    start = time.perf_counter()
+    chunk_lengths = [len(pcm) for _, pcm in detector.split(stream_pcm(path))]
+    return {
+        "audio_seconds": detector.audio_seconds,
+        "speech_seconds": detector.speech_seconds,
+        "chunks": len(chunk_lengths),
+        # whisper encodes audio in 30s windows, padding the last one
+        "windows": sum(math.ceil(length / BYTES_PER_SECOND / WHISPER_WINDOW_SECONDS) for length in chunk_lengths),
+        "full_windows": math.ceil(detector.audio_seconds / WHISPER_WINDOW_SECONDS),
+        "decode_and_vad_seconds": time.perf_counter() - start,
+    }
+
+
+def timed_transcription(main, path: str, model: str, vad: bool) -> float:
+    main.VAD_ENABLED = vad
+    start = time.perf_counter()
+    main.transcribe_audio_file(path, model)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="Audio files (default: everything in uploads/)")
+    parser.add_argument("--threshold-db", type=float, default=None)
+    parser.add_argument("--max-gap", type=float, default=None, help="Pauses this long always end a chunk (seconds)")
+    parser.add_argument("--min-chunk", type=float, default=None, help="Shortest chunk ended at a pause (seconds)")
+    parser.add_argument("--whisper-model", help="Also measure transcription with this model")
+    parser.add_argument("--workers", type=int, default=None, help="Chunks transcribed at once")
+    args = parser.parse_args()
+
+    files = args.files or sorted(
+        os.path.join("uploads", name) for name in os.listdir("uploads") if not name.startswith(".")
+    )
+    import main as app
+    options = dict(app.VAD_OPTIONS)
+    if args.threshold_db is not None:
+        options["threshold_db"] = args.threshold_db
+    if args.max_gap is not None:
+        options["max_gap_seconds"] = args.max_gap
+    if args.min_chunk is not None:
+        options["min_chunk_seconds"] = args.min_chunk
+    app.VAD_OPTIONS = options
+    if args.workers:
+        app.WHISPER_CHUNK_WORKERS = args.workers
+
+    header = (f"{'file':<40} {'audio (s)':>9} {'speech (s)':>10} {'skipped':>8} {'chunks':>6} "
+              f"{'windows':>9} {'vad (s)':>8}")
+    if args.whisper_model:
+        header += f" {'full (s)':>9} {'vad (s)':>8} {'speedup':>8}"
+    print(header)
+    totals = {"audio": 0.0, "speech": 0.0, "windows": 0, "full_windows": 0, "full": 0.0, "vad": 0.0}
+    for path in files:
+        report = analyze(path, options)
+        totals["audio"] += report["audio_seconds"]
+        totals["speech"] += report["speech_seconds"]
+        totals["windows"] += report["windows"]
+        totals["full_windows"] += report["full_windows"]
+        skipped = 1 - report["speech_seconds"] / report["audio_seconds"] if report["audio_seconds"] else 0.0
+        line = (f"{os.path.basename(path)[:40]:<40} {report['audio_seconds']:>9.1f} {report['speech_seconds']:>10.1f} "
+                f"{skipped:>8.1%} {report['chunks']:>6} {report['windows']:>4}/{report['full_windows']:<4} "
+                f"{report['decode_and_vad_seconds']:>8.2f}")
+        if args.whisper_model:
+            full = timed_transcription(app, path, args.whisper_model, vad=False)
+            chunked = timed_transcription(app, path, args.whisper_model, vad=True)
+            totals["full"] += full
+            totals["vad"] += chunked
+            line += f" {full:>9.1f} {chunked:>8.1f} {full / chunked:>7.2f}x"
+        print(line)
+
+    skipped = 1 - totals["speech"] / totals["audio"] if totals["audio"] else 0.0
+    print(f"Total: {totals['audio']:.1f}s of audio, {totals['audio'] - totals['speech']:.1f}s ({skipped:.1%}) skipped, "
+          f"{totals['windows']} whisper windows with VAD vs {totals['full_windows']} for whole files")
+    if args.whisper_model and totals["vad"]:
+        print(f"End-to-end transcription: {totals['full']:.1f}s without VAD, {totals['vad']:.1f}s with VAD "
+              f"and {app.WHISPER_CHUNK_WORKERS} workers ({totals['full'] / totals['vad']:.2f}x)")
+    app.transcription_engine.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Local stand-ins for Ollama and whisper, so the pipeline can be benchmarked
+without models or a GPU. Timings follow simple configurable latency models.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from audio_stream import BYTES_PER_SECOND, wav_duration_seconds
+from transcription_engine import TranscriptionBackend, format_segments
+
+WORDS = (
+    "budget roadmap release customer feedback deadline hiring design review "
+    "migration database latency incident follow-up owner decision risk estimate"
+).split()
+
+
+class FakeOllamaServer:
+    def __init__(self, models=("llama2",), first_token_seconds: float = 0.2, prompt_tokens_per_second: float = 2000,
+                 tokens_per_second: float = 50, output_tokens: int = 100, embedding_dim: int = 768,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        Minimal Ollama HTTP API: /api/tags, streaming /api/generate, /api/embed and /api/embeddings.
+
+        A generation waits first_token_seconds plus prompt evaluation time (prompt
+        words / prompt_tokens_per_second), then streams output_tokens NDJSON lines
+        at tokens_per_second, ending with a "done" line carrying eval statistics
+        like the real server.
+        """
+        self.models = list(models)
+        self.first_token_seconds = first_token_seconds
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.embedding_dim = embedding_dim
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def embed(self, text: str) -> list:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.embedding_dim).round(5).tolist()
+
+    def generate(self, prompt: str) -> Iterator[dict]:
+        start = time.perf_counter()
+        prompt_tokens = len(prompt.split())
+        prompt_seconds = prompt_tokens / self.prompt_tokens_per_second
+        time.sleep(self.first_token_seconds + prompt_seconds)
+        eval_start = time.perf_counter()
+        for i in range(self.output_tokens):
+            time.sleep(1 / self.tokens_per_second)
+            yield {"response": WORDS[i % len(WORDS)] + " ", "done": False}
+        eval_seconds = time.perf_counter() - eval_start
+        yield {
+            "response": "",
+            "done": True,
+            "total_duration": int((time.perf_counter() - start) * 1e9),
+            "load_duration": int(self.first_token_seconds * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_seconds * 1e9),
+            "eval_count": self.output_tokens,
+            "eval_duration": int(eval_seconds * 1e9),
+        }
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                fake.requests += 1
+                if self.path == "/api/tags":
+                    models = [{"name": m, "model": m, "digest": f"fake-{m}"} for m in fake.models]
+                    return self._json({"models": models})
+                self._json({"error": "not found"}, status=404)
+
+            def do_POST(self):
+                fake.requests += 1
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path == "/api/generate":
+                    if body.get("stream", True) is False:
+                        return self._json(list(fake.generate(body.get("prompt", "")))[-1])
+                    return self._stream(fake.generate(body.get("prompt", "")))
+                if self.path == "/api/embed":
+                    inputs = body.get("input", [])
+                    inputs = [inputs] if isinstance(inputs, str) else inputs
+                    return self._json({"embeddings": [fake.embed(text) for text in inputs]})
+                if self.path == "/api/embeddings":
+                    return self._json({"embedding": fake.embed(body.get("prompt", ""))})
+                self._json({"error": "not found"}, status=404)
+
+            def _json(self, value, status: int = 200):
+                data = json.dumps(value).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, items):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for item in items:
+                    data = (json.dumps(item) + "\n").encode("utf-8")
+                    self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+
+class FakeWhisperBackend(TranscriptionBackend):
+    name = "fake"
+    supports_pcm = True
+
+    def __init__(self, realtime_factor: float = 0.1, load_seconds: float = 1.0, segment_seconds: float = 5.0):
+        """
+        Transcription backend that sleeps realtime_factor seconds per second of
+        audio and returns whisper.cpp style segments of filler words.
+
+        Args:
+            realtime_factor: Inference seconds per second of audio
+            load_seconds: Time to "load" a model (paid once while it stays resident)
+            segment_seconds: Length of each generated segment
+        """
+        self.realtime_factor = realtime_factor
+        self.load_seconds = load_seconds
+        self.segment_seconds = segment_seconds
+
+    def load(self, model_name: str):
+        time.sleep(self.load_seconds)
+        return model_name
+
+    def transcribe(self, handle, wav_path: str, language=None, translate=False) -> str:
+        return self._transcribe_seconds(wav_duration_seconds(wav_path) or 0.0, 0.0)
+
+    def transcribe_pcm(self, handle, windows: Iterator[Tuple[float, bytes]], language=None, translate=False) -> str:
+        return "\n".join(self._transcribe_seconds(len(pcm) / BYTES_PER_SECOND, offset) for offset, pcm in windows)
+
+    def detect_language(self, handle, pcm: bytes) -> Tuple[str, float]:
+        # Detection runs the encoder once over (at most) 30 seconds of audio
+        time.sleep(min(len(pcm) / BYTES_PER_SECOND, 30) * self.realtime_factor)
+        return "en", 1.0
+
+    def _transcribe_seconds(self, seconds: float, offset: float) -> str:
+        time.sleep(seconds * self.realtime_factor)
+        segments = []
+        start = 0.0
+        while start < seconds:
+            end = min(seconds, start + self.segment_seconds)
+            words = " ".join(WORDS[(int(offset + start) + i) % len(WORDS)] for i in range(12))
+            segments.append({"start": start, "end": end, "text": words})
+            start = end
+        return format_segments(segments, offset)
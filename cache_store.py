@@ -0,0 +1,254 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class DiskLRUCache:
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        A size-bounded key/value store on disk with least-recently-used eviction.
+
+        Each entry is one file named after its key. Recency survives restarts
+        because reads bump the file's modification time, and the index is
+        rebuilt from modification times on startup.
+
+        Args:
+            directory: Directory to store cache entries in
+            max_bytes: Total size of all entries before old ones are evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read an entry and mark it as recently used.
+
+        Args:
+            key: Cache key (must be safe to use as a filename)
+
+        Returns:
+            The stored bytes, or None on a miss
+        """
+        path = self._path(key)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            try:
+                with open(path, "rb") as f:
+                    value = f.read()
+                os.utime(path)
+            except OSError:
+                # Entry was removed behind our back
+                self._forget(key)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes):
+        """
+        Store an entry, evicting least-recently-used entries if over budget.
+
+        Args:
+            key: Cache key (must be safe to use as a filename)
+            value: Bytes to store
+        """
+        if len(value) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(value)
+        with self._lock:
+            os.replace(tmp_path, path)
+            self._forget(key)
+            self._index[key] = len(value)
+            self._total_bytes += len(value)
+            self._evict()
+
+    def open(self, key: str):
+        """
+        Open an entry for reading and mark it as recently used.
+
+        The open file stays readable even if the entry is evicted meanwhile,
+        so large entries can be streamed without loading them into memory.
+
+        Returns:
+            A binary file object (caller closes it), or None on a miss
+        """
+        path = self._path(key)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            try:
+                f = open(path, "rb")
+                os.utime(path)
+            except OSError:
+                self._forget(key)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return f
+
+    def get_json(self, key: str) -> Optional[Dict]:
+        """Read an entry stored with set_json."""
+        value = self.get(key)
+        return json.loads(value.decode("utf-8")) if value is not None else None
+
+    def set_json(self, key: str, value: Dict):
+        """Store a JSON-serializable value."""
+        self.set(key, json.dumps(value).encode("utf-8"))
+
+    def delete(self, key: str):
+        """Remove an entry if present."""
+        with self._lock:
+            if key in self._index:
+                self._forget(key)
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove every entry whose key starts with prefix. Returns the number removed."""
+        with self._lock:
+            keys = [key for key in self._index if key.startswith(prefix)]
+            for key in keys:
+                self._forget(key)
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            return len(keys)
+
+    def get_statistics(self) -> Dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            key, _ = next(iter(self._index.items()))
+            self._forget(key)
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _load_index(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            path = self._path(name)
+            if name.endswith(".tmp"):
+                # Leftover from an interrupted write
+                os.remove(path)
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total_bytes += size
+        self._evict()
+
+
+class TTLLRUCache:
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600):
+        """
+        An in-memory cache with a per-entry time-to-live and least-recently-used eviction.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            ttl_seconds: Seconds after which an entry is treated as missing
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str):
+        """
+        Get a live entry and mark it as recently used.
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value, ttl_seconds: Optional[float] = None):
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,232 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Encoding used only to measure prompt sizes; exact model tokenizers differ slightly
+TOKEN_ENCODING = "cl100k_base"
+
+CHUNK_PROMPT = """You are given one part of a longer meeting transcript, along with some optional context.
+
+Context: {context}
+
+This is part {index} of {total} of the transcript:
+
+{text}
+
+Summarize this part of the meeting. Keep names, decisions, action items and open questions."""
+
+REDUCE_PROMPT = """You are given summaries of consecutive parts of a meeting, along with some optional context.
+
+Context: {context}
+
+{text}
+
+Combine these into a single summary that keeps every decision, action item and open question."""
+
+FINAL_PROMPT = """You are given summaries of consecutive parts of a meeting, along with some optional context.
+
+Context: {context}
+
+{text}
+
+Please summarize the whole meeting."""
+
+_encoding = None
+_encoding_unavailable = False
+
+
+def _get_encoding():
+    """Load the tiktoken encoding once; fall back to word counts if it is unavailable."""
+    global _encoding, _encoding_unavailable
+    if _encoding is None and not _encoding_unavailable:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+        except Exception as e:
+            logger.warning(f"tiktoken unavailable, estimating tokens from word counts: {e}")
+            _encoding_unavailable = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a piece of text.
+
+    Args:
+        text: The text to measure
+
+    Returns:
+        Token count (estimated as 4 tokens per 3 words when tiktoken is unavailable)
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text.split()) * 4 + 2) // 3
+
+
+def _split_long_segment(segment: str, max_tokens: int) -> List[str]:
+    """Split a single segment that is larger than a chunk on token (or word) boundaries."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(segment, disallowed_special=())
+        return [encoding.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
+    words = segment.split()
+    step = max(1, max_tokens * 3 // 4)
+    return [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+
+
+def split_segments(transcript: str) -> List[str]:
+    """
+    Split a transcript into segments. whisper.cpp prints one timestamped segment
+    per line, so lines are the natural boundaries.
+    """
+    return [line.strip() for line in transcript.splitlines() if line.strip()]
+
+
+def chunk_transcript(transcript: str, chunk_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    Pack transcript segments into chunks of at most chunk_tokens tokens.
+
+    Chunks break only between segments (oversized segments are split on token
+    boundaries). Each chunk starts with the trailing segments of the previous
+    chunk, up to overlap_tokens, so context at the boundaries is not lost.
+
+    Args:
+        transcript: The full transcript text
+        chunk_tokens: Maximum tokens per chunk
+        overlap_tokens: Tokens of trailing context repeated at the start of the next chunk
+
+    Returns:
+        List of chunk texts
+    """
+    segments = []
+    for segment in split_segments(transcript):
+        tokens = count_tokens(segment)
+        if tokens > chunk_tokens:
+            segments.extend((part, count_tokens(part)) for part in _split_long_segment(segment, chunk_tokens))
+        else:
+            segments.append((segment, tokens))
+
+    chunks = []
+    current: List[tuple] = []
+    current_tokens = 0
+    for segment, tokens in segments:
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append("\n".join(text for text, _ in current))
+            # Carry trailing segments over as overlap
+            overlap: List[tuple] = []
+            overlap_total = 0
+            for prev in reversed(current):
+                if overlap_total + prev[1] > overlap_tokens or overlap_total + prev[1] + tokens > chunk_tokens:
+                    break
+                overlap.insert(0, prev)
+                overlap_total += prev[1]
+            current = overlap
+            current_tokens = overlap_total
+        current.append((segment, tokens))
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(text for text, _ in current))
+    return chunks
+
+
+class ChunkedSummarizer:
+    def __init__(self, generate: Callable[[str], str], chunk_tokens: int = 3000,
+                 overlap_tokens: int = 200, max_concurrency: int = 4, reduce_fan_in: int = 8,
+                 stream_generate: Optional[Callable[[str], Iterator[str]]] = None):
+        """
+        Hierarchical (map-reduce) summarizer for transcripts that do not fit in one prompt.
+
+        The transcript is split into chunks that are summarized in parallel, then
+        the partial summaries are combined in groups until one summary remains.
+
+        Args:
+            generate: Function sending a prompt to the LLM and returning its response
+            chunk_tokens: Maximum transcript tokens per chunk prompt
+            overlap_tokens: Tokens of context repeated between consecutive chunks
+            max_concurrency: Maximum prompts sent to the LLM at once
+            reduce_fan_in: Maximum partial summaries combined in one reduce prompt
+            stream_generate: Optional streaming variant of generate, used for the final prompt
+        """
+        self.generate = generate
+        self.stream_generate = stream_generate
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.max_concurrency = max_concurrency
+        self.reduce_fan_in = max(2, reduce_fan_in)
+
+    def summarize(self, context: str, transcript: str) -> str:
+        """
+        Summarize a long transcript.
+
+        Args:
+            context: Optional context provided by the user
+            transcript: The transcript text
+
+        Returns:
+            The final summary
+        """
+        return "".join(self.stream(context, transcript))
+
+    def stream(self, context: str, transcript: str) -> Iterator[str]:
+        """
+        Summarize a long transcript, streaming the final combining step.
+
+        Args:
+            context: Optional context provided by the user
+            transcript: The transcript text
+
+        Yields:
+            Pieces of the final summary
+        """
+        context = context if context else "No additional context provided."
+        chunks = chunk_transcript(transcript, self.chunk_tokens, self.overlap_tokens)
+        logger.info(f"Summarizing transcript in {len(chunks)} chunks")
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            prompts = [
+                CHUNK_PROMPT.format(context=context, index=i + 1, total=len(chunks), text=chunk)
+                for i, chunk in enumerate(chunks)
+            ]
+            partials = list(executor.map(self.generate, prompts))
+            if len(partials) <= 1:
+                yield partials[0] if partials else ""
+                return
+
+            while True:
+                groups = self._group(partials)
+                if len(groups) == 1:
+                    break
+                prompts = [REDUCE_PROMPT.format(context=context, text=self._join(group)) for group in groups]
+                partials = list(executor.map(self.generate, prompts))
+
+        final_prompt = FINAL_PROMPT.format(context=context, text=self._join(groups[0]))
+        if self.stream_generate is not None:
+            yield from self.stream_generate(final_prompt)
+        else:
+            yield self.generate(final_prompt)
+
+    def _group(self, partials: List[str]) -> List[List[str]]:
+        """Group consecutive partial summaries so each group fits the fan-in and the token budget."""
+        groups: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for partial in partials:
+            tokens = count_tokens(partial)
+            if current and (len(current) >= self.reduce_fan_in or current_tokens + tokens > self.chunk_tokens):
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(partial)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        # Make progress even if each partial alone fills the budget
+        if len(groups) == len(partials) and len(partials) > 1:
+            groups = [partials[i:i + 2] for i in range(0, len(partials), 2)]
+        return groups
+
+    @staticmethod
+    def _join(partials: List[str]) -> str:
+        return "\n\n".join(f"Part {i + 1} summary:\n{partial}" for i, partial in enumerate(partials))
@@ -1,8 +1,64 @@
 import pymongo
 from pymongo import MongoClient
-from datetime import datetime
-from typing import List, Dict, Optional
-import os
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Optional
+import logging
+import re
+import threading
+import time
+
+from instrumentation import MongoCommandTimer
+from transcript_segments import duration_seconds, from_columns, index_range, parse_segments, to_columns
+
+logger = logging.getLogger(__name__)
+
+# Connection pool settings for the shared MongoDB client
+MONGO_MAX_POOL_SIZE = 50  # Connections per server
+MONGO_MIN_POOL_SIZE = 0  # Connections kept open while idle
+MONGO_MAX_IDLE_TIME_MS = 60000  # Idle connections older than this are closed
+
+_mongo_clients: Dict[str, MongoClient] = {}
+_mongo_clients_lock = threading.Lock()
+
+
+def get_mongo_client(connection_string: str = "mongodb://localhost:27017/") -> MongoClient:
+    """
+    Get the process-wide MongoDB client for a connection string.
+
+    MongoClient is thread-safe and pools its connections, so one instance is
+    shared by the transcription history and the user collection. Command
+    round trips are recorded in the mongodb_command_duration_seconds metric.
+    """
+    with _mongo_clients_lock:
+        client = _mongo_clients.get(connection_string)
+        if client is None:
+            client = MongoClient(
+                connection_string,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                event_listeners=[MongoCommandTimer()],
+            )
+            _mongo_clients[connection_string] = client
+        return client
+
+# History pages are capped so a single request never pulls whole transcripts
+HISTORY_MAX_PAGE_SIZE = 100
+HISTORY_PREVIEW_CHARS = 200
+
+# Full-text search index over the history; matches in filenames and summaries rank higher
+TEXT_INDEX_NAME = "transcription_text"
+TEXT_INDEX_WEIGHTS = {"audio_filename": 5, "summary": 3, "transcript": 1}
+
+# Search snippets are cut around the first of the query's words found in the text
+SEARCH_SNIPPET_CHARS = 240
+SEARCH_SNIPPET_TERMS = 5
+
+# Statistics are kept as counters updated on save/delete and rebuilt from the records periodically
+STATISTICS_CACHE_SECONDS = 10  # In-process reuse of the counters (bounds staleness of reads)
+STATISTICS_RECONCILE_SECONDS = 3600  # Counters older than this are rebuilt in the background
+STATISTICS_DAYS = 30  # Daily activity buckets kept
+STATISTICS_RECENT_DAYS = 7  # Days counted as recent activity (including today)
 
 class DatabaseManager:
     def __init__(self, connection_string: str = "mongodb://localhost:27017/", database_name: str = "meeting_summarizer"):
@@ -18,27 +74,89 @@ class DatabaseManager:
         self.client = None
         self.db = None
         self.collection = None
+        self.segments_collection = None
+        self._listeners: List[Callable[[str, str, Optional[Dict]], None]] = []
+        self.statistics_collection = None
+        self._statistics_cache: Optional[Dict] = None
+        self._statistics_cached_at = 0.0
+        self._reconcile_lock = threading.Lock()
         self.connect()
     
     def connect(self):
         """Connect to MongoDB and create database/collection if not exists."""
         try:
-            self.client = MongoClient(self.connection_string)
+            self.client = get_mongo_client(self.connection_string)
             self.db = self.client[self.database_name]
             self.collection = self.db["transcription_history"]
+            # Parsed segments as parallel arrays, one document per record (same _id)
+            self.segments_collection = self.db["transcription_segments"]
+            # Materialized counters: totals, per-model usage and daily activity
+            self.statistics_collection = self.db["transcription_statistics"]
             
             # Create indexes for better performance
             self.collection.create_index("timestamp", pymongo.DESCENDING)
             self.collection.create_index("audio_filename")
+            self.collection.create_index("audio_hash", sparse=True)
+            # Keyset pagination for history, per user and overall
+            self.collection.create_index([("user_id", pymongo.ASCENDING), ("timestamp", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)])
+            self.collection.create_index([("timestamp", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)])
+            # Full-text search, built once here rather than on every query
+            self._ensure_text_index()
             
-            print(f"Connected to MongoDB database: {self.database_name}")
+            logger.info(f"Connected to MongoDB database: {self.database_name}")
             return True
         except Exception as e:
-            print(f"Error connecting to MongoDB: {e}")
+            logger.error(f"Error connecting to MongoDB: {e}")
             return False
     
+    def _ensure_text_index(self):
+        """
+        Create the weighted full-text index. MongoDB allows one text index per collection,
+        so a text index with another name or other weights (such as the default-named one
+        earlier versions created on first search) is dropped and replaced.
+        """
+        for name, info in self.collection.index_information().items():
+            if name != TEXT_INDEX_NAME and any(kind == pymongo.TEXT for _, kind in info["key"]):
+                logger.info(f"Replacing text index {name} with {TEXT_INDEX_NAME}")
+                self.collection.drop_index(name)
+        try:
+            self._create_text_index()
+        except pymongo.errors.OperationFailure as e:
+            if e.code not in (85, 86):  # IndexOptionsConflict, IndexKeySpecsConflict
+                raise
+            logger.info(f"Rebuilding text index {TEXT_INDEX_NAME} with new options")
+            self.collection.drop_index(TEXT_INDEX_NAME)
+            self._create_text_index()
+
+    def _create_text_index(self):
+        self.collection.create_index(
+            [("transcript", pymongo.TEXT), ("summary", pymongo.TEXT), ("audio_filename", pymongo.TEXT)],
+            weights=TEXT_INDEX_WEIGHTS,
+            name=TEXT_INDEX_NAME,
+        )
+
+    def add_listener(self, callback: Callable[[str, str, Optional[Dict]], None]):
+        """
+        Register a callback for record changes.
+        
+        The callback receives (event, record_id, record), where event is
+        "saved", "updated" or "deleted" and record is the stored document
+        (None for deletions). It runs on the caller's thread, so it should hand
+        slow work off elsewhere.
+        """
+        self._listeners.append(callback)
+    
+    def _notify(self, event: str, record_id: str, record: Optional[Dict] = None):
+        for callback in self._listeners:
+            try:
+                callback(event, record_id, record)
+            except Exception as e:
+                logger.error(f"Error in database listener for {event} {record_id}: {e}")
+    
     def save_transcription(self, audio_filename: str, transcript: str, summary: str, 
-                         whisper_model: str, llm_model: str, context: str = "") -> str:
+                         whisper_model: str, llm_model: str, context: str = "",
+                         user_id: Optional[str] = None, processing_seconds: Optional[float] = None,
+                         audio_hash: Optional[str] = None, language: Optional[str] = None) -> str:
         """
         Save a transcription record to the database.
         
@@ -49,31 +167,95 @@ class DatabaseManager:
             whisper_model: Whisper model used
             llm_model: LLM model used for summarization
             context: Optional context provided by user
+            user_id: ID of the user who owns the record
+            processing_seconds: Wall-clock time spent producing the record
+            audio_hash: SHA-256 of the audio file, used to recognize recordings already processed
+            language: Detected spoken language code
             
         Returns:
             str: The ID of the saved record
         """
         try:
-            record = {
-                "audio_filename": audio_filename,
-                "transcript": transcript,
-                "summary": summary,
-                "whisper_model": whisper_model,
-                "llm_model": llm_model,
-                "context": context,
-                "timestamp": datetime.now(),
-                "audio_duration": self._get_audio_duration(transcript),
-                "transcript_length": len(transcript),
-                "summary_length": len(summary)
-            }
-            
+            record, segments = self._build_record(
+                audio_filename, transcript, summary, whisper_model, llm_model, context,
+                user_id, processing_seconds, audio_hash, language
+            )
             result = self.collection.insert_one(record)
-            print(f"Transcription saved with ID: {result.inserted_id}")
+            self._save_segments(result.inserted_id, segments)
+            self._count_records([record], 1)
+            logger.info(f"Transcription saved with ID: {result.inserted_id}")
+            self._notify("saved", str(result.inserted_id), record)
             return str(result.inserted_id)
         except Exception as e:
-            print(f"Error saving transcription: {e}")
+            logger.error(f"Error saving transcription: {e}")
             return None
     
+    def save_transcriptions(self, items: List[Dict]) -> List[str]:
+        """
+        Save many transcription records with one insert_many.
+        
+        Args:
+            items: Keyword arguments for save_transcription, one dictionary per record
+            
+        Returns:
+            The IDs of the saved records, in order (empty if the insert failed)
+        """
+        if not items:
+            return []
+        try:
+            built = [self._build_record(**item) for item in items]
+            records = [record for record, _ in built]
+            result = self.collection.insert_many(records)
+            self.segments_collection.insert_many([
+                {"_id": record_id, "count": len(segments), **to_columns(segments)}
+                for record_id, (_, segments) in zip(result.inserted_ids, built)
+            ])
+            self._count_records(records, 1)
+            logger.info(f"Saved {len(records)} transcriptions")
+            for record_id, record in zip(result.inserted_ids, records):
+                self._notify("saved", str(record_id), record)
+            return [str(record_id) for record_id in result.inserted_ids]
+        except Exception as e:
+            logger.error(f"Error saving transcriptions: {e}")
+            return []
+    
+    def get_existing_hashes(self, audio_hashes: List[str]) -> set:
+        """Which of the given audio hashes already have a saved record."""
+        try:
+            return set(self.collection.distinct("audio_hash", {"audio_hash": {"$in": list(audio_hashes)}}))
+        except Exception as e:
+            logger.error(f"Error looking up audio hashes: {e}")
+            return set()
+    
+    def _build_record(self, audio_filename: str, transcript: str, summary: str, whisper_model: str,
+                      llm_model: str, context: str = "", user_id: Optional[str] = None,
+                      processing_seconds: Optional[float] = None, audio_hash: Optional[str] = None,
+                      language: Optional[str] = None):
+        """The document to insert for a transcription, and its parsed segments."""
+        segments = parse_segments(transcript)
+        record = {
+            "audio_filename": audio_filename,
+            "transcript": transcript,
+            "summary": summary,
+            "whisper_model": whisper_model,
+            "llm_model": llm_model,
+            "context": context,
+            "timestamp": datetime.now(),
+            "audio_duration": duration_seconds(segments) or self._get_audio_duration(transcript),
+            "segment_count": len(segments),
+            "transcript_length": len(transcript),
+            "summary_length": len(summary)
+        }
+        if user_id is not None:
+            record["user_id"] = user_id
+        if processing_seconds is not None:
+            record["processing_seconds"] = round(processing_seconds, 3)
+        if audio_hash is not None:
+            record["audio_hash"] = audio_hash
+        if language is not None:
+            record["language"] = language
+        return record, segments
+    
     def get_all_transcriptions(self) -> List[Dict]:
         """
         Get all transcription records from the database.
@@ -93,28 +275,141 @@ class DatabaseManager:
             
             return records
         except Exception as e:
-            print(f"Error retrieving transcriptions: {e}")
+            logger.error(f"Error retrieving transcriptions: {e}")
             return []
     
-    def get_transcription_by_id(self, record_id: str) -> Optional[Dict]:
+    def get_transcriptions_page(self, user_id: Optional[str] = None, limit: int = 20,
+                                before: Optional[str] = None,
+                                preview_chars: int = HISTORY_PREVIEW_CHARS) -> Dict:
+        """
+        Get one page of transcription records, newest first, without the full texts.
+
+        Pages are addressed by a cursor on (timestamp, _id) rather than an offset,
+        so every page costs the same index scan however far back it is. Only
+        previews of the summary and transcript are returned, cut server-side.
+
+        Args:
+            user_id: Only return this user's records, plus records saved before
+                records had an owner; None returns every record
+            limit: Records per page (capped at HISTORY_MAX_PAGE_SIZE)
+            before: Cursor returned as next_cursor by the previous page
+            preview_chars: Characters of summary and transcript to include
+
+        Returns:
+            Dictionary with "records" and "next_cursor" (None on the last page)
+        """
+        try:
+            from bson import ObjectId
+            limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+            conditions = []
+            if user_id is not None:
+                # Missing user_id also matches None, so unowned records stay visible
+                conditions.append({"user_id": {"$in": [user_id, None]}})
+            if before:
+                timestamp_str, _, id_str = before.partition("_")
+                timestamp = datetime.fromisoformat(timestamp_str)
+                conditions.append({"$or": [
+                    {"timestamp": {"$lt": timestamp}},
+                    {"timestamp": timestamp, "_id": {"$lt": ObjectId(id_str)}},
+                ]})
+            match = {"$and": conditions} if conditions else {}
+
+            records = list(self.collection.aggregate([
+                {"$match": match},
+                {"$sort": {"timestamp": -1, "_id": -1}},
+                {"$limit": limit + 1},
+                {"$project": {
+                    "audio_filename": 1,
+                    "timestamp": 1,
+                    "whisper_model": 1,
+                    "llm_model": 1,
+                    "summary_length": 1,
+                    "transcript_length": 1,
+                    "summary_preview": {"$substrCP": [{"$ifNull": ["$summary", ""]}, 0, preview_chars]},
+                    "transcript_preview": {"$substrCP": [{"$ifNull": ["$transcript", ""]}, 0, preview_chars]},
+                }},
+            ]))
+
+            next_cursor = None
+            if len(records) > limit:
+                records = records[:limit]
+                last = records[-1]
+                next_cursor = f"{last['timestamp'].isoformat()}_{last['_id']}"
+
+            for record in records:
+                record["_id"] = str(record["_id"])
+                record["timestamp_formatted"] = record["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
+                record["summary_truncated"] = record.get("summary_length", 0) > preview_chars
+                record["transcript_truncated"] = record.get("transcript_length", 0) > preview_chars
+
+            return {"records": records, "next_cursor": next_cursor}
+        except Exception as e:
+            logger.error(f"Error retrieving transcription page: {e}")
+            return {"records": [], "next_cursor": None}
+    
+    def get_transcription_by_id(self, record_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
         """
         Get a specific transcription record by ID.
         
         Args:
             record_id: The ID of the record to retrieve
+            fields: Only load these fields (default: the whole record)
             
         Returns:
             The transcription record or None if not found
         """
         try:
             from bson import ObjectId
-            record = self.collection.find_one({"_id": ObjectId(record_id)})
+            record = self.collection.find_one({"_id": ObjectId(record_id)}, fields)
             if record:
                 record["_id"] = str(record["_id"])
-                record["timestamp_formatted"] = record["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
+                if "timestamp" in record:
+                    record["timestamp_formatted"] = record["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
             return record
         except Exception as e:
-            print(f"Error retrieving transcription by ID: {e}")
+            logger.error(f"Error retrieving transcription by ID: {e}")
+            return None
+    
+    def get_segments(self, record_id: str, from_ms: Optional[int] = None,
+                     to_ms: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        Get the transcript segments overlapping a time range.
+        
+        Only the timing arrays are read to locate the range; the text array is
+        sliced server-side, so short ranges of long recordings stay cheap.
+        Records saved before segments were stored are parsed on the fly.
+        
+        Args:
+            record_id: The ID of the record
+            from_ms: Start of the range in milliseconds (default: beginning)
+            to_ms: End of the range in milliseconds (default: end)
+            
+        Returns:
+            List of {"index", "start_ms", "end_ms", "text"}, or None if the record doesn't exist
+        """
+        try:
+            from bson import ObjectId
+            object_id = ObjectId(record_id)
+            timings = self.segments_collection.find_one({"_id": object_id}, {"start_ms": 1, "end_ms": 1})
+            if timings is None:
+                record = self.collection.find_one({"_id": object_id}, {"transcript": 1})
+                if record is None:
+                    return None
+                segments = from_columns(to_columns(parse_segments(record.get("transcript", ""))))
+                selected = index_range([s["start_ms"] for s in segments], [s["end_ms"] for s in segments], from_ms, to_ms)
+                return segments[selected.start:selected.stop]
+
+            selected = index_range(timings["start_ms"], timings["end_ms"], from_ms, to_ms)
+            if not selected:
+                return []
+            columns = self.segments_collection.find_one({"_id": object_id}, {
+                "start_ms": {"$slice": [selected.start, len(selected)]},
+                "end_ms": {"$slice": [selected.start, len(selected)]},
+                "text": {"$slice": [selected.start, len(selected)]},
+            })
+            return from_columns(columns, first_index=selected.start)
+        except Exception as e:
+            logger.error(f"Error retrieving segments: {e}")
             return None
     
     def delete_transcription(self, record_id: str) -> bool:
@@ -129,15 +424,22 @@ class DatabaseManager:
         """
         try:
             from bson import ObjectId
-            result = self.collection.delete_one({"_id": ObjectId(record_id)})
-            if result.deleted_count > 0:
-                print(f"Transcription deleted successfully: {record_id}")
+            deleted = self.collection.find_one_and_delete(
+                {"_id": ObjectId(record_id)},
+                projection={"whisper_model": 1, "llm_model": 1, "timestamp": 1,
+                            "audio_duration": 1, "processing_seconds": 1},
+            )
+            self.segments_collection.delete_one({"_id": ObjectId(record_id)})
+            if deleted is not None:
+                self._count_records([deleted], -1)
+                logger.info(f"Transcription deleted successfully: {record_id}")
+                self._notify("deleted", record_id)
                 return True
             else:
-                print(f"No transcription found with ID: {record_id}")
+                logger.warning(f"No transcription found with ID: {record_id}")
                 return False
         except Exception as e:
-            print(f"Error deleting transcription: {e}")
+            logger.error(f"Error deleting transcription: {e}")
             return False
     
     def update_transcription(self, record_id: str, updates: Dict) -> bool:
@@ -155,92 +457,255 @@ class DatabaseManager:
             from bson import ObjectId
             # Add update timestamp
             updates["updated_at"] = datetime.now()
+            # Keep the stored segments in step with an edited transcript
+            segments = None
+            if "transcript" in updates:
+                segments = parse_segments(updates["transcript"])
+                updates["segment_count"] = len(segments)
+                updates["transcript_length"] = len(updates["transcript"])
+                updates["audio_duration"] = duration_seconds(segments) or self._get_audio_duration(updates["transcript"])
             
             result = self.collection.update_one(
                 {"_id": ObjectId(record_id)},
                 {"$set": updates}
             )
+            if segments is not None and result.matched_count > 0:
+                self._save_segments(ObjectId(record_id), segments)
+            if result.modified_count > 0 and ("transcript" in updates or "summary" in updates):
+                self._notify("updated", record_id, self.collection.find_one({"_id": ObjectId(record_id)}))
             
             if result.modified_count > 0:
-                print(f"Transcription updated successfully: {record_id}")
+                logger.info(f"Transcription updated successfully: {record_id}")
                 return True
             else:
-                print(f"No transcription found with ID: {record_id}")
+                logger.warning(f"No transcription found with ID: {record_id}")
                 return False
         except Exception as e:
-            print(f"Error updating transcription: {e}")
+            logger.error(f"Error updating transcription: {e}")
             return False
     
-    def search_transcriptions(self, query: str) -> List[Dict]:
+    def search_transcriptions(self, query: str, user_id: Optional[str] = None, page: int = 1,
+                              page_size: int = 10, snippet_chars: int = SEARCH_SNIPPET_CHARS) -> Dict:
         """
-        Search transcriptions by text content.
+        Search transcriptions by text content, best matches first.
+        
+        Uses the text index created in connect(). Results carry snippets of the
+        summary and transcript around the first matching term, cut server-side,
+        instead of the full texts.
         
         Args:
             query: Search query string
+            user_id: Only search this user's records (plus records without an owner)
+            page: 1-based page number
+            page_size: Results per page (capped at HISTORY_MAX_PAGE_SIZE)
+            snippet_chars: Length of each snippet
             
         Returns:
-            List of matching transcription records
+            Dictionary with "results", "page", "has_more" and "terms" (the words used for snippets)
         """
         try:
-            # Create text index if it doesn't exist
-            try:
-                self.collection.create_index([("transcript", "text"), ("summary", "text"), ("audio_filename", "text")])
-            except:
-                pass  # Index might already exist
-            
-            # Perform text search
-            records = list(self.collection.find(
-                {"$text": {"$search": query}}
-            ).sort("timestamp", -1))
-            
-            # Convert ObjectId to string for JSON serialization
+            page = max(1, page)
+            page_size = max(1, min(page_size, HISTORY_MAX_PAGE_SIZE))
+            terms = [t for t in re.findall(r"\w+", query.lower()) if len(t) > 1][:SEARCH_SNIPPET_TERMS]
+            match: Dict = {"$text": {"$search": query}}
+            if user_id is not None:
+                match["user_id"] = {"$in": [user_id, None]}
+
+            records = list(self.collection.aggregate([
+                {"$match": match},
+                {"$addFields": {"score": {"$meta": "textScore"}}},
+                {"$sort": {"score": -1, "timestamp": -1}},
+                {"$skip": (page - 1) * page_size},
+                {"$limit": page_size + 1},
+                {"$project": {
+                    "audio_filename": 1,
+                    "timestamp": 1,
+                    "whisper_model": 1,
+                    "llm_model": 1,
+                    "score": 1,
+                    "summary_snippet": self._snippet_expression("$summary", terms, snippet_chars),
+                    "transcript_snippet": self._snippet_expression("$transcript", terms, snippet_chars),
+                }},
+            ]))
+
+            has_more = len(records) > page_size
+            records = records[:page_size]
             for record in records:
                 record["_id"] = str(record["_id"])
                 record["timestamp_formatted"] = record["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-            
-            return records
+                record["score"] = round(record["score"], 3)
+
+            return {"results": records, "page": page, "has_more": has_more, "terms": terms}
         except Exception as e:
-            print(f"Error searching transcriptions: {e}")
-            return []
+            logger.error(f"Error searching transcriptions: {e}")
+            return {"results": [], "page": page, "has_more": False, "terms": []}
+    
+    @staticmethod
+    def _snippet_expression(field: str, terms: List[str], length: int) -> Dict:
+        """Aggregation expression cutting `length` characters of a field around the earliest term found in it."""
+        text = {"$ifNull": [field, ""]}
+        lowered = {"$toLower": text}
+        positions = [{"$indexOfCP": [lowered, term]} for term in terms]
+        first_match = {"$ifNull": [
+            {"$min": {"$filter": {"input": positions, "as": "position", "cond": {"$gte": ["$$position", 0]}}}},
+            0,
+        ]}
+        start = {"$max": [0, {"$subtract": [first_match, length // 4]}]}
+        return {"$substrCP": [text, start, length]}
     
     def get_statistics(self) -> Dict:
         """
         Get database statistics.
         
+        Reads the materialized counters (a handful of small documents, whatever
+        the collection size) and reuses them for STATISTICS_CACHE_SECONDS.
+        Counters change with every save and delete; edits made through
+        update_transcription are picked up by the periodic rebuild, so they lag
+        by at most STATISTICS_RECONCILE_SECONDS.
+        
         Returns:
             Dictionary containing database statistics
         """
+        now = time.time()
+        if self._statistics_cache is not None and now - self._statistics_cached_at < STATISTICS_CACHE_SECONDS:
+            return self._statistics_cache
         try:
-            total_records = self.collection.count_documents({})
-            
-            # Get model usage statistics
-            whisper_models = list(self.collection.aggregate([
-                {"$group": {"_id": "$whisper_model", "count": {"$sum": 1}}}
-            ]))
-            
-            llm_models = list(self.collection.aggregate([
-                {"$group": {"_id": "$llm_model", "count": {"$sum": 1}}}
-            ]))
-            
-            # Get recent activity (last 7 days)
-            from datetime import timedelta
-            last_week = datetime.now() - timedelta(days=7)
-            recent_records = self.collection.count_documents({"timestamp": {"$gte": last_week}})
-            
-            return {
-                "total_records": total_records,
-                "whisper_models": whisper_models,
-                "llm_models": llm_models,
-                "recent_records": recent_records
+            documents = list(self.statistics_collection.find({}))
+            totals = next((d for d in documents if d["_id"] == "totals"), None)
+            if totals is None:
+                # First use: build the counters before answering
+                self.rebuild_statistics()
+                documents = list(self.statistics_collection.find({}))
+                totals = next((d for d in documents if d["_id"] == "totals"), {})
+            elif now - totals.get("reconciled_at", 0) > STATISTICS_RECONCILE_SECONDS:
+                self._rebuild_statistics_in_background()
+
+            def usage(kind: str) -> List[Dict]:
+                counts = [{"_id": d["name"], "count": d["count"]} for d in documents
+                          if d.get("kind") == kind and d.get("count", 0) > 0]
+                return sorted(counts, key=lambda c: -c["count"])
+
+            today = datetime.now().date()
+            days = {d["date"]: d["count"] for d in documents if d.get("kind") == "day"}
+            daily_activity = [
+                {"date": day, "count": days.get(day, 0)}
+                for day in ((today - timedelta(days=i)).isoformat() for i in range(STATISTICS_DAYS - 1, -1, -1))
+            ]
+            processed = totals.get("processed_records", 0)
+            statistics = {
+                "total_records": totals.get("total_records", 0),
+                "whisper_models": usage("whisper_model"),
+                "llm_models": usage("llm_model"),
+                "recent_records": sum(d["count"] for d in daily_activity[-STATISTICS_RECENT_DAYS:]),
+                "daily_activity": daily_activity,
+                "audio_hours": round(totals.get("audio_seconds", 0) / 3600, 2),
+                "processing_hours": round(totals.get("processing_seconds", 0) / 3600, 2),
+                "avg_processing_seconds": round(totals.get("processing_seconds", 0) / processed, 1) if processed else None,
+                "reconciled_at": totals.get("reconciled_at"),
+                "generated_at": now,
             }
+            self._statistics_cache, self._statistics_cached_at = statistics, now
+            return statistics
         except Exception as e:
-            print(f"Error getting statistics: {e}")
+            logger.error(f"Error getting statistics: {e}")
             return {}
     
+    def rebuild_statistics(self):
+        """Recompute all counters from the records (full aggregations; run rarely)."""
+        with self._reconcile_lock:
+            started = time.time()
+            totals = next(iter(self.collection.aggregate([
+                {"$group": {
+                    "_id": None,
+                    "total_records": {"$sum": 1},
+                    "audio_seconds": {"$sum": {"$ifNull": ["$audio_duration", 0]}},
+                    "processing_seconds": {"$sum": {"$ifNull": ["$processing_seconds", 0]}},
+                    "processed_records": {"$sum": {"$cond": [{"$gt": ["$processing_seconds", 0]}, 1, 0]}},
+                }}
+            ])), {})
+            documents = [{
+                "_id": "totals",
+                "total_records": totals.get("total_records", 0),
+                "audio_seconds": totals.get("audio_seconds", 0),
+                "processing_seconds": totals.get("processing_seconds", 0),
+                "processed_records": totals.get("processed_records", 0),
+                "reconciled_at": started,
+            }]
+            for kind, field in (("whisper_model", "$whisper_model"), ("llm_model", "$llm_model")):
+                for group in self.collection.aggregate([{"$group": {"_id": field, "count": {"$sum": 1}}}]):
+                    documents.append({"_id": f"{kind}:{group['_id']}", "kind": kind, "name": group["_id"],
+                                      "count": group["count"]})
+            first_day = datetime.combine(datetime.now().date() - timedelta(days=STATISTICS_DAYS - 1), datetime.min.time())
+            for group in self.collection.aggregate([
+                {"$match": {"timestamp": {"$gte": first_day}}},
+                {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}, "count": {"$sum": 1}}},
+            ]):
+                documents.append({"_id": f"day:{group['_id']}", "kind": "day", "date": group["_id"],
+                                  "count": group["count"]})
+
+            for document in documents:
+                self.statistics_collection.replace_one({"_id": document["_id"]}, document, upsert=True)
+            self.statistics_collection.delete_many({"_id": {"$nin": [d["_id"] for d in documents]}})
+            self._statistics_cache = None
+            logger.info(f"Statistics rebuilt in {time.time() - started:.2f}s")
+    
+    def _rebuild_statistics_in_background(self):
+        if self._reconcile_lock.locked():
+            return
+        threading.Thread(target=self._safe_rebuild_statistics, name="statistics-rebuild", daemon=True).start()
+    
+    def _safe_rebuild_statistics(self):
+        try:
+            self.rebuild_statistics()
+        except Exception as e:
+            logger.error(f"Error rebuilding statistics: {e}")
+    
+    def _count_records(self, records: List[Dict], sign: int):
+        """Apply saved (+1) or deleted (-1) records to the counters in one bulk write."""
+        try:
+            # Without a totals document the counters have never been built; get_statistics will build them
+            if not records or not self.statistics_collection.count_documents({"_id": "totals"}, limit=1):
+                return
+            totals = {"total_records": 0, "audio_seconds": 0, "processing_seconds": 0, "processed_records": 0}
+            counters: Dict[str, Dict] = {}
+            first_day = datetime.now().date() - timedelta(days=STATISTICS_DAYS - 1)
+            for record in records:
+                processing = record.get("processing_seconds") or 0
+                totals["total_records"] += sign
+                totals["audio_seconds"] += sign * (record.get("audio_duration") or 0)
+                totals["processing_seconds"] += sign * processing
+                totals["processed_records"] += sign if processing > 0 else 0
+                keys = [("whisper_model", "name", record.get("whisper_model")),
+                        ("llm_model", "name", record.get("llm_model"))]
+                timestamp = record.get("timestamp")
+                if timestamp and timestamp.date() >= first_day:
+                    keys.append(("day", "date", timestamp.date().isoformat()))
+                for kind, label, value in keys:
+                    counter = counters.setdefault(f"{kind}:{value}", {"kind": kind, label: value, "count": 0})
+                    counter["count"] += sign
+
+            operations = [pymongo.UpdateOne({"_id": "totals"}, {"$inc": totals})]
+            for counter_id, counter in counters.items():
+                increment = counter.pop("count")
+                operations.append(pymongo.UpdateOne({"_id": counter_id},
+                                                    {"$inc": {"count": increment}, "$set": counter}, upsert=True))
+            self.statistics_collection.bulk_write(operations, ordered=False)
+            self._statistics_cache = None
+        except Exception as e:
+            logger.error(f"Error updating statistics: {e}")
+    
+    def _save_segments(self, record_object_id, segments: List[Dict]):
+        """Store a record's segments as columnar arrays, replacing any previous ones."""
+        self.segments_collection.replace_one(
+            {"_id": record_object_id},
+            {"_id": record_object_id, "count": len(segments), **to_columns(segments)},
+            upsert=True,
+        )
+    
     def _get_audio_duration(self, transcript: str) -> int:
         """
         Estimate audio duration from transcript length.
-        This is a rough estimation - you might want to store actual duration.
+        Only used when the transcript has no segment timestamps.
         
         Args:
             transcript: The transcript text
@@ -255,8 +720,11 @@ class DatabaseManager:
     def close_connection(self):
         """Close the database connection."""
         if self.client:
+            with _mongo_clients_lock:
+                if _mongo_clients.get(self.connection_string) is self.client:
+                    del _mongo_clients[self.connection_string]
             self.client.close()
-            print("MongoDB connection closed")
+            logger.info("MongoDB connection closed")
 
 # Singleton instance
 _db_manager = None
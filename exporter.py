@@ -0,0 +1,266 @@
+import asyncio
+import io
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+from xml.sax.saxutils import escape
+
+from cache_store import DiskLRUCache
+
+# Bump when rendering changes so previously cached artifacts are not served
+RENDERER_VERSION = 1
+
+# Exportable record fields and their document titles
+EXPORT_FIELDS = {"summary": "Summary", "transcript": "Transcript"}
+EXPORT_FORMATS = {"txt": "text/plain; charset=utf-8", "pdf": "application/pdf"}
+
+# Record fields needed to decide whether a cached artifact is current
+VERSION_FIELDS = ["timestamp", "updated_at", "user_id", "audio_filename"]
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def render_txt(title: str, text: str) -> bytes:
+    return text.encode("utf-8")
+
+
+def render_pdf(title: str, text: str) -> bytes:
+    """Title followed by one paragraph per blank-line separated block."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = getSampleStyleSheet()
+    story = [Paragraph(f"<b>{escape(title)}</b>", styles["Title"]), Spacer(1, 12)]
+    for para in text.split("\n\n"):
+        story.append(Paragraph(escape(para).replace("\n", "<br/>"), styles["Normal"]))
+        story.append(Spacer(1, 12))
+    doc.build(story)
+    return buffer.getvalue()
+
+
+RENDERERS = {"txt": render_txt, "pdf": render_pdf}
+
+
+def record_version(record: Dict) -> datetime:
+    """When the record's content last changed."""
+    return record.get("updated_at") or record["timestamp"]
+
+
+class Exporter:
+    def __init__(self, cache: DiskLRUCache, render_workers: int = 2):
+        """
+        Renders transcription exports once per (record, field, format, version)
+        and keeps the artifacts in a disk cache.
+
+        The version is the record's last modification time, so an edited record
+        renders fresh artifacts; invalidate() also drops the stale ones right
+        away. Rendering runs on a dedicated pool, keeping slow PDF builds off
+        the request threads, and concurrent requests for the same artifact
+        share one render.
+
+        Args:
+            cache: Disk cache holding rendered artifacts
+            render_workers: Artifacts rendered at once
+        """
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix="export")
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def artifact_key(record_id: str, field: str, fmt: str, version: datetime) -> str:
+        return f"{record_id}-{field}-{fmt}-{int(version.timestamp() * 1000)}-v{RENDERER_VERSION}"
+
+    def ensure_artifact(self, record_id: str, field: str, fmt: str, version: datetime,
+                        load_text) -> str:
+        """
+        Render an artifact unless it is already cached.
+
+        Args:
+            record_id: ID of the record
+            field: "summary" or "transcript"
+            fmt: "txt" or "pdf"
+            version: record_version() of the record
+            load_text: Function returning the field's text; only called on a miss
+
+        Returns:
+            The artifact's cache key
+        """
+        key = self.artifact_key(record_id, field, fmt, version)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            f = self.cache.open(key)
+            if f is not None:
+                f.close()
+            else:
+                self.cache.set(key, RENDERERS[fmt](EXPORT_FIELDS[field], load_text() or ""))
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return key
+
+    async def ensure_artifact_async(self, record_id: str, field: str, fmt: str, version: datetime,
+                                    load_text) -> str:
+        """ensure_artifact on the render pool."""
+        return await asyncio.wrap_future(
+            self._executor.submit(self.ensure_artifact, record_id, field, fmt, version, load_text)
+        )
+
+    def invalidate(self, record_id: str) -> int:
+        """Drop every cached artifact of a record."""
+        return self.cache.delete_prefix(f"{record_id}-")
+
+    def on_database_event(self, event: str, record_id: str, record: Optional[Dict]):
+        """DatabaseManager listener: edited or deleted records lose their artifacts."""
+        if event in ("updated", "deleted"):
+            self.invalidate(record_id)
+
+    def serve(self, request: Request, key: str, fmt: str, filename: str, version: datetime) -> Response:
+        """
+        Serve a cached artifact with validators and single-range support.
+
+        Answers 304 when If-None-Match or If-Modified-Since show the client's
+        copy is current, and 206 for a satisfiable "bytes=" range.
+        """
+        etag = f'"{key}"'
+        last_modified = version.astimezone(timezone.utc).replace(microsecond=0)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(last_modified, usegmt=True),
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, no-cache",
+            "Content-Disposition": f"attachment; filename={filename}",
+        }
+        if self._not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+
+        f = self.cache.open(key)
+        if f is None:
+            return Response("Export is being regenerated, please retry", status_code=503)
+        size = f.seek(0, io.SEEK_END)
+        byte_range = self._parse_range(request.headers.get("range"), size)
+        if byte_range == "unsatisfiable":
+            f.close()
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is None:
+            start, end, status_code = 0, size - 1, 200
+        else:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(self._read_range(f, start, end), status_code=status_code,
+                                 media_type=EXPORT_FORMATS[fmt], headers=headers)
+
+    def stream_zip(self, entries: Iterable[Tuple[str, str, str, str, datetime, object]]) -> Iterator[bytes]:
+        """
+        Build a ZIP archive incrementally, yielding bytes as each member is written.
+
+        Members come from the artifact cache (rendered on demand), so the
+        archive is never held in memory as a whole.
+
+        Args:
+            entries: (archive name, record ID, field, format, version, load_text) tuples
+        """
+        output = _ZipStream()
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, record_id, field, fmt, version, load_text in entries:
+                key = self.ensure_artifact(record_id, field, fmt, version, load_text)
+                f = self.cache.open(key)
+                if f is None:
+                    continue
+                with f, archive.open(name, "w") as member:
+                    while True:
+                        chunk = f.read(STREAM_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        member.write(chunk)
+                        data = output.take()
+                        if data:
+                            yield data
+                data = output.take()
+                if data:
+                    yield data
+        data = output.take()
+        if data:
+            yield data
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    def _parse_range(header: Optional[str], size: int):
+        """(start, end) for a single "bytes=" range, None to send everything, or "unsatisfiable"."""
+        if not header or not header.startswith("bytes=") or "," in header:
+            return None
+        start_str, _, end_str = header[len("bytes="):].strip().partition("-")
+        try:
+            if start_str:
+                start = int(start_str)
+                end = min(int(end_str), size - 1) if end_str else size - 1
+            else:
+                # Suffix range: the last N bytes
+                start, end = max(0, size - int(end_str)), size - 1
+        except ValueError:
+            return None
+        if start >= size or start > end:
+            return "unsatisfiable"
+        return start, end
+
+    @staticmethod
+    def _read_range(f, start: int, end: int) -> Iterator[bytes]:
+        with f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(STREAM_CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, non-seekable sink that zipfile writes into and stream_zip drains."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
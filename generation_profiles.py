@@ -0,0 +1,105 @@
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Context sizes num_ctx is rounded up to. Ollama reloads a model whenever num_ctx
+# changes, so requests share a few sizes instead of each getting an exact fit.
+CONTEXT_SIZES = [2048, 4096, 8192, 16384, 32768, 65536, 131072]
+
+# The token counter (tiktoken cl100k) undercounts for most local model tokenizers
+TOKENIZER_MARGIN = 1.25
+CONTEXT_SLACK_TOKENS = 256  # Room for the model's prompt template
+DEFAULT_NUM_PREDICT = 512  # Generated tokens budgeted for when a profile does not set num_predict
+
+
+class GenerationProfile:
+    def __init__(self, name: str, keep_alive: Optional[str] = None, num_predict: Optional[int] = None,
+                 temperature: Optional[float] = None, num_thread: Optional[int] = None,
+                 min_ctx: int = 2048, max_ctx: int = 8192):
+        """
+        Ollama generation settings for one profile and model.
+
+        Args:
+            name: Profile name shown on the summarize form
+            keep_alive: How long Ollama keeps the model loaded after a request (e.g. "30m"; None for its default)
+            num_predict: Maximum tokens generated
+            temperature: Sampling temperature
+            num_thread: CPU threads Ollama uses (None lets it decide)
+            min_ctx: Smallest num_ctx requested
+            max_ctx: Largest num_ctx requested; the model's trained context length is a sensible cap
+        """
+        self.name = name
+        self.keep_alive = keep_alive
+        self.num_predict = num_predict
+        self.temperature = temperature
+        self.num_thread = num_thread
+        self.min_ctx = min_ctx
+        self.max_ctx = max_ctx
+
+    def prompt_budget(self) -> int:
+        """Largest prompt, in counted tokens, that fits max_ctx together with the generated tokens."""
+        available = self.max_ctx - (self.num_predict or DEFAULT_NUM_PREDICT) - CONTEXT_SLACK_TOKENS
+        return max(0, int(available / TOKENIZER_MARGIN))
+
+    def num_ctx(self, prompt_tokens: int) -> int:
+        """Context size that fits the prompt and the generated tokens, rounded up to one of CONTEXT_SIZES."""
+        needed = int(prompt_tokens * TOKENIZER_MARGIN) + (self.num_predict or DEFAULT_NUM_PREDICT) + CONTEXT_SLACK_TOKENS
+        if needed > self.max_ctx:
+            # Callers size prompts with prompt_budget(); getting here means Ollama will truncate this one
+            logger.warning(f"Prompt of {prompt_tokens} tokens needs a context of {needed} but profile "
+                           f"'{self.name}' is capped at max_ctx {self.max_ctx}; Ollama will truncate it")
+            return self.max_ctx
+        for size in CONTEXT_SIZES:
+            if size >= needed and size >= self.min_ctx:
+                return min(size, self.max_ctx)
+        return self.max_ctx
+
+    def request_fields(self, prompt_tokens: int) -> Dict:
+        """Extra /api/generate fields (keep_alive and options) for a prompt of prompt_tokens tokens."""
+        options = {"num_ctx": self.num_ctx(prompt_tokens)}
+        for option in ("num_predict", "temperature", "num_thread"):
+            value = getattr(self, option)
+            if value is not None:
+                options[option] = value
+        fields = {"options": options}
+        if self.keep_alive is not None:
+            fields["keep_alive"] = self.keep_alive
+        return fields
+
+    def cache_key(self) -> str:
+        """Settings that change the generated text, for summary cache keys."""
+        return f"profile={self.name}/{self.num_predict}/{self.temperature}/{self.min_ctx}-{self.max_ctx}"
+
+
+class GenerationProfiles:
+    def __init__(self, profiles: Dict[str, Dict], model_overrides: Optional[Dict[str, Dict]] = None,
+                 default: Optional[str] = None):
+        """
+        Named generation profiles with per-model overrides.
+
+        Args:
+            profiles: Profile name -> GenerationProfile keyword arguments
+            model_overrides: Model name (with or without ":tag") -> settings applied on top of
+                every profile for that model, e.g. {"llama2": {"max_ctx": 4096}}
+            default: Profile used when none is requested (the first one if not given)
+        """
+        self.profiles = profiles
+        self.model_overrides = model_overrides or {}
+        self.default = default or next(iter(profiles))
+
+    def names(self) -> List[str]:
+        return list(self.profiles)
+
+    def get(self, name: Optional[str], model: str) -> GenerationProfile:
+        """
+        Resolve a profile for a model.
+
+        Raises:
+            KeyError: If the profile name is unknown
+        """
+        name = name or self.default
+        settings = dict(self.profiles[name])
+        settings.update(self.model_overrides.get(model.split(":")[0], {}))
+        settings.update(self.model_overrides.get(model, {}))
+        return GenerationProfile(name, **settings)
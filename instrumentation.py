@@ -0,0 +1,236 @@
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Tuple
+
+from pymongo import monitoring
+
+# Trace ID of the request (or job) the current code runs for; "-" outside of one
+trace_id_var: ContextVar[str] = ContextVar("trace_id", default="-")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(trace_id)s] %(name)s: %(message)s"
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class TraceIdFilter(logging.Filter):
+    """Adds the current trace ID to every log record as %(trace_id)s."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = trace_id_var.get()
+        return True
+
+
+def configure_logging(level: int = logging.INFO):
+    """Log to stderr with the trace ID in every line. Does nothing if the root logger already has handlers."""
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.addFilter(TraceIdFilter())
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+    def _render_samples(self, items) -> List[str]:
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    def _render_samples(self, items) -> List[str]:
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Named metrics rendered together in the Prometheus text exposition format."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+    def _register(self, metric: _Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route", "status"))
+STAGE_SECONDS = registry.histogram(
+    "pipeline_stage_duration_seconds",
+    "Time spent in each pipeline stage (job stages, ffmpeg, whisper load/inference, Ollama load/prompt/generation)",
+    ("stage",))
+AUDIO_SECONDS = registry.counter(
+    "audio_processed_seconds_total", "Seconds of audio transcribed", ("backend", "model"))
+REALTIME_FACTOR = registry.histogram(
+    "whisper_realtime_factor", "Whisper inference seconds per second of audio", ("backend", "model"),
+    buckets=(0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5))
+OLLAMA_TOKENS = registry.counter(
+    "ollama_tokens_total", "Tokens evaluated by Ollama", ("model", "kind"))
+OLLAMA_TOKENS_PER_SECOND = registry.histogram(
+    "ollama_generation_tokens_per_second", "Ollama generation speed", ("model",),
+    buckets=(1, 2, 5, 10, 20, 30, 50, 75, 100, 200))
+MONGO_COMMAND_SECONDS = registry.histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round trips", ("command", "outcome"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5))
+JOB_QUEUE_JOBS = registry.gauge("job_queue_jobs", "Jobs in the upload queue by status", ("status",))
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+@contextmanager
+def timed(stage: str):
+    """Record the duration of the with-block as a pipeline stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def record_transcription(result):
+    """Record whisper load/inference time, audio processed and realtime factor of a TranscriptionResult."""
+    observe_stage("whisper_load", result.load_seconds)
+    observe_stage("whisper_inference", result.inference_seconds)
+    if result.audio_seconds:
+        AUDIO_SECONDS.inc(result.audio_seconds, backend=result.backend, model=result.model_name)
+        REALTIME_FACTOR.observe(result.inference_seconds / result.audio_seconds,
+                                backend=result.backend, model=result.model_name)
+
+
+def record_ollama_response(model: str, final: Dict):
+    """Record token counts and durations from the final ("done") object of an Ollama /api/generate stream."""
+    # Ollama reports durations in nanoseconds
+    for field, stage in (("load_duration", "ollama_load"), ("prompt_eval_duration", "ollama_prompt_eval"),
+                         ("eval_duration", "ollama_generation")):
+        if final.get(field):
+            observe_stage(stage, final[field] / 1e9)
+    if final.get("prompt_eval_count"):
+        OLLAMA_TOKENS.inc(final["prompt_eval_count"], model=model, kind="prompt")
+    if final.get("eval_count"):
+        OLLAMA_TOKENS.inc(final["eval_count"], model=model, kind="generated")
+        if final.get("eval_duration"):
+            OLLAMA_TOKENS_PER_SECOND.observe(final["eval_count"] / (final["eval_duration"] / 1e9), model=model)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """pymongo listener recording every command's round trip time."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, command=event.command_name, outcome="ok")
+
+    def failed(self, event):
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, command=event.command_name, outcome="error")
@@ -0,0 +1,216 @@
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    def __init__(self, params: Dict, stage_names: List[str], owner: Optional[str] = None):
+        """
+        A unit of work flowing through the job queue.
+
+        Args:
+            params: Input parameters for the pipeline (paths, model names, ...)
+            stage_names: Ordered names of the stages this job will run
+            owner: ID of the user who submitted the job
+        """
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.owner = owner
+        self.stage_names = stage_names
+        self.state: Dict = {}
+        self.status = JOB_QUEUED
+        self.stage: Optional[str] = None
+        self.stages_completed = 0
+        self.stage_timings: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of stages completed, between 0.0 and 1.0."""
+        if not self.stage_names:
+            return 1.0
+        return self.stages_completed / len(self.stage_names)
+
+    def to_dict(self) -> Dict:
+        """Return a JSON-serializable view of the job."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": self.stage_names,
+            "progress": round(self.progress, 3),
+            "stage_timings": self.stage_timings,
+            "error": self.error,
+            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S") if self.started_at else None,
+            "finished_at": self.finished_at.strftime("%Y-%m-%d %H:%M:%S") if self.finished_at else None,
+            "result": self.state.get("result"),
+        }
+
+
+class JobQueue:
+    def __init__(self, stages: List[Tuple[str, Callable[[Job], None]]], max_workers: int = 4,
+                 max_pending: int = 32, stage_limits: Optional[Dict[str, int]] = None,
+                 retention_seconds: int = 3600,
+                 stage_observer: Optional[Callable[[str, float], None]] = None):
+        """
+        Bounded background job queue running each job through a fixed list of stages.
+
+        Args:
+            stages: Ordered (name, function) pairs; each function receives the Job
+                and stores its outputs in ``job.state``
+            max_workers: Number of worker threads running jobs
+            max_pending: Number of jobs allowed to wait for a worker before
+                submissions are rejected with QueueFullError
+            stage_limits: Maximum number of jobs allowed in each stage at once;
+                stages not listed are limited only by max_workers
+            retention_seconds: How long finished jobs stay queryable
+            stage_observer: Called with (stage name, seconds) after every stage, e.g. to record metrics
+        """
+        self.stages = stages
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self.stage_observer = stage_observer
+        stage_limits = stage_limits or {}
+        self._stage_limits = {name: stage_limits.get(name, max_workers) for name, _ in stages}
+        self._stage_semaphores = {
+            name: threading.BoundedSemaphore(limit) for name, limit in self._stage_limits.items()
+        }
+        self._stage_active = {name: 0 for name, _ in stages}
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+
+    def submit(self, params: Dict, owner: Optional[str] = None) -> Job:
+        """
+        Enqueue a new job.
+
+        Args:
+            params: Input parameters for the pipeline
+            owner: ID of the submitting user
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFullError: If the queue already holds max_workers + max_pending active jobs
+        """
+        with self._lock:
+            self._prune()
+            active = sum(1 for job in self._jobs.values() if not job.finished)
+            if active >= self.max_workers + self.max_pending:
+                raise QueueFullError(
+                    f"Job queue is full ({active} active jobs). Please try again later."
+                )
+            job = Job(params, [name for name, _ in self.stages], owner=owner)
+            self._jobs[job.id] = job
+        # The job runs in the submitter's context, so it keeps e.g. the request's trace ID
+        self._executor.submit(contextvars.copy_context().run, self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID, or None if it is unknown or has expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, owner: Optional[str] = None) -> List[Job]:
+        """List known jobs, newest first, optionally filtered by owner."""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if owner is None or job.owner == owner]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def queue_position(self, job: Job) -> int:
+        """Number of queued jobs submitted before this one (0 once it is running)."""
+        if job.status != JOB_QUEUED:
+            return 0
+        with self._lock:
+            return sum(
+                1 for other in self._jobs.values()
+                if other.status == JOB_QUEUED and other.created_at < job.created_at
+            )
+
+    def get_statistics(self) -> Dict:
+        """Snapshot of queue depth and per-stage occupancy."""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            stage_active = dict(self._stage_active)
+        return {
+            "queued": statuses.count(JOB_QUEUED),
+            "running": statuses.count(JOB_RUNNING),
+            "completed": statuses.count(JOB_COMPLETED),
+            "failed": statuses.count(JOB_FAILED),
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "stages": {
+                name: {"active": stage_active[name], "limit": limit}
+                for name, limit in self._stage_limits.items()
+            },
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for running jobs."""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job):
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now()
+        try:
+            for name, func in self.stages:
+                semaphore = self._stage_semaphores[name]
+                with semaphore:
+                    with self._lock:
+                        self._stage_active[name] += 1
+                    job.stage = name
+                    start = time.perf_counter()
+                    try:
+                        func(job)
+                    finally:
+                        elapsed = time.perf_counter() - start
+                        job.stage_timings[name] = round(elapsed, 3)
+                        with self._lock:
+                            self._stage_active[name] -= 1
+                        if self.stage_observer is not None:
+                            self.stage_observer(name, elapsed)
+                job.stages_completed += 1
+            job.status = JOB_COMPLETED
+        except Exception as e:
+            logger.error(f"Job {job.id} failed in stage {job.stage}: {e}")
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = datetime.now()
+
+    def _prune(self):
+        """Forget finished jobs older than the retention window. Caller holds the lock."""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at.timestamp() < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
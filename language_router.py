@@ -0,0 +1,132 @@
+import hashlib
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cache_store import DiskLRUCache
+
+# Model name meaning "pick by detected language"
+AUTO_MODEL = "auto"
+
+
+class LanguageRoute:
+    def __init__(self, language: Optional[str], probability: float, whisper_model: str, llm_model: str,
+                 translate: bool = False):
+        """
+        Models and whisper settings chosen for a recording.
+
+        Args:
+            language: Detected language code passed to whisper, or None when detection was not confident
+            probability: Detection probability
+            whisper_model: Whisper model to transcribe with
+            llm_model: Ollama model to summarize with
+            translate: Have whisper translate the speech to English and summarize the translation
+        """
+        self.language = language
+        self.probability = probability
+        self.whisper_model = whisper_model
+        self.llm_model = llm_model
+        self.translate = translate
+
+    def to_dict(self) -> Dict:
+        return {
+            "language": self.language,
+            "probability": round(self.probability, 3),
+            "whisper_model": self.whisper_model,
+            "llm_model": self.llm_model,
+            "translate": self.translate,
+        }
+
+
+class LanguageRouter:
+    def __init__(self, rules: Dict[str, Dict], default: Dict, min_probability: float = 0.5,
+                 whisper_available: Optional[Callable[[str], bool]] = None,
+                 llm_available: Optional[Callable[[str], bool]] = None):
+        """
+        Chooses models for a recording from its detected language.
+
+        Each rule lists candidate models smallest first; the first one that is
+        installed is used, so a language is routed to the cheapest model known to
+        handle it well.
+
+        Args:
+            rules: Language code -> {"whisper_models": [...], "llm_models": [...], "translate": bool};
+                missing keys come from default
+            default: Rule for languages without one, and for unconfident detections
+            min_probability: Detections below this probability use the default rule and no language hint
+            whisper_available: Whether a whisper model is installed (all are assumed to be if None)
+            llm_available: Whether an Ollama model is available (all are assumed to be if None)
+        """
+        self.rules = rules
+        self.default = default
+        self.min_probability = min_probability
+        self.whisper_available = whisper_available or (lambda name: True)
+        self.llm_available = llm_available or (lambda name: True)
+
+    def route(self, language: Optional[str], probability: float, whisper_model: str = AUTO_MODEL,
+              llm_model: str = AUTO_MODEL) -> LanguageRoute:
+        """
+        Route a recording.
+
+        Args:
+            language: Detected language code, or None if detection failed
+            probability: Detection probability
+            whisper_model: Requested whisper model; anything but AUTO_MODEL is kept
+            llm_model: Requested Ollama model; anything but AUTO_MODEL is kept
+
+        Returns:
+            The route to use
+        """
+        if not language or probability < self.min_probability:
+            language = None
+        rule = {**self.default, **self.rules.get(language, {})} if language else self.default
+        if whisper_model == AUTO_MODEL:
+            whisper_model = self._pick(rule.get("whisper_models", []), self.default["whisper_models"],
+                                       self.whisper_available)
+        if llm_model == AUTO_MODEL:
+            llm_model = self._pick(rule.get("llm_models", []), self.default["llm_models"], self.llm_available)
+        # English-only whisper models cannot take another language hint
+        hint = language if language and (language == "en" or not whisper_model.endswith(".en")) else None
+        translate = bool(hint and rule.get("translate", False))
+        return LanguageRoute(hint, probability, whisper_model, llm_model, translate)
+
+    @staticmethod
+    def _pick(candidates: List[str], defaults: List[str], available: Callable[[str], bool]) -> str:
+        for name in list(candidates) + list(defaults):
+            if available(name):
+                return name
+        # Nothing installed matches; let the later stage report the missing model
+        return (list(candidates) + list(defaults))[0]
+
+
+class LanguageCache:
+    def __init__(self, directory: str = "cache/languages", max_bytes: int = 16 * 1024 * 1024):
+        """
+        Detected languages keyed on the SHA-256 of the audio bytes and the detection model,
+        so a re-uploaded recording is not run through detection again.
+
+        Args:
+            directory: Directory for cached detections
+            max_bytes: Size budget before least-recently-used entries are evicted
+        """
+        self.store = DiskLRUCache(directory, max_bytes)
+
+    @staticmethod
+    def make_key(audio_hash: str, whisper_model: str) -> str:
+        return hashlib.sha256(f"{audio_hash}\n{whisper_model}".encode("utf-8")).hexdigest()
+
+    def get(self, audio_hash: str, whisper_model: str) -> Optional[Tuple[str, float]]:
+        """Return the cached (language, probability), or None on a miss."""
+        entry = self.store.get_json(self.make_key(audio_hash, whisper_model))
+        return (entry["language"], entry["probability"]) if entry else None
+
+    def set(self, audio_hash: str, whisper_model: str, language: str, probability: float):
+        self.store.set_json(self.make_key(audio_hash, whisper_model), {
+            "audio_hash": audio_hash,
+            "whisper_model": whisper_model,
+            "language": language,
+            "probability": probability,
+            "created_at": datetime.now().isoformat(),
+        })
+
+    def get_statistics(self) -> Dict:
+        return self.store.get_statistics()
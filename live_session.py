@@ -0,0 +1,159 @@
+import threading
+from typing import Callable, Dict, List, Tuple
+
+from audio_stream import BYTES_PER_SAMPLE, BYTES_PER_SECOND
+from transcript_segments import parse_segments
+from transcription_engine import format_segments
+
+
+class LiveSession:
+    def __init__(self, transcribe: Callable[[float, bytes], str], step_seconds: float = 3.0,
+                 holdback_seconds: float = 2.0, max_window_seconds: float = 30.0):
+        """
+        Incremental transcription of a live recording with a sliding window.
+
+        Audio arrives as 16kHz mono s16le PCM. Each step transcribes the audio
+        after the last committed segment. Segments ending more than
+        holdback_seconds before the live edge are committed (they will not
+        change) and their audio is dropped; the rest are returned as partial
+        results and transcribed again, with more context, on the next step.
+        So each step transcribes at most max_window_seconds of audio however
+        long the meeting runs.
+
+        Args:
+            transcribe: Called with (offset in seconds, PCM) and returns
+                "[start --> end]  text" lines with timestamps shifted by offset
+            step_seconds: New audio needed before the window is transcribed again
+            holdback_seconds: Segments this close to the live edge stay partial
+            max_window_seconds: Longest window transcribed; when exceeded the
+                oldest audio is committed without waiting for the live edge
+        """
+        self.transcribe = transcribe
+        self.step_seconds = step_seconds
+        self.holdback_seconds = holdback_seconds
+        self.max_window_seconds = max_window_seconds
+        self.committed: List[Dict] = []
+        self.summarized_count = 0  # Committed segments already folded into the rolling summary
+        self._buffer = bytearray()
+        self._buffer_offset = 0.0  # Seconds of audio before the buffer (committed and dropped)
+        self._pending_bytes = 0  # Audio received since the last step
+        self._partial_remainder = b""  # Odd byte of a sample split across messages
+        self._lock = threading.Lock()
+
+    @property
+    def audio_seconds(self) -> float:
+        """Seconds of audio received so far."""
+        with self._lock:
+            return self._buffer_offset + len(self._buffer) / BYTES_PER_SECOND
+
+    def add_audio(self, pcm: bytes):
+        """Append received PCM."""
+        with self._lock:
+            pcm = self._partial_remainder + pcm
+            usable = len(pcm) - len(pcm) % BYTES_PER_SAMPLE
+            self._partial_remainder = pcm[usable:]
+            self._buffer += pcm[:usable]
+            self._pending_bytes += usable
+
+    def ready(self) -> bool:
+        """Whether enough new audio has arrived for another step."""
+        with self._lock:
+            return self._pending_bytes >= self.step_seconds * BYTES_PER_SECOND
+
+    def step(self, final: bool = False) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Transcribe the current window. Not safe to call from several threads at once.
+
+        Args:
+            final: The recording has ended; commit everything in the window (see finish)
+
+        Returns:
+            (newly committed segments, partial segments), as {"start", "end", "text"} dicts in seconds
+        """
+        max_bytes = int(self.max_window_seconds * BYTES_PER_SECOND)
+        with self._lock:
+            offset = self._buffer_offset
+            window = bytes(self._buffer[:max_bytes])
+            # More audio is waiting behind the window, so its end is not the live edge
+            truncated = len(self._buffer) > max_bytes
+            self._pending_bytes = 0
+        if not window:
+            return [], []
+        window_end = offset + len(window) / BYTES_PER_SECOND
+        segments = [
+            {"start": s["start_ms"] / 1000, "end": s["end_ms"] / 1000, "text": s["text"]}
+            for s in parse_segments(self.transcribe(offset, window))
+        ]
+
+        if truncated:
+            # The last segment may be cut at the window edge; it is transcribed again from its
+            # start with the audio behind it, so only whole segments are committed
+            commit_count = max(1, len(segments) - 1)
+        elif final:
+            commit_count = len(segments)
+        else:
+            stable_until = window_end - self.holdback_seconds
+            commit_count = sum(1 for s in segments if s["end"] <= stable_until)
+            if commit_count == 0 and len(window) >= max_bytes:
+                # Never let the window grow past its limit waiting for a pause
+                commit_count = max(1, len(segments) - 1)
+        committed, partial = segments[:commit_count], segments[commit_count:]
+
+        # Drop the committed audio; silence with no segments at all is dropped up to the holdback
+        if final and not truncated:
+            drop_until = window_end
+        elif committed:
+            drop_until = max(offset, min(committed[-1]["end"], window_end))
+        elif not segments:
+            drop_until = max(offset, window_end - self.holdback_seconds)
+        else:
+            drop_until = offset
+        drop_bytes = int((drop_until - offset) * BYTES_PER_SECOND)
+        drop_bytes -= drop_bytes % BYTES_PER_SAMPLE
+        if drop_bytes <= 0 and (final or truncated):
+            # Always move past a window that cannot wait for more audio
+            drop_bytes = len(window)
+        with self._lock:
+            del self._buffer[:drop_bytes]
+            self._buffer_offset = offset + drop_bytes / BYTES_PER_SECOND
+            self.committed.extend(committed)
+        return committed, partial
+
+    def finish(self) -> List[Dict]:
+        """
+        Transcribe and commit all remaining audio, a window at a time, once the recording has ended.
+
+        Returns:
+            The newly committed segments
+        """
+        committed = []
+        while True:
+            with self._lock:
+                if not self._buffer:
+                    return committed
+            new, _ = self.step(final=True)
+            committed.extend(new)
+
+    def transcript(self) -> str:
+        """The committed transcript as "[start --> end]  text" lines."""
+        with self._lock:
+            return format_segments(self.committed)
+
+    def unsummarized(self) -> Tuple[str, int, float]:
+        """
+        Committed text not yet folded into the rolling summary. Pass the count to
+        mark_summarized once the summary update has succeeded.
+
+        Returns:
+            (transcript lines, committed segment count they run up to, end of the last one in seconds)
+        """
+        with self._lock:
+            count = len(self.committed)
+            segments = self.committed[self.summarized_count:]
+            until = self.committed[-1]["end"] if self.committed else 0.0
+        return format_segments(segments), count, until
+
+    def mark_summarized(self, count: int):
+        """Record that the first count committed segments are covered by the rolling summary."""
+        with self._lock:
+            self.summarized_count = max(self.summarized_count, count)
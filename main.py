@@ -1,51 +1,279 @@
 import subprocess
 import os
+import asyncio
+import logging
 import gradio as gr
-import requests
 import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
 from database_manager import get_database_manager
+from instrumentation import (
+    HTTP_REQUEST_SECONDS,
+    JOB_QUEUE_JOBS,
+    configure_logging,
+    new_trace_id,
+    observe_stage,
+    record_ollama_response,
+    record_transcription,
+    registry as metrics_registry,
+    timed,
+    trace_id_var,
+)
+from password_hasher import HasherBusyError, PasswordHasher
+from semantic_index import OllamaEmbedder, SemanticIndex, SemanticSearch, TransformersEmbedder
+from cache_store import DiskLRUCache, TTLLRUCache
+from generation_profiles import GenerationProfile, GenerationProfiles
+from language_router import AUTO_MODEL, LanguageCache, LanguageRoute, LanguageRouter
+from live_session import LiveSession
+from exporter import EXPORT_FIELDS, EXPORT_FORMATS, VERSION_FIELDS, Exporter, record_version
+from job_queue import JOB_COMPLETED, Job, JobQueue, QueueFullError
+from transcript_cache import get_transcript_cache, hash_file
+from summary_cache import get_summary_cache
+from chunked_summarizer import ChunkedSummarizer, count_tokens
+from ollama_client import OllamaClient, OllamaError
+from model_registry import ModelRegistry
+from audio_stream import BYTES_PER_SECOND, pcm_windows, stream_pcm
+from vad import VoiceActivityDetector
+from upload_store import UploadTooLargeError, save_upload
+from transcription_engine import (
+    OpenAIWhisperBackend,
+    TranscriptionEngine,
+    TranscriptionResult,
+    WhisperCliBackend,
+    WhisperServerBackend,
+    format_timestamp,
+)
 import pandas as pd
-from fastapi import FastAPI, Request, Form, Depends, status, HTTPException, Response, UploadFile
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, StreamingResponse
+from fastapi import FastAPI, Request, Form, Depends, status, HTTPException, Response, UploadFile, WebSocket
+from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, StreamingResponse, JSONResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from passlib.context import CryptContext
+from fastapi.concurrency import run_in_threadpool
+from markupsafe import Markup, escape
 from jose import JWTError, jwt
-import pymongo
-from typing import Optional
-import io
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+from typing import Iterator, Optional, Tuple
+from contextlib import asynccontextmanager
+
+# Log lines carry the trace ID of the request or job they belong to
+configure_logging()
+logger = logging.getLogger(__name__)
 
 OLLAMA_SERVER_URL = "http://localhost:11434"  # Replace this with your actual Ollama server URL if different
+OLLAMA_SERVER_URLS = [OLLAMA_SERVER_URL]  # Add more Ollama hosts to spread summarization across them
+OLLAMA_CONNECT_TIMEOUT = 5  # Seconds to wait for a connection to an Ollama host
+OLLAMA_READ_TIMEOUT = 600  # Seconds to wait for data while a model loads or generates
+OLLAMA_MAX_RETRIES = 3  # Retries on connection errors and 5xx responses
 WHISPER_MODEL_DIR = "./whisper.cpp/models"  # Directory where whisper models are stored
+MODEL_REGISTRY_TTL = 60  # Seconds between refreshes of the Ollama model list
+MODEL_REGISTRY_WATCH_INTERVAL = 5  # Seconds between checks of WHISPER_MODEL_DIR for new models
+WHISPER_OPTIONS: list[str] = []  # Extra whisper.cpp flags; part of the transcript cache key
+# Transcription backend: "cli" runs whisper-cli per request (reloads the model every time),
+# "server" keeps a whisper.cpp server process per model running, "openai" keeps
+# openai-whisper models loaded in this process on CPU. Resident backends fall back to "cli".
+WHISPER_BACKEND = "cli"
+WHISPER_CLI_PATH = os.path.abspath(os.path.join("whisper.cpp", "build", "bin", "Release", "whisper-cli.exe"))
+WHISPER_SERVER_PATH = os.path.abspath(os.path.join("whisper.cpp", "build", "bin", "Release", "whisper-server.exe"))
+WHISPER_MEMORY_BUDGET = 4 * 1024 ** 3  # Bytes of resident whisper models before least recently used are unloaded
+WHISPER_STREAM_DECODE = True  # Pipe ffmpeg PCM into backends that accept it instead of writing a WAV file
+WHISPER_STREAM_WINDOW_SECONDS = 300  # Audio transcribed per window when streaming (bounds memory use)
+PCM_CHUNK_BYTES = 64 * 1024  # Read size for ffmpeg's PCM output
+
+# Voice activity detection drops silence before whisper runs and splits speech into
+# chunks that are transcribed in parallel; see vad.VoiceActivityDetector. Each chunk costs
+# at least one 30s whisper window, and with the "cli" backend a model load as well, so it is
+# only on by default for the resident backends.
+VAD_ENABLED = WHISPER_BACKEND in ("server", "openai")
+VAD_OPTIONS = {  # Part of the transcript cache key
+    "threshold_db": -45.0,  # Frames quieter than this (dBFS) are silence
+    "min_silence_seconds": 0.5,
+    "min_chunk_seconds": 30.0,  # whisper pads shorter chunks to 30s anyway
+    "max_chunk_seconds": 60.0,
+}
+WHISPER_CHUNK_WORKERS = max(1, (os.cpu_count() or 1) // 4)  # VAD chunks transcribed at once (~4 whisper threads each)
+
+# Language detection on the first seconds of speech routes each recording to models suited to
+# its language; see language_router.LanguageRouter. Choosing "auto" on the summarize form
+# uses the routed models, and the detected language is passed to whisper either way.
+LANGUAGE_DETECTION_ENABLED = True
+LANGUAGE_DETECTION_MODEL = "base"  # Multilingual whisper model used for detection (not a ".en" model)
+LANGUAGE_DETECTION_SECONDS = 30  # Speech sampled from the start of the recording
+LANGUAGE_MIN_PROBABILITY = 0.5  # Less confident detections use LANGUAGE_DEFAULT_ROUTE without a language hint
+LANGUAGE_DEFAULT_ROUTE = {"whisper_models": ["base"], "llm_models": ["llama2"]}
+LANGUAGE_ROUTES = {  # Candidate models smallest first; the first installed one is used
+    "en": {"whisper_models": ["base.en", "base"]},
+    "es": {"whisper_models": ["small", "base"]},
+    # whisper translates to English and the English summary prompt runs on the translation
+    "hi": {"whisper_models": ["medium", "small"], "translate": True},
+    "ta": {"whisper_models": ["medium", "small"], "translate": True},
+}
+
+# Long transcripts are summarized in chunks (map) whose summaries are then combined (reduce)
+SUMMARY_CHUNK_TOKENS = 3000  # Transcripts longer than this are summarized in chunks of this size
+SUMMARY_PROMPT_OVERHEAD_TOKENS = 150  # Prompt template around the transcript, on top of the user's context
+SUMMARY_CHUNK_OVERLAP_TOKENS = 200  # Context repeated between consecutive chunks
+SUMMARY_MAP_CONCURRENCY = 4  # Chunk prompts sent to Ollama at once
+SUMMARY_REDUCE_FAN_IN = 8  # Partial summaries combined per reduce prompt
+
+# Ollama generation profiles offered on the summarize form; see generation_profiles.GenerationProfile.
+# num_ctx is sized from each prompt between min_ctx and max_ctx, so long prompts are not truncated.
+GENERATION_PROFILES = {
+    "fast": {"keep_alive": "30m", "num_predict": 512, "temperature": 0.2, "min_ctx": 2048, "max_ctx": 8192},
+    "thorough": {"keep_alive": "30m", "num_predict": 1536, "temperature": 0.5, "min_ctx": 4096, "max_ctx": 32768},
+}
+DEFAULT_GENERATION_PROFILE = "fast"
+MODEL_GENERATION_OVERRIDES = {  # Per-model settings applied on top of every profile
+    "llama2": {"max_ctx": 4096},  # Trained context length
+}
+PREWARM_MODELS: list[str] = []  # Loaded into Ollama at startup with the default profile's keep_alive
+
+# Background job queue settings for web uploads
+JOB_WORKERS = 4  # Jobs processed at the same time
+JOB_MAX_PENDING = 32  # Jobs allowed to wait for a worker before uploads are rejected
+JOB_STAGE_LIMITS = {  # Maximum jobs inside each pipeline stage at once
+    "detect": 1,  # whisper language detection on the first seconds of audio
+    "preprocess": 2,  # ffmpeg conversion
+    "transcribe": 1,  # whisper.cpp is CPU bound and already multi-threaded
+    "summarize": 2,  # concurrent generations sent to Ollama
+    "save": 4,
+}
+JOB_STREAM_POLL_SECONDS = 0.1  # How often /jobs/{job_id}/stream checks for new summary text
+
+# Live transcription over the /live/ws WebSocket; see live_session.LiveSession
+LIVE_STEP_SECONDS = 3  # New audio collected before the window is transcribed again (partial result latency)
+LIVE_HOLDBACK_SECONDS = 2  # Segments this close to the live edge stay partial
+LIVE_MAX_WINDOW_SECONDS = 30  # Longest window transcribed per step
+LIVE_DETECTION_SECONDS = 10  # Audio collected before the language is detected and the first step runs
+LIVE_SUMMARY_INTERVAL_SECONDS = 300  # The rolling summary is updated with new segments this often
+LIVE_MAX_SESSIONS = 4  # Concurrent live sessions; more are refused
+
+# Upload ingestion
+UPLOAD_DIR = "uploads"  # Uploads are stored here as <sha256><ext>
+MAX_UPLOAD_BYTES = 500 * 1024 * 1024  # Larger uploads are rejected with 413
+UPLOAD_CHUNK_BYTES = 1024 * 1024  # Bytes copied to disk per read
+
+HISTORY_PAGE_SIZE = 20  # Records per /history page
+SEARCH_PAGE_SIZE = 10  # Results per /search page
+
+# Semantic search: saved records are chunked, embedded in the background and added to a vector index
+SEMANTIC_EMBEDDER = "ollama"  # "ollama" (EMBEDDING_MODEL on the Ollama hosts) or "transformers" (local CPU model)
+EMBEDDING_MODEL = "nomic-embed-text"  # Ollama model, or a Hugging Face model name for "transformers"
+SEMANTIC_INDEX_DIR = "cache/semantic"  # Memory-mapped vectors and row metadata
+SEMANTIC_CHUNK_WORDS = 120  # Approximate words per embedded transcript chunk
+
+# Rendered TXT/PDF exports
+EXPORT_CACHE_DIR = "cache/exports"
+EXPORT_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # Artifacts kept before least recently used are evicted
+EXPORT_RENDER_WORKERS = 2  # PDFs rendered at once, off the request threads
+EXPORT_BULK_MAX_RECORDS = 500  # Records per ZIP export
+
+USER_CACHE_TTL_SECONDS = 30  # How long an authenticated user's document is reused without a database read
+USER_CACHE_MAX_ENTRIES = 1024
+
+# Password hashing runs on its own pool so login bursts don't starve other requests
+PASSWORD_BCRYPT_ROUNDS = 12  # bcrypt cost; stored hashes with another cost are rehashed at sign-in
+PASSWORD_HASH_WORKERS = 2  # bcrypt operations running at once
+PASSWORD_HASH_MAX_PENDING = 64  # Operations waiting or running before sign-ins get a 503
+
+
+# Background services started and stopped with the web app
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    model_registry.start()
+    await run_in_threadpool(register_database_listeners)
+    if PREWARM_MODELS:
+        threading.Thread(target=prewarm_models, args=(PREWARM_MODELS,), name="ollama-prewarm", daemon=True).start()
+    yield
+    # Running jobs still need whisper, Ollama and the indexes, so they finish first
+    job_queue.shutdown()
+    semantic_search.shutdown()
+    exporter.shutdown()
+    model_registry.stop()
+    transcription_engine.shutdown()
+    password_hasher.shutdown()
+    ollama_client.close()
 
 
 # FastAPI app and Jinja2 setup
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 templates = Jinja2Templates(directory="templates")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+
+# Reject oversized uploads from Content-Length before the body is read
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if request.method == "POST" and request.url.path == "/summarize":
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+            return JSONResponse(
+                {"detail": f"Upload exceeds the maximum size of {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+    return await call_next(request)
+
+
+# Trace ID and latency of every request; the ID is taken from X-Request-ID when the client sends one
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    trace_id = request.headers.get("x-request-id") or new_trace_id()
+    token = trace_id_var.set(trace_id)
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        response.headers["X-Trace-Id"] = trace_id
+        return response
+    finally:
+        # Label by route template, not raw path, to keep the number of series bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                                     route=getattr(route, "path", "unmatched"), status=status_code)
+        trace_id_var.reset(token)
+
+
+# Shared Ollama client (connection pooling, retries, load balancing across OLLAMA_SERVER_URLS)
+ollama_client = OllamaClient(
+    OLLAMA_SERVER_URLS,
+    connect_timeout=OLLAMA_CONNECT_TIMEOUT,
+    read_timeout=OLLAMA_READ_TIMEOUT,
+    max_retries=OLLAMA_MAX_RETRIES,
+)
+
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(
+    rounds=PASSWORD_BCRYPT_ROUNDS,
+    max_workers=PASSWORD_HASH_WORKERS,
+    max_pending=PASSWORD_HASH_MAX_PENDING,
+)
 
 # JWT settings
 SECRET_KEY = "your-secret-key"  # Change this in production
 ALGORITHM = "HS256"
 
-# MongoDB setup for users
+# MongoDB setup for users, on the client shared with the transcription history
+_user_collection = None
+
 def get_user_collection():
-    client = pymongo.MongoClient("mongodb://localhost:27017/")
-    db = client["meeting_summarizer"]
-    if "users" not in db.list_collection_names():
-        db.create_collection("users")
-    return db["users"]
+    global _user_collection
+    if _user_collection is None:
+        users = get_database_manager().db["users"]
+        users.create_index("email")
+        _user_collection = users
+    return _user_collection
+
+# Recently authenticated users by user ID; entries are dropped when the profile changes
+user_cache = TTLLRUCache(max_entries=USER_CACHE_MAX_ENTRIES, ttl_seconds=USER_CACHE_TTL_SECONDS)
 
 # Dependency to get current user from JWT cookie
 def get_current_user(request: Request):
-    token = request.cookies.get("access_token")
+    return user_from_token(request.cookies.get("access_token"))
+
+# Resolve the user for an access_token cookie value (WebSocket routes have no Request to depend on)
+def user_from_token(token: Optional[str]) -> dict:
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     try:
@@ -53,11 +281,15 @@ def get_current_user(request: Request):
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        users = get_user_collection()
-        user = users.find_one({"_id": user_id})
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-        return user
+        user = user_cache.get(user_id)
+        if user is None:
+            users = get_user_collection()
+            user = users.find_one({"_id": user_id})
+            if not user:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+            user_cache.set(user_id, user)
+        # Routes may modify the user they receive, so hand out a copy
+        return dict(user)
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
@@ -68,15 +300,19 @@ def signup_page(request: Request):
 
 # Sign up (POST)
 @app.post("/signup", response_class=HTMLResponse)
-def signup(request: Request, username: str = Form(...), email: str = Form(...), password: str = Form(...), confirm_password: str = Form(...)):
-    users = get_user_collection()
+async def signup(request: Request, username: str = Form(...), email: str = Form(...), password: str = Form(...), confirm_password: str = Form(...)):
+    users = await run_in_threadpool(get_user_collection)
     if password != confirm_password:
         return templates.TemplateResponse("signup.html", {"request": request, "error": "Passwords do not match."})
-    if users.find_one({"email": email}):
+    if await run_in_threadpool(users.find_one, {"email": email}):
         return templates.TemplateResponse("signup.html", {"request": request, "error": "Email already registered."})
-    hashed_password = pwd_context.hash(password)
+    try:
+        hashed_password = await password_hasher.hash(password)
+    except HasherBusyError as e:
+        return templates.TemplateResponse("signup.html", {"request": request, "error": str(e)},
+                                          status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
     user = {"_id": email, "username": username, "email": email, "hashed_password": hashed_password}
-    users.insert_one(user)
+    await run_in_threadpool(users.insert_one, user)
     # Auto-login after signup
     token = jwt.encode({"sub": user["_id"]}, SECRET_KEY, algorithm=ALGORITHM)
     response = RedirectResponse("/summarize", status_code=302)
@@ -90,11 +326,21 @@ def signin_page(request: Request):
 
 # Sign in (POST)
 @app.post("/signin", response_class=HTMLResponse)
-def signin(request: Request, response: Response, email: str = Form(...), password: str = Form(...)):
-    users = get_user_collection()
-    user = users.find_one({"email": email})
-    if not user or not pwd_context.verify(password, user["hashed_password"]):
+async def signin(request: Request, response: Response, email: str = Form(...), password: str = Form(...)):
+    users = await run_in_threadpool(get_user_collection)
+    user = await run_in_threadpool(users.find_one, {"email": email})
+    try:
+        valid, new_hash = (await password_hasher.verify_and_update(password, user["hashed_password"])
+                           if user else (False, None))
+    except HasherBusyError as e:
+        return templates.TemplateResponse("signin.html", {"request": request, "error": str(e)},
+                                          status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    if not valid:
         return templates.TemplateResponse("signin.html", {"request": request, "error": "Invalid credentials."})
+    # Upgrade hashes made with an older bcrypt cost
+    if new_hash:
+        await run_in_threadpool(users.update_one, {"_id": user["_id"]}, {"$set": {"hashed_password": new_hash}})
+        user_cache.delete(user["_id"])
     token = jwt.encode({"sub": user["_id"]}, SECRET_KEY, algorithm=ALGORITHM)
     response = RedirectResponse("/summarize", status_code=302)
     response.set_cookie(key="access_token", value=token, httponly=True)
@@ -107,12 +353,17 @@ def profile_page(request: Request, user: dict = Depends(get_current_user)):
 
 # Update profile (POST)
 @app.post("/profile", response_class=HTMLResponse)
-def update_profile(request: Request, username: str = Form(...), email: str = Form(...), password: str = Form(None), user: dict = Depends(get_current_user)):
-    users = get_user_collection()
+async def update_profile(request: Request, username: str = Form(...), email: str = Form(...), password: str = Form(None), user: dict = Depends(get_current_user)):
+    users = await run_in_threadpool(get_user_collection)
     update_data = {"username": username, "email": email}
     if password:
-        update_data["hashed_password"] = pwd_context.hash(password)
-    users.update_one({"_id": user["_id"]}, {"$set": update_data})
+        try:
+            update_data["hashed_password"] = await password_hasher.hash(password)
+        except HasherBusyError as e:
+            return templates.TemplateResponse("profile.html", {"request": request, "user": user, "error": str(e)},
+                                              status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    await run_in_threadpool(users.update_one, {"_id": user["_id"]}, {"$set": update_data})
+    user_cache.delete(user["_id"])
     user.update(update_data)
     return templates.TemplateResponse("profile.html", {"request": request, "user": user, "error": "Profile updated."})
 
@@ -121,6 +372,7 @@ def update_profile(request: Request, username: str = Form(...), email: str = For
 def delete_profile(request: Request, user: dict = Depends(get_current_user)):
     users = get_user_collection()
     users.delete_one({"_id": user["_id"]})
+    user_cache.delete(user["_id"])
     response = RedirectResponse("/signup", status_code=302)
     response.delete_cookie("access_token")
     return response
@@ -132,160 +384,517 @@ def logout(request: Request):
     response.delete_cookie("access_token")
     return response
 
+# Render the summarize page with model choices from the registry
+def render_summarize_page(request: Request, user: dict, job: Optional[dict] = None, error: Optional[str] = None,
+                          status_code: int = status.HTTP_200_OK):
+    return templates.TemplateResponse("summarize.html", {
+        "request": request,
+        "user": user,
+        "job": job,
+        "error": error,
+        "whisper_models": model_registry.whisper_models(),
+        "llm_models": model_registry.llm_models(),
+        "auto_model": AUTO_MODEL,
+        "generation_profiles": generation_profiles.names(),
+        "default_generation_profile": generation_profiles.default,
+    }, status_code=status_code)
+
 # Summarize page (GET)
 @app.get("/summarize", response_class=HTMLResponse)
 def summarize_page(request: Request, user: dict = Depends(get_current_user)):
-    db_manager = get_database_manager()
-    history = db_manager.get_all_transcriptions()
-    return templates.TemplateResponse("summarize.html", {"request": request, "user": user, "result": None, "history": history, "error": None})
+    return render_summarize_page(request, user)
 
-# Summarize page (POST)
+# Summarize page (POST) - streams the upload to disk, queues a background job and returns immediately
 @app.post("/summarize", response_class=HTMLResponse)
-def summarize_upload(request: Request, user: dict = Depends(get_current_user), audio_file: UploadFile = Form(...), context: Optional[str] = Form(""), whisper_model_name: str = Form("base"), llm_model_name: str = Form("llama2")):
+async def summarize_upload(request: Request, user: dict = Depends(get_current_user), audio_file: UploadFile = Form(...), context: Optional[str] = Form(""), whisper_model_name: str = Form(AUTO_MODEL), llm_model_name: str = Form(AUTO_MODEL), generation_profile: str = Form(DEFAULT_GENERATION_PROFILE)):
+    # Reject unknown models and profiles before doing any work
+    model_error = validate_models(whisper_model_name, llm_model_name)
+    if not model_error and generation_profile not in GENERATION_PROFILES:
+        model_error = f"Unknown generation profile '{generation_profile}'"
+    if model_error:
+        return render_summarize_page(request, user, error=model_error, status_code=status.HTTP_400_BAD_REQUEST)
     try:
-        # Save uploaded file
-        audio_path = f"uploads/{audio_file.filename}"
-        with open(audio_path, "wb") as f:
-            f.write(audio_file.file.read())
-        # Run summarization logic
-        summary, transcript_file = translate_and_summarize(audio_path, context or "", whisper_model_name, llm_model_name)
-        db_manager = get_database_manager()
-        history = db_manager.get_all_transcriptions()
-        return templates.TemplateResponse("summarize.html", {"request": request, "user": user, "result": summary, "history": history, "error": None})
+        # Save uploaded file in chunks under its content hash
+        audio_path, audio_hash, _ = await save_upload(
+            audio_file, UPLOAD_DIR, MAX_UPLOAD_BYTES, chunk_size=UPLOAD_CHUNK_BYTES
+        )
+        job = job_queue.submit({
+            "audio_path": audio_path,
+            "audio_hash": audio_hash,
+            "audio_filename": audio_file.filename,
+            "context": context or "",
+            "whisper_model_name": whisper_model_name,
+            "llm_model_name": llm_model_name,
+            "generation_profile": generation_profile,
+        }, owner=user["_id"])
+        return render_summarize_page(request, user, job=job.to_dict())
+    except UploadTooLargeError as e:
+        return render_summarize_page(request, user, error=str(e),
+                                     status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    except QueueFullError as e:
+        return render_summarize_page(request, user, error=str(e), status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
     except Exception as e:
-        db_manager = get_database_manager()
-        history = db_manager.get_all_transcriptions()
-        return templates.TemplateResponse("summarize.html", {"request": request, "user": user, "result": None, "history": history, "error": str(e)})
+        return render_summarize_page(request, user, error=str(e))
+    finally:
+        await audio_file.close()
+
+def validate_models(whisper_model_name: str, llm_model_name: str) -> Optional[str]:
+    """Check requested models like model_registry.validate, accepting "auto" (routed by language) for either."""
+    return model_registry.validate(
+        None if whisper_model_name == AUTO_MODEL else whisper_model_name,
+        None if llm_model_name == AUTO_MODEL else llm_model_name,
+    )
 
-# Download summary endpoint
-@app.get("/download_summary/{record_id}")
-def download_summary(record_id: str, user: dict = Depends(get_current_user)):
+# Live transcription page
+@app.get("/live", response_class=HTMLResponse)
+def live_page(request: Request, user: dict = Depends(get_current_user)):
+    return templates.TemplateResponse("live.html", {
+        "request": request,
+        "user": user,
+        "auto_model": AUTO_MODEL,
+        "whisper_models": model_registry.whisper_models(),
+        "llm_models": model_registry.llm_models(),
+        "generation_profiles": generation_profiles.names(),
+        "default_generation_profile": generation_profiles.default,
+        "summary_interval_minutes": round(LIVE_SUMMARY_INTERVAL_SECONDS / 60, 1),
+    })
+
+# Live transcription stream. The client sends 16kHz mono s16le PCM as binary messages and
+# {"type": "stop"} when the meeting ends; segments, rolling summaries and the saved record
+# come back as JSON messages (see run_live_session).
+@app.websocket("/live/ws")
+async def live_transcription(websocket: WebSocket, whisper_model_name: str = AUTO_MODEL,
+                             llm_model_name: str = AUTO_MODEL, context: str = "",
+                             generation_profile: str = DEFAULT_GENERATION_PROFILE):
+    # HTTP middleware does not see WebSocket connections
+    trace_id_var.set(new_trace_id())
+    try:
+        user = await run_in_threadpool(user_from_token, websocket.cookies.get("access_token"))
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+    error = validate_models(whisper_model_name, llm_model_name)
+    if not error and generation_profile not in GENERATION_PROFILES:
+        error = f"Unknown generation profile '{generation_profile}'"
+    if error:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=error)
+        return
+    if not live_session_slots.acquire(blocking=False):
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many live sessions")
+        return
+    try:
+        await websocket.accept()
+        await run_live_session(websocket, user, whisper_model_name, llm_model_name, context, generation_profile)
+    finally:
+        live_session_slots.release()
+
+# Cached model lists used to populate and validate the summarize form
+@app.get("/models")
+def list_models(user: dict = Depends(get_current_user)):
+    return model_registry.get_status()
+
+# Job status for the current user's summarization jobs
+@app.get("/jobs")
+def list_jobs(user: dict = Depends(get_current_user)):
+    jobs = [job.to_dict() for job in job_queue.list_jobs(owner=user["_id"])]
+    return {"jobs": jobs, "queue": job_queue.get_statistics()}
+
+# Server-Sent Events stream of a job's status and summary as it is generated
+@app.get("/jobs/{job_id}/stream")
+async def job_stream(job_id: str, user: dict = Depends(get_current_user)):
+    job = job_queue.get(job_id)
+    if not job or job.owner != user["_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    def sse(event: str, data) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    async def events():
+        sent = 0
+        last_status = None
+        while True:
+            # Read finished before the summary parts so no trailing text is missed
+            finished = job.finished
+            status_info = (job.status, job.stage)
+            if status_info != last_status:
+                last_status = status_info
+                yield sse("status", {"status": job.status, "stage": job.stage, "progress": job.progress,
+                                     "queue_position": job_queue.queue_position(job)})
+            parts = job.state.get("summary_parts", [])
+            if len(parts) > sent:
+                yield sse("token", {"text": "".join(parts[sent:])})
+                sent = len(parts)
+            if finished:
+                if job.status == JOB_COMPLETED:
+                    yield sse("done", job.state["result"])
+                else:
+                    yield sse("error", {"error": job.error})
+                return
+            await asyncio.sleep(JOB_STREAM_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/cache/stats")
+def cache_stats(user: dict = Depends(get_current_user)):
+    return {
+        "transcripts": get_transcript_cache().get_statistics(),
+        "summaries": get_summary_cache().get_statistics(),
+        "whisper_models": transcription_engine.get_statistics(),
+        "semantic_index": semantic_search.index.get_statistics(),
+        "exports": exporter.cache.get_statistics(),
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Unauthenticated, for Prometheus scrapers; restrict it at the proxy if needed
+    queue_stats = job_queue.get_statistics()
+    for job_status_name in ("queued", "running", "completed", "failed"):
+        JOB_QUEUE_JOBS.set(queue_stats[job_status_name], status=job_status_name)
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+# Usage statistics from the incrementally maintained counters
+@app.get("/api/statistics")
+def statistics_api(user: dict = Depends(get_current_user)):
+    return get_database_manager().get_statistics()
+
+@app.get("/dashboard", response_class=HTMLResponse)
+def dashboard_page(request: Request, user: dict = Depends(get_current_user)):
+    statistics = get_database_manager().get_statistics()
+    return templates.TemplateResponse("dashboard.html", {"request": request, "user": user, "stats": statistics})
+
+# Password hashing pool depth and timings
+@app.get("/auth/stats")
+def auth_stats(user: dict = Depends(get_current_user)):
+    return password_hasher.get_statistics()
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str, user: dict = Depends(get_current_user)):
+    job = job_queue.get(job_id)
+    if not job or job.owner != user["_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job_info = job.to_dict()
+    job_info["queue_position"] = job_queue.queue_position(job)
+    return job_info
+
+# Exports (rendered once per record version, cached on disk, served with ETag/Range support)
+async def export_response(request: Request, record_id: str, field: str, fmt: str, user: dict) -> Response:
+    if field not in EXPORT_FIELDS or fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=404, detail="Unknown export")
     db_manager = get_database_manager()
-    record = db_manager.get_transcription_by_id(record_id)
-    if not record:
-        raise HTTPException(status_code=404, detail="Summary not found")
-    summary_text = record['summary']
-    filename = f"summary_{record_id}.txt"
-    return StreamingResponse(io.BytesIO(summary_text.encode()), media_type='text/plain', headers={"Content-Disposition": f"attachment; filename={filename}"})
+    record = await run_in_threadpool(db_manager.get_transcription_by_id, record_id, VERSION_FIELDS)
+    if not record or record.get("user_id") not in (None, user["_id"]):
+        raise HTTPException(status_code=404, detail=f"{EXPORT_FIELDS[field]} not found")
+    version = record_version(record)
+
+    def load_text() -> str:
+        return (db_manager.get_transcription_by_id(record_id, [field]) or {}).get(field, "")
+
+    key = await exporter.ensure_artifact_async(record_id, field, fmt, version, load_text)
+    return exporter.serve(request, key, fmt, f"{field}_{record_id}.{fmt}", version)
+
+@app.get("/export/{record_id}/{field}.{fmt}")
+async def export_record(request: Request, record_id: str, field: str, fmt: str, user: dict = Depends(get_current_user)):
+    return await export_response(request, record_id, field, fmt, user)
+
+# Download summary as text
+@app.get("/download_summary/{record_id}")
+async def download_summary(request: Request, record_id: str, user: dict = Depends(get_current_user)):
+    return await export_response(request, record_id, "summary", "txt", user)
 
 # Download transcript as text
 @app.get("/download_transcript_txt/{record_id}")
-def download_transcript_txt(record_id: str, user: dict = Depends(get_current_user)):
-    db_manager = get_database_manager()
-    record = db_manager.get_transcription_by_id(record_id)
-    if not record:
-        raise HTTPException(status_code=404, detail="Transcript not found")
-    transcript_text = record['transcript']
-    filename = f"transcript_{record_id}.txt"
-    return StreamingResponse(io.BytesIO(transcript_text.encode()), media_type='text/plain', headers={"Content-Disposition": f"attachment; filename={filename}"})
-
-# Download transcript as PDF (improved formatting)
+async def download_transcript_txt(request: Request, record_id: str, user: dict = Depends(get_current_user)):
+    return await export_response(request, record_id, "transcript", "txt", user)
+
+# Download transcript as PDF
 @app.get("/download_transcript_pdf/{record_id}")
-def download_transcript_pdf(record_id: str, user: dict = Depends(get_current_user)):
-    db_manager = get_database_manager()
-    record = db_manager.get_transcription_by_id(record_id)
-    if not record:
-        raise HTTPException(status_code=404, detail="Transcript not found")
-    transcript_text = record['transcript']
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = [Paragraph("<b>Transcript</b>", styles['Title']), Spacer(1, 12)]
-    for para in transcript_text.split('\n\n'):
-        story.append(Paragraph(para.replace('\n', '<br/>'), styles['Normal']))
-        story.append(Spacer(1, 12))
-    doc.build(story)
-    buffer.seek(0)
-    filename = f"transcript_{record_id}.pdf"
-    return StreamingResponse(buffer, media_type='application/pdf', headers={"Content-Disposition": f"attachment; filename={filename}"})
-
-# Download summary as PDF (improved formatting)
+async def download_transcript_pdf(request: Request, record_id: str, user: dict = Depends(get_current_user)):
+    return await export_response(request, record_id, "transcript", "pdf", user)
+
+# Download summary as PDF
 @app.get("/download_summary_pdf/{record_id}")
-def download_summary_pdf(record_id: str, user: dict = Depends(get_current_user)):
+async def download_summary_pdf(request: Request, record_id: str, user: dict = Depends(get_current_user)):
+    return await export_response(request, record_id, "summary", "pdf", user)
+
+# Bulk export as a streamed ZIP: the given record IDs, or the user's most recent records
+@app.get("/export/bulk")
+def export_bulk(ids: Optional[str] = None, fields: str = "summary,transcript", fmt: str = "txt",
+                user: dict = Depends(get_current_user)):
+    field_list = [f for f in fields.split(",") if f in EXPORT_FIELDS]
+    if fmt not in EXPORT_FORMATS or not field_list:
+        raise HTTPException(status_code=400, detail="Unknown export format or fields")
+    db_manager = get_database_manager()
+    if ids:
+        record_ids = ids.split(",")[:EXPORT_BULK_MAX_RECORDS]
+    else:
+        record_ids, cursor = [], None
+        while len(record_ids) < EXPORT_BULK_MAX_RECORDS:
+            page = db_manager.get_transcriptions_page(user_id=user["_id"], limit=100, before=cursor)
+            record_ids.extend(r["_id"] for r in page["records"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        record_ids = record_ids[:EXPORT_BULK_MAX_RECORDS]
+
+    def entries():
+        for record_id in record_ids:
+            record = db_manager.get_transcription_by_id(record_id, VERSION_FIELDS)
+            if not record or record.get("user_id") not in (None, user["_id"]):
+                continue
+            base = os.path.splitext(record.get("audio_filename") or record_id)[0]
+            for field in field_list:
+                load_text = lambda record_id=record_id, field=field: (
+                    db_manager.get_transcription_by_id(record_id, [field]) or {}
+                ).get(field, "")
+                yield (f"{base}_{record_id}/{field}.{fmt}", record_id, field, fmt, record_version(record), load_text)
+
+    filename = f"meetings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return StreamingResponse(exporter.stream_zip(entries()), media_type="application/zip",
+                             headers={"Content-Disposition": f"attachment; filename={filename}"})
+
+# Wrap query words (and words starting with them, to cover stemmed matches) in <mark>
+def highlight_snippet(text: str, terms: list[str]) -> Markup:
+    escaped = str(escape(text))
+    if not terms:
+        return Markup(escaped)
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(t) for t in terms) + r")\w*", re.IGNORECASE)
+    return Markup(pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", escaped))
+
+# Ranked full-text search over the user's transcriptions
+def run_search(q: str, page: int, user: dict) -> dict:
+    started = time.perf_counter()
+    found = get_database_manager().search_transcriptions(q, user_id=user["_id"], page=page, page_size=SEARCH_PAGE_SIZE)
+    for result in found["results"]:
+        result["summary_snippet_html"] = highlight_snippet(result["summary_snippet"], found["terms"])
+        result["transcript_snippet_html"] = highlight_snippet(result["transcript_snippet"], found["terms"])
+    found["query"] = q
+    found["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Search {q!r} page {page}: {len(found['results'])} results in {found['elapsed_ms']} ms")
+    return found
+
+# Meaning-based search over embedded transcript and summary chunks
+def run_semantic_search(q: str, user: dict) -> dict:
+    started = time.perf_counter()
+    try:
+        results = semantic_search.search(q, k=SEARCH_PAGE_SIZE, user_id=user["_id"])
+        error = None
+    except Exception as e:
+        results, error = [], f"Semantic search is unavailable: {e}"
+    db_manager = get_database_manager()
+    records = {}
+    for result in results:
+        if result["record_id"] not in records:
+            records[result["record_id"]] = db_manager.get_transcription_by_id(
+                result["record_id"], fields=["audio_filename", "timestamp"]
+            ) or {}
+        record = records[result["record_id"]]
+        result["audio_filename"] = record.get("audio_filename")
+        result["timestamp_formatted"] = record.get("timestamp_formatted")
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Semantic search {q!r}: {len(results)} results in {elapsed_ms} ms")
+    return {"query": q, "results": results, "error": error, "elapsed_ms": elapsed_ms}
+
+@app.get("/search", response_class=HTMLResponse)
+def search_page(request: Request, q: str = "", page: int = 1, mode: str = "keyword",
+                user: dict = Depends(get_current_user)):
+    found = None
+    if q.strip():
+        found = run_semantic_search(q, user) if mode == "semantic" else run_search(q, page, user)
+    return templates.TemplateResponse("search.html", {
+        "request": request, "user": user, "q": q, "mode": mode, "search": found,
+    })
+
+@app.get("/api/search")
+def search_api(q: str, page: int = 1, user: dict = Depends(get_current_user)):
+    found = run_search(q, page, user)
+    for result in found["results"]:
+        result["timestamp"] = result["timestamp"].isoformat()
+        result["summary_snippet_html"] = str(result["summary_snippet_html"])
+        result["transcript_snippet_html"] = str(result["transcript_snippet_html"])
+    return found
+
+@app.get("/api/semantic_search")
+def semantic_search_api(q: str, user: dict = Depends(get_current_user)):
+    return run_semantic_search(q, user)
+
+# Transcript segments overlapping a time range (seconds), for previews and seeking
+@app.get("/transcripts/{record_id}/segments")
+def transcript_segments(record_id: str, start: Optional[float] = None, end: Optional[float] = None,
+                        user: dict = Depends(get_current_user)):
     db_manager = get_database_manager()
-    record = db_manager.get_transcription_by_id(record_id)
-    if not record:
-        raise HTTPException(status_code=404, detail="Summary not found")
-    summary_text = record['summary']
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = [Paragraph("<b>Summary</b>", styles['Title']), Spacer(1, 12)]
-    for para in summary_text.split('\n\n'):
-        story.append(Paragraph(para.replace('\n', '<br/>'), styles['Normal']))
-        story.append(Spacer(1, 12))
-    doc.build(story)
-    buffer.seek(0)
-    filename = f"summary_{record_id}.pdf"
-    return StreamingResponse(buffer, media_type='application/pdf', headers={"Content-Disposition": f"attachment; filename={filename}"})
-
-# History page (ensure all records are fetched and passed to template)
+    record = db_manager.get_transcription_by_id(record_id, fields=["user_id", "audio_duration", "segment_count"])
+    if not record or record.get("user_id") not in (None, user["_id"]):
+        raise HTTPException(status_code=404, detail="Record not found")
+    segments = db_manager.get_segments(
+        record_id,
+        from_ms=int(start * 1000) if start is not None else None,
+        to_ms=int(end * 1000) if end is not None else None,
+    )
+    if segments is None:
+        raise HTTPException(status_code=500, detail="Failed to load segments")
+    return {
+        "record_id": record_id,
+        "audio_duration": record.get("audio_duration"),
+        "segment_count": record.get("segment_count"),
+        "segments": segments,
+    }
+
+# History page (one page of previews per request)
 @app.get("/history", response_class=HTMLResponse)
-def history_page(request: Request, user: dict = Depends(get_current_user)):
+def history_page(request: Request, before: Optional[str] = None, user: dict = Depends(get_current_user)):
     db_manager = get_database_manager()
-    history = db_manager.get_all_transcriptions()
-    print('DEBUG: History records fetched:', history)
-    return templates.TemplateResponse("history.html", {"request": request, "user": user, "history": history})
+    page = db_manager.get_transcriptions_page(user_id=user["_id"], limit=HISTORY_PAGE_SIZE, before=before)
+    return templates.TemplateResponse("history.html", {
+        "request": request,
+        "user": user,
+        "history": page["records"],
+        "next_cursor": page["next_cursor"],
+        "is_first_page": before is None,
+    })
 
 
 def get_available_models() -> list[str]:
     """
     Retrieves a list of all available models from the Ollama server and extracts the model names.
+    Served from the model registry, so it returns the last known list if Ollama is unreachable.
 
     Returns:
         A list of model names available on the Ollama server.
     """
-    response = requests.get(f"{OLLAMA_SERVER_URL}/api/tags")
-    if response.status_code == 200:
-        models = response.json()["models"]
-        llm_model_names = [model["model"] for model in models]  # Extract model names
-        return llm_model_names
-    else:
-        raise Exception(
-            f"Failed to retrieve models from Ollama server: {response.text}"
-        )
+    return model_registry.llm_models()
+
+
+def fetch_ollama_models() -> dict[str, str]:
+    """
+    Fetches the models currently on the Ollama server. Used by the model registry;
+    other code should read the cached lists from the registry instead.
+
+    Returns:
+        A mapping of model name to model digest.
+    """
+    try:
+        models = ollama_client.get_json("/api/tags", timeout=OLLAMA_CONNECT_TIMEOUT)["models"]
+    except OllamaError as e:
+        raise Exception(f"Failed to retrieve models from Ollama server: {e}")
+    return {model["model"]: model.get("digest", "") for model in models}
 
 
 def get_available_whisper_models() -> list[str]:
     """
     Retrieves a list of available Whisper models based on downloaded .bin files in the whisper.cpp/models directory.
     Filters out test models and only includes official Whisper models (e.g., base, small, medium, large).
+    Served from the model registry, which rescans the directory only when it changes.
 
     Returns:
         A list of available Whisper model names (e.g., 'base', 'small', 'medium', 'large-V3').
     """
-    # List of acceptable official Whisper models
-    valid_models = ["base", "small", "medium", "large", "large-V3"]
+    return model_registry.whisper_models()
 
-    # Get the list of model files in the models directory
-    model_files = [f for f in os.listdir(WHISPER_MODEL_DIR) if f.endswith(".bin")]
 
-    # Filter out test models and models that aren't in the valid list
-    whisper_models = [
-        os.path.splitext(f)[0].replace("ggml-", "")
-        for f in model_files
-        if any(valid_model in f for valid_model in valid_models) and "for-tests" not in f
-    ]
+def get_model_digest(llm_model_name: str) -> str:
+    """
+    Looks up the digest of a model on the Ollama server, so cached summaries are
+    invalidated when a model is re-pulled or replaced under the same name.
 
-    # Remove any potential duplicates
-    whisper_models = list(set(whisper_models))
+    Args:
+        llm_model_name (str): The name of the model.
 
-    return whisper_models
+    Returns:
+        str: The model digest, or an empty string if it is not known.
+    """
+    return model_registry.get_digest(llm_model_name)
 
 
-def summarize_with_model(llm_model_name: str, context: str, text: str) -> str:
+def summarize_with_model(llm_model_name: str, context: str, text: str,
+                         generation_profile: Optional[str] = None) -> str:
     """
     Uses a specified model on the Ollama server to generate a summary.
-    Handles streaming responses by processing each line of the response.
+    Identical requests are served from the summary cache, and concurrent identical
+    requests share a single generation.
 
     Args:
         llm_model_name (str): The name of the model to use for summarization.
         context (str): Optional context for the summary, provided by the user.
         text (str): The transcript text to summarize.
+        generation_profile (str, optional): Name of a GENERATION_PROFILES entry (default profile if None).
 
     Returns:
         str: The generated summary text from the model.
     """
+    return "".join(stream_summary_with_model(llm_model_name, context, text, generation_profile))
+
+
+def stream_summary_with_model(llm_model_name: str, context: str, text: str,
+                              generation_profile: Optional[str] = None) -> Iterator[str]:
+    """
+    Generator version of summarize_with_model that yields the summary as the model produces it.
+    A cached summary is yielded in one piece.
+
+    Args:
+        llm_model_name (str): The name of the model to use for summarization.
+        context (str): Optional context for the summary, provided by the user.
+        text (str): The transcript text to summarize.
+        generation_profile (str, optional): Name of a GENERATION_PROFILES entry (default profile if None).
+
+    Yields:
+        str: Pieces of the summary text, in order.
+    """
+    profile = generation_profiles.get(generation_profile, llm_model_name)
+    summary_cache = get_summary_cache()
+    chunking = f"chunk={SUMMARY_CHUNK_TOKENS}/{SUMMARY_CHUNK_OVERLAP_TOKENS}/{SUMMARY_REDUCE_FAN_IN}"
+    key = summary_cache.make_key(llm_model_name, get_model_digest(llm_model_name), context, text,
+                                 f"{chunking};{profile.cache_key()}")
+    yield from summary_cache.stream_or_compute(key, lambda: _stream_summary(llm_model_name, context, text, profile))
+
+
+def summary_chunk_tokens(context: str, profile: Optional[GenerationProfile] = None) -> int:
+    """
+    Transcript tokens sent in one prompt: SUMMARY_CHUNK_TOKENS, or fewer when the profile's
+    context window (max_ctx less the generated tokens) cannot hold that much.
+
+    Args:
+        context (str): Optional context for the summary, provided by the user.
+        profile (GenerationProfile, optional): Ollama settings for every prompt.
+
+    Returns:
+        int: Largest transcript summarized in a single prompt, and the chunk size beyond it.
+    """
+    if profile is None:
+        return SUMMARY_CHUNK_TOKENS
+    budget = profile.prompt_budget() - count_tokens(context or "") - SUMMARY_PROMPT_OVERHEAD_TOKENS
+    # Chunks always hold more than their overlap so the map step makes progress
+    return max(2 * SUMMARY_CHUNK_OVERLAP_TOKENS, min(SUMMARY_CHUNK_TOKENS, budget))
+
+
+def _stream_summary(llm_model_name: str, context: str, text: str,
+                    profile: Optional[GenerationProfile] = None) -> Iterator[str]:
+    """
+    Summarizes a transcript in a single prompt, or hierarchically when it is too long
+    to fit comfortably in the model's context window.
+
+    Args:
+        llm_model_name (str): The name of the model to use for summarization.
+        context (str): Optional context for the summary, provided by the user.
+        text (str): The transcript text to summarize.
+        profile (GenerationProfile, optional): Ollama settings for every prompt.
+
+    Yields:
+        str: Pieces of the summary text, in order.
+    """
+    chunk_tokens = summary_chunk_tokens(context, profile)
+    if count_tokens(text) > chunk_tokens:
+        summarizer = ChunkedSummarizer(
+            lambda prompt: generate_with_model(llm_model_name, prompt, profile),
+            chunk_tokens=chunk_tokens,
+            overlap_tokens=SUMMARY_CHUNK_OVERLAP_TOKENS,
+            max_concurrency=SUMMARY_MAP_CONCURRENCY,
+            reduce_fan_in=SUMMARY_REDUCE_FAN_IN,
+            stream_generate=lambda prompt: stream_with_model(llm_model_name, prompt, profile),
+        )
+        yield from summarizer.stream(context, text)
+        return
+
     prompt = f"""You are given a transcript from a meeting, along with some optional context.
     
     Context: {context if context else 'No additional context provided.'}
@@ -296,35 +905,85 @@ def summarize_with_model(llm_model_name: str, context: str, text: str) -> str:
     
     Please summarize the transcript."""
 
-    headers = {"Content-Type": "application/json"}
-    data = {"model": llm_model_name, "prompt": prompt}
+    yield from stream_with_model(llm_model_name, prompt, profile)
 
-    response = requests.post(
-        f"{OLLAMA_SERVER_URL}/api/generate", json=data, headers=headers, stream=True
-    )
 
-    if response.status_code == 200:
-        full_response = ""
-        try:
-            # Process the streaming response line by line
-            for line in response.iter_lines():
-                if line:
-                    # Decode each line and parse it as a JSON object
-                    decoded_line = line.decode("utf-8")
-                    json_line = json.loads(decoded_line)
-                    # Extract the "response" part from each JSON object
-                    full_response += json_line.get("response", "")
-                    # If "done" is True, break the loop
-                    if json_line.get("done", False):
-                        break
-            return full_response
-        except json.JSONDecodeError:
-            print("Error: Response contains invalid JSON data.")
-            return f"Failed to parse the response from the server. Raw response: {response.text}"
-    else:
-        raise Exception(
-            f"Failed to summarize with model {llm_model_name}: {response.text}"
-        )
+def update_rolling_summary(llm_model_name: str, context: str, summary: str, new_text: str,
+                           generation_profile: Optional[str] = None) -> str:
+    """
+    Folds the next part of a live meeting's transcript into its summary so far, so each
+    update only sends the new segments to the model.
+
+    Args:
+        llm_model_name (str): The name of the model to use for summarization.
+        context (str): Optional context for the summary, provided by the user.
+        summary (str): The summary so far (empty for the first part).
+        new_text (str): Transcript lines not yet covered by the summary.
+        generation_profile (str, optional): Name of a GENERATION_PROFILES entry (default profile if None).
+
+    Returns:
+        str: The updated summary.
+    """
+    prompt = f"""You are given the summary of a meeting so far and the next part of its transcript, along with some optional context.
+    
+    Context: {context if context else 'No additional context provided.'}
+    
+    The summary so far is as follows:
+    
+    {summary if summary else 'The meeting has just started.'}
+    
+    The next part of the transcript is as follows:
+    
+    {new_text}
+    
+    Please update the summary so it also covers the next part of the transcript. Reply with the complete updated summary only."""
+
+    return generate_with_model(llm_model_name, prompt, generation_profiles.get(generation_profile, llm_model_name))
+
+
+def generate_with_model(llm_model_name: str, prompt: str, profile: Optional[GenerationProfile] = None) -> str:
+    """
+    Sends a prompt to a model on the Ollama server and returns the complete response.
+
+    Args:
+        llm_model_name (str): The name of the model to use.
+        prompt (str): The full prompt text.
+        profile (GenerationProfile, optional): keep_alive and options to send.
+
+    Returns:
+        str: The generated text from the model.
+    """
+    return "".join(stream_with_model(llm_model_name, prompt, profile))
+
+
+def stream_with_model(llm_model_name: str, prompt: str, profile: Optional[GenerationProfile] = None) -> Iterator[str]:
+    """
+    Sends a prompt to a model on the Ollama servers through the shared pooled client.
+    Handles streaming responses by yielding the text of each line of the response.
+
+    With a profile, keep_alive keeps the model (and Ollama's cache of the prompt
+    prefix) loaded between requests, and num_ctx is sized so the prompt is not
+    truncated.
+
+    Args:
+        llm_model_name (str): The name of the model to use.
+        prompt (str): The full prompt text.
+        profile (GenerationProfile, optional): keep_alive and options to send.
+
+    Yields:
+        str: Pieces of generated text as they arrive.
+    """
+    fields = profile.request_fields(count_tokens(prompt)) if profile else {}
+    try:
+        for json_line in ollama_client.generate_stream(llm_model_name, prompt, **fields):
+            # Extract the "response" part from each JSON object
+            piece = json_line.get("response", "")
+            if piece:
+                yield piece
+            if json_line.get("done"):
+                record_ollama_response(llm_model_name, json_line)
+    except OllamaError as e:
+        raise Exception(f"Failed to summarize with model {llm_model_name}: {e}")
 
 
 def preprocess_audio_file(audio_file_path: str) -> str:
@@ -337,15 +996,253 @@ def preprocess_audio_file(audio_file_path: str) -> str:
     Returns:
         str: The path to the preprocessed WAV file.
     """
-    output_wav_file = f"{os.path.splitext(audio_file_path)[0]}_converted.wav"
+    # Uploads with identical content share one file, so each conversion gets its own output
+    output_wav_file = f"{os.path.splitext(audio_file_path)[0]}_{uuid.uuid4().hex[:8]}_converted.wav"
 
     # Ensure ffmpeg converts to 16kHz sample rate and mono channel
     cmd = f'ffmpeg -y -i "{audio_file_path}" -ar 16000 -ac 1 "{output_wav_file}"'
-    subprocess.run(cmd, shell=True, check=True)
+    with timed("ffmpeg"):
+        subprocess.run(cmd, shell=True, check=True)
 
     return output_wav_file
 
 
+def create_transcription_engine() -> TranscriptionEngine:
+    """
+    Builds the transcription engine for WHISPER_BACKEND. Resident backends fall back to
+    running whisper-cli per request if they fail.
+
+    Returns:
+        TranscriptionEngine: The configured engine.
+    """
+    cli_backend = WhisperCliBackend(WHISPER_CLI_PATH, WHISPER_MODEL_DIR, WHISPER_OPTIONS)
+    if WHISPER_BACKEND == "server":
+        backend = WhisperServerBackend(WHISPER_SERVER_PATH, WHISPER_MODEL_DIR, WHISPER_OPTIONS)
+    elif WHISPER_BACKEND == "openai":
+        backend = OpenAIWhisperBackend(device="cpu")
+    else:
+        return TranscriptionEngine(cli_backend, memory_budget_bytes=WHISPER_MEMORY_BUDGET)
+    return TranscriptionEngine(backend, fallback=cli_backend, memory_budget_bytes=WHISPER_MEMORY_BUDGET)
+
+
+def whisper_cache_options(language: Optional[str] = None, translate: bool = False) -> list[str]:
+    """Whisper settings that affect the transcript text and so belong in the transcript cache key."""
+    options = [f"backend={WHISPER_BACKEND}", *WHISPER_OPTIONS]
+    if VAD_ENABLED:
+        options.append("vad=" + ",".join(f"{name}={value}" for name, value in sorted(VAD_OPTIONS.items())))
+    if language:
+        options.append(f"language={language}")
+    if translate:
+        options.append("translate")
+    return options
+
+
+def language_detection_sample(audio_file_path: str) -> bytes:
+    """
+    Decodes the first LANGUAGE_DETECTION_SECONDS of speech in an audio file. With VAD_ENABLED
+    leading silence and long pauses are skipped, so the sample is mostly speech. ffmpeg is
+    stopped as soon as the sample is complete.
+
+    Args:
+        audio_file_path (str): Path to the input audio file.
+
+    Returns:
+        bytes: 16kHz mono s16le PCM.
+    """
+    needed = int(LANGUAGE_DETECTION_SECONDS * BYTES_PER_SECOND)
+    decoded = stream_pcm(audio_file_path, PCM_CHUNK_BYTES)
+    chunks = decoded
+    if VAD_ENABLED:
+        chunks = (pcm for _, pcm in VoiceActivityDetector(**VAD_OPTIONS).split(decoded))
+    sample = bytearray()
+    try:
+        for pcm in chunks:
+            sample += pcm
+            if len(sample) >= needed:
+                break
+    finally:
+        decoded.close()
+    return bytes(sample[:needed])
+
+
+def detect_language(audio_file_path: str, audio_hash: Optional[str] = None) -> Tuple[Optional[str], float]:
+    """
+    Detects the spoken language of an audio file, reusing the cached result for the same audio.
+
+    Args:
+        audio_file_path (str): Path to the input audio file.
+        audio_hash (str, optional): SHA-256 of the file, if already known.
+
+    Returns:
+        Tuple[Optional[str], float]: The language code and its probability, or (None, 0.0) if detection failed.
+    """
+    audio_hash = audio_hash or hash_file(audio_file_path)
+    cached = language_cache.get(audio_hash, LANGUAGE_DETECTION_MODEL)
+    if cached is not None:
+        return cached
+    try:
+        with timed("language_detection"):
+            sample = language_detection_sample(audio_file_path)
+            if not sample:
+                return None, 0.0
+            language, probability = transcription_engine.detect_language(sample, LANGUAGE_DETECTION_MODEL)
+    except Exception as e:
+        logger.warning(f"Language detection failed for {audio_file_path}: {e}")
+        return None, 0.0
+    language_cache.set(audio_hash, LANGUAGE_DETECTION_MODEL, language, probability)
+    return language, probability
+
+
+def route_recording(audio_file_path: str, whisper_model_name: str, llm_model_name: str,
+                    audio_hash: Optional[str] = None) -> LanguageRoute:
+    """
+    Chooses the whisper model, LLM and whisper language settings for a recording from its
+    detected language. Models other than "auto" are kept as requested.
+
+    Args:
+        audio_file_path (str): Path to the input audio file.
+        whisper_model_name (str): Requested whisper model, or "auto".
+        llm_model_name (str): Requested LLM, or "auto".
+        audio_hash (str, optional): SHA-256 of the file, if already known.
+
+    Returns:
+        LanguageRoute: The models and settings to use.
+    """
+    language, probability = None, 0.0
+    if LANGUAGE_DETECTION_ENABLED:
+        language, probability = detect_language(audio_file_path, audio_hash)
+    route = language_router.route(language, probability, whisper_model_name, llm_model_name)
+    logger.info(f"Routing {os.path.basename(audio_file_path)}: {route.to_dict()}")
+    return route
+
+
+def transcribe_audio_timed(audio_file_wav: str, whisper_model_name: str, language: Optional[str] = None,
+                           translate: bool = False) -> TranscriptionResult:
+    """
+    Transcribes a preprocessed WAV file with the shared transcription engine.
+
+    Args:
+        audio_file_wav (str): Path to the 16kHz mono WAV file.
+        whisper_model_name (str): Whisper model to use for audio-to-text conversion.
+        language (str, optional): Spoken language code passed to whisper.
+        translate (bool): Translate the speech to English.
+
+    Returns:
+        TranscriptionResult: The transcript with model-load and inference timings.
+    """
+    result = transcription_engine.transcribe(audio_file_wav, whisper_model_name, language, translate)
+    record_transcription(result)
+    return result
+
+
+def transcribe_with_cache(audio_file_path: str, whisper_model_name: str, language: Optional[str] = None,
+                          translate: bool = False, audio_hash: Optional[str] = None) -> str:
+    """
+    Returns the transcript for an audio file, reusing a cached transcript when the same
+    audio was already transcribed with the same whisper model and options.
+
+    Args:
+        audio_file_path (str): Path to the input audio file.
+        whisper_model_name (str): Whisper model to use for audio-to-text conversion.
+        language (str, optional): Spoken language code passed to whisper.
+        translate (bool): Translate the speech to English.
+        audio_hash (str, optional): SHA-256 of the file, if already known.
+
+    Returns:
+        str: The transcript text.
+    """
+    transcript_cache = get_transcript_cache()
+    audio_hash = audio_hash or hash_file(audio_file_path)
+    cache_options = whisper_cache_options(language, translate)
+    transcript = transcript_cache.get(audio_hash, whisper_model_name, cache_options)
+    if transcript is not None:
+        logger.info(f"Transcript cache hit: {audio_file_path}")
+        return transcript
+
+    transcript = transcribe_audio_file(audio_file_path, whisper_model_name, language, translate).text
+    transcript_cache.set(audio_hash, whisper_model_name, cache_options, transcript)
+    return transcript
+
+
+def use_streaming_decode() -> bool:
+    """Whether ffmpeg's output is consumed as PCM (VAD chunking or a PCM-capable backend) rather than a WAV file."""
+    return VAD_ENABLED or (WHISPER_STREAM_DECODE and transcription_engine.supports_pcm)
+
+
+def transcribe_speech_chunks(audio_file_path: str, whisper_model_name: str, language: Optional[str] = None,
+                             translate: bool = False) -> TranscriptionResult:
+    """
+    Transcribes only the speech in an audio file: silence is dropped by voice activity
+    detection and the remaining chunks are transcribed in parallel with their
+    original timestamps.
+
+    Args:
+        audio_file_path (str): Path to the input audio file.
+        whisper_model_name (str): Whisper model to use for audio-to-text conversion.
+        language (str, optional): Spoken language code passed to whisper.
+        translate (bool): Translate the speech to English.
+
+    Returns:
+        TranscriptionResult: The transcript, with audio_seconds and speech_seconds set.
+    """
+    detector = VoiceActivityDetector(**VAD_OPTIONS)
+    chunks = detector.split(stream_pcm(audio_file_path, PCM_CHUNK_BYTES))
+    result = transcription_engine.transcribe_chunks(chunks, whisper_model_name, WHISPER_CHUNK_WORKERS,
+                                                    language, translate)
+    result.audio_seconds = detector.audio_seconds
+    result.speech_seconds = detector.speech_seconds
+    record_transcription(result)
+    logger.info(f"Voice activity detection kept {detector.speech_seconds:.1f}s of {detector.audio_seconds:.1f}s "
+                f"in {detector.chunk_count} chunks")
+    return result
+
+
+def transcribe_audio_file(audio_file_path: str, whisper_model_name: str, language: Optional[str] = None,
+                          translate: bool = False) -> TranscriptionResult:
+    """
+    Transcribes an audio file in any format ffmpeg reads.
+
+    With VAD_ENABLED, only detected speech is transcribed, in parallel chunks. Otherwise,
+    when the backend accepts raw PCM, ffmpeg's output is streamed into it in fixed-size
+    windows without writing a WAV file. If neither applies (or they fail) the file is
+    converted to a temporary WAV first.
+
+    Args:
+        audio_file_path (str): Path to the input audio file.
+        whisper_model_name (str): Whisper model to use for audio-to-text conversion.
+        language (str, optional): Spoken language code passed to whisper.
+        translate (bool): Translate the speech to English.
+
+    Returns:
+        TranscriptionResult: The transcript with model-load and inference timings.
+    """
+    if VAD_ENABLED:
+        try:
+            return transcribe_speech_chunks(audio_file_path, whisper_model_name, language, translate)
+        except Exception as e:
+            logger.warning(f"Chunked transcription failed, retrying the whole file: {e}")
+
+    if WHISPER_STREAM_DECODE and transcription_engine.supports_pcm:
+        try:
+            windows = pcm_windows(stream_pcm(audio_file_path, PCM_CHUNK_BYTES), WHISPER_STREAM_WINDOW_SECONDS)
+            result = transcription_engine.transcribe_pcm(windows, whisper_model_name, language, translate)
+            record_transcription(result)
+            return result
+        except Exception as e:
+            logger.warning(f"Streaming transcription failed, retrying from a WAV file: {e}")
+
+    # Convert the input file to WAV format if necessary
+    audio_file_wav = preprocess_audio_file(audio_file_path)
+
+    logger.info(f"Audio preprocessed: {audio_file_wav}")
+
+    try:
+        return transcribe_audio_timed(audio_file_wav, whisper_model_name, language, translate)
+    finally:
+        # Clean up temporary files
+        os.remove(audio_file_wav)
+
+
 def translate_and_summarize(
     audio_file_path: str, context: str, whisper_model_name: str, llm_model_name: str
 ) -> tuple[str, str]:
@@ -362,37 +1259,18 @@ def translate_and_summarize(
     Returns:
         tuple[str, str]: A tuple containing the summary and the path to the transcript file for download.
     """
-    output_file = "output.txt"
+    logger.info(f"Processing audio file: {audio_file_path}")
 
-    print("Processing audio file:", audio_file_path)
-
-    # Convert the input file to WAV format if necessary
-    audio_file_wav = preprocess_audio_file(audio_file_path)
-
-    print("Audio preprocessed:", audio_file_wav)
-
-    # Call the whisper.cpp binary
-    import os
-    current_dir = os.getcwd()
-    whisper_exe = os.path.join(current_dir, "whisper.cpp", "build", "bin", "Release", "whisper-cli.exe")
-    whisper_model = os.path.join(current_dir, "whisper.cpp", "models", f"ggml-{whisper_model_name}.bin")
-    
-    whisper_command = f'"{whisper_exe}" -m "{whisper_model}" -f "{audio_file_wav}" > {output_file}'
-    subprocess.run(whisper_command, shell=True, check=True)
-
-    print("Whisper.cpp executed successfully")
-
-    # Read the output from the transcript
-    with open(output_file, "r") as f:
-        transcript = f.read()
+    route = route_recording(audio_file_path, whisper_model_name, llm_model_name)
+    transcript = transcribe_with_cache(audio_file_path, route.whisper_model, route.language, route.translate)
 
     # Save the transcript to a downloadable file
     transcript_file = "transcript.txt"
-    with open(transcript_file, "w") as transcript_f:
+    with open(transcript_file, "w", encoding="utf-8") as transcript_f:
         transcript_f.write(transcript)
 
     # Generate summary from the transcript using Ollama's model
-    summary = summarize_with_model(llm_model_name, context, transcript)
+    summary = summarize_with_model(route.llm_model, context, transcript)
     
     # Save to database
     db_manager = get_database_manager()
@@ -401,27 +1279,353 @@ def translate_and_summarize(
         audio_filename=audio_filename,
         transcript=transcript,
         summary=summary,
-        whisper_model=whisper_model_name,
-        llm_model=llm_model_name,
-        context=context
+        whisper_model=route.whisper_model,
+        llm_model=route.llm_model,
+        context=context,
+        language=route.language
     )
     
-    print(f"Saved transcription to database with ID: {record_id}")
-
-    # Clean up temporary files
-    os.remove(audio_file_wav)
-    os.remove(output_file)
+    logger.info(f"Saved transcription to database with ID: {record_id}")
 
     # Return the downloadable link for the transcript and the summary text
     return summary, transcript_file
 
 
+def live_transcriber(whisper_model_name: str, llm_model_name: str, state: dict):
+    """
+    Transcription callback for a LiveSession. The first call detects the language of the
+    window it is given and stores the resulting route in state["route"]; later windows
+    are transcribed with that route.
+    """
+    def transcribe(offset: float, pcm: bytes) -> str:
+        if "route" not in state:
+            language, probability = None, 0.0
+            if LANGUAGE_DETECTION_ENABLED:
+                try:
+                    language, probability = transcription_engine.detect_language(pcm, LANGUAGE_DETECTION_MODEL)
+                except Exception as e:
+                    logger.warning(f"Language detection failed for live session: {e}")
+            state["route"] = language_router.route(language, probability, whisper_model_name, llm_model_name)
+            logger.info(f"Routing live session: {state['route'].to_dict()}")
+        route = state["route"]
+        result = transcription_engine.transcribe_chunks(iter([(offset, pcm)]), route.whisper_model, 1,
+                                                        route.language, route.translate)
+        record_transcription(result)
+        return result.text
+
+    return transcribe
+
+
+async def run_live_session(websocket: WebSocket, user: dict, whisper_model_name: str, llm_model_name: str,
+                           context: str, generation_profile: str):
+    """
+    Runs a live meeting over an accepted WebSocket until the client sends {"type": "stop"}
+    or disconnects, then saves the transcript and summary.
+
+    Audio is received while earlier audio is being transcribed, and rolling summary
+    updates run alongside transcription. Messages sent to the client:
+        {"type": "segments", "committed": [...], "partial": [...]} after every step
+        {"type": "summary", "summary": ..., "until": seconds} after every rolling summary update
+        {"type": "saved", "record_id": ..., "summary": ..., "route": {...}} at the end
+        {"type": "error", "detail": ...} when something fails
+    """
+    state = {}
+    session = LiveSession(live_transcriber(whisper_model_name, llm_model_name, state), LIVE_STEP_SECONDS,
+                          LIVE_HOLDBACK_SECONDS, LIVE_MAX_WINDOW_SECONDS)
+    started_at = datetime.now()
+    audio_received = asyncio.Event()
+    stopping = False
+    connected = True
+    summary = {"text": "", "until": 0.0}
+    summary_task: Optional[asyncio.Task] = None
+
+    async def send(message: dict):
+        nonlocal connected
+        if not connected:
+            return
+        try:
+            await websocket.send_json(message)
+        except Exception:
+            connected = False
+
+    def current_route() -> LanguageRoute:
+        return state.get("route") or language_router.route(None, 0.0, whisper_model_name, llm_model_name)
+
+    async def summarize_new_segments() -> bool:
+        """Fold the unsummarized segments into the summary; on failure they are retried by the next update."""
+        new_text, count, until = session.unsummarized()
+        if not new_text:
+            return True
+        try:
+            summary["text"] = await run_in_threadpool(update_rolling_summary, current_route().llm_model, context,
+                                                      summary["text"], new_text, generation_profile)
+        except Exception as e:
+            logger.error(f"Rolling summary update failed: {e}")
+            await send({"type": "error", "detail": f"Summary update failed: {e}"})
+            return False
+        session.mark_summarized(count)
+        summary["until"] = until
+        await send({"type": "summary", "summary": summary["text"], "until": until})
+        return True
+
+    async def transcribe_steps():
+        nonlocal summary_task, stopping, connected
+        next_summary_at = LIVE_SUMMARY_INTERVAL_SECONDS
+        while not stopping:
+            await audio_received.wait()
+            audio_received.clear()
+            if stopping or not session.ready():
+                continue
+            # The first step waits for enough audio to detect the language reliably
+            if "route" not in state and session.audio_seconds < LIVE_DETECTION_SECONDS:
+                continue
+            try:
+                committed, partial = await run_in_threadpool(session.step)
+            except Exception as e:
+                logger.error(f"Live transcription failed: {e}")
+                await send({"type": "error", "detail": f"Transcription failed: {e}"})
+                stopping = True
+                if connected:
+                    connected = False
+                    await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+                return
+            await send({"type": "segments", "committed": committed, "partial": partial})
+            # Updates are skipped rather than queued while the previous one is still running
+            if session.audio_seconds >= next_summary_at and (summary_task is None or summary_task.done()):
+                next_summary_at = session.audio_seconds + LIVE_SUMMARY_INTERVAL_SECONDS
+                summary_task = asyncio.create_task(summarize_new_segments())
+
+    steps_task = asyncio.create_task(transcribe_steps())
+    try:
+        while not stopping:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                connected = False
+                break
+            if message.get("bytes"):
+                session.add_audio(message["bytes"])
+                audio_received.set()
+            elif message.get("text"):
+                try:
+                    command = json.loads(message["text"])
+                except ValueError:
+                    continue
+                if isinstance(command, dict) and command.get("type") == "stop":
+                    break
+    except Exception as e:
+        # The connection dropped; the meeting is still saved below
+        logger.warning(f"Live session connection lost: {e}")
+        connected = False
+    finally:
+        # Let a step in progress finish; session.step must not run twice at once
+        stopping = True
+        audio_received.set()
+        await steps_task
+
+    # Transcribe everything left, a window at a time, and fold only the tail into the summary
+    try:
+        committed = await run_in_threadpool(session.finish)
+        await send({"type": "segments", "committed": committed, "partial": []})
+    except Exception as e:
+        logger.error(f"Final live transcription step failed: {e}")
+    if summary_task is not None:
+        await summary_task
+    summary_complete = await summarize_new_segments()
+
+    transcript = session.transcript()
+    if not transcript:
+        await send({"type": "error", "detail": "No speech was transcribed"})
+    else:
+        if not summary_complete:
+            covered = f"the first {format_timestamp(summary['until'])}" if summary["until"] else "none"
+            logger.warning(f"Saving live meeting whose summary covers {covered} of "
+                           f"{format_timestamp(session.audio_seconds)}")
+            await send({"type": "error", "detail": f"The saved summary only covers {covered} of the meeting; "
+                                                   f"the full transcript is saved"})
+        route = current_route()
+        record_id = await run_in_threadpool(
+            get_database_manager().save_transcription,
+            audio_filename=f"Live meeting {started_at:%Y-%m-%d %H:%M}",
+            transcript=transcript,
+            summary=summary["text"],
+            whisper_model=route.whisper_model,
+            llm_model=route.llm_model,
+            context=context,
+            user_id=user["_id"],
+            processing_seconds=(datetime.now() - started_at).total_seconds(),
+            language=route.language,
+        )
+        if record_id is None:
+            await send({"type": "error", "detail": "Failed to save transcription to database"})
+        else:
+            await send({"type": "saved", "record_id": record_id, "summary": summary["text"],
+                        "route": route.to_dict()})
+    if connected:
+        await websocket.close()
+
+
+# Background job stages for the web upload pipeline. Each stage reads the job's
+# params and the outputs of earlier stages from job.state.
+def _job_detect(job: Job):
+    # Web uploads are hashed while being saved
+    job.state["audio_hash"] = job.params.get("audio_hash") or hash_file(job.params["audio_path"])
+    job.state["route"] = route_recording(
+        job.params["audio_path"], job.params["whisper_model_name"], job.params["llm_model_name"],
+        job.state["audio_hash"]
+    )
+
+
+def _job_preprocess(job: Job):
+    # A transcript cache hit skips both ffmpeg and whisper
+    route = job.state["route"]
+    transcript = get_transcript_cache().get(
+        job.state["audio_hash"], route.whisper_model, whisper_cache_options(route.language, route.translate)
+    )
+    if transcript is not None:
+        job.state["transcript"] = transcript
+        return
+    # With streaming decode, ffmpeg runs inside the transcribe stage instead
+    if not use_streaming_decode():
+        job.state["audio_wav"] = preprocess_audio_file(job.params["audio_path"])
+
+
+def _job_transcribe(job: Job):
+    if "transcript" in job.state:
+        return
+    route = job.state["route"]
+    if "audio_wav" in job.state:
+        try:
+            result = transcribe_audio_timed(job.state["audio_wav"], route.whisper_model, route.language,
+                                            route.translate)
+        finally:
+            os.remove(job.state["audio_wav"])
+    else:
+        result = transcribe_audio_file(job.params["audio_path"], route.whisper_model, route.language, route.translate)
+    job.state["transcript"] = result.text
+    job.stage_timings["transcribe_model_load"] = round(result.load_seconds, 3)
+    job.stage_timings["transcribe_inference"] = round(result.inference_seconds, 3)
+    get_transcript_cache().set(
+        job.state["audio_hash"], route.whisper_model, whisper_cache_options(route.language, route.translate),
+        job.state["transcript"]
+    )
+
+
+def _job_summarize(job: Job):
+    # Pieces are appended as they arrive so /jobs/{job_id}/stream can forward them
+    parts = job.state["summary_parts"] = []
+    for piece in stream_summary_with_model(
+        job.state["route"].llm_model, job.params["context"], job.state["transcript"],
+        job.params.get("generation_profile"),
+    ):
+        parts.append(piece)
+    job.state["summary"] = "".join(parts)
+
+
+def _job_save(job: Job):
+    db_manager = get_database_manager()
+    record_id = db_manager.save_transcription(
+        audio_filename=job.params["audio_filename"],
+        transcript=job.state["transcript"],
+        summary=job.state["summary"],
+        whisper_model=job.state["route"].whisper_model,
+        llm_model=job.state["route"].llm_model,
+        context=job.params["context"],
+        user_id=job.owner,
+        processing_seconds=(datetime.now() - job.started_at).total_seconds(),
+        audio_hash=job.state.get("audio_hash"),
+        language=job.state["route"].language
+    )
+    if record_id is None:
+        raise Exception("Failed to save transcription to database")
+    job.state["result"] = {"record_id": record_id, "summary": job.state["summary"],
+                           "route": job.state["route"].to_dict()}
+
+
+def create_semantic_search() -> SemanticSearch:
+    """
+    Builds the semantic search pipeline for SEMANTIC_EMBEDDER.
+
+    Returns:
+        SemanticSearch: Embedder and vector index kept in step with the database.
+    """
+    if SEMANTIC_EMBEDDER == "transformers":
+        embedder = TransformersEmbedder(EMBEDDING_MODEL)
+    else:
+        embedder = OllamaEmbedder(ollama_client, EMBEDDING_MODEL)
+    return SemanticSearch(embedder, SemanticIndex(SEMANTIC_INDEX_DIR), chunk_words=SEMANTIC_CHUNK_WORDS)
+
+
+def prewarm_models(model_names: list[str]):
+    """
+    Loads models into Ollama ahead of the first summary. A generate request without
+    a prompt only loads the model, which then stays resident for keep_alive.
+    """
+    for model_name in model_names:
+        profile = generation_profiles.get(None, model_name)
+        start = time.perf_counter()
+        try:
+            ollama_client.post_json("/api/generate", {"model": model_name, "stream": False, **profile.request_fields(0)})
+            logger.info(f"Prewarmed {model_name} in {time.perf_counter() - start:.1f}s")
+        except OllamaError as e:
+            logger.warning(f"Could not prewarm {model_name}: {e}")
+
+
+def register_database_listeners():
+    """Hooks that must see every saved, updated and deleted record."""
+    get_database_manager().add_listener(semantic_search.on_database_event)
+    get_database_manager().add_listener(exporter.on_database_event)
+
+
+# Shared whisper engine keeping models loaded between jobs
+transcription_engine = create_transcription_engine()
+semantic_search = create_semantic_search()
+exporter = Exporter(DiskLRUCache(EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_BYTES), render_workers=EXPORT_RENDER_WORKERS)
+
+generation_profiles = GenerationProfiles(
+    GENERATION_PROFILES, MODEL_GENERATION_OVERRIDES, default=DEFAULT_GENERATION_PROFILE
+)
+
+# Cached Ollama and whisper model lists, refreshed in the background
+model_registry = ModelRegistry(
+    fetch_ollama_models,
+    WHISPER_MODEL_DIR,
+    ttl_seconds=MODEL_REGISTRY_TTL,
+    watch_interval=MODEL_REGISTRY_WATCH_INTERVAL,
+)
+
+live_session_slots = threading.BoundedSemaphore(LIVE_MAX_SESSIONS)
+
+language_cache = LanguageCache()
+language_router = LanguageRouter(
+    LANGUAGE_ROUTES,
+    LANGUAGE_DEFAULT_ROUTE,
+    min_probability=LANGUAGE_MIN_PROBABILITY,
+    whisper_available=lambda name: not model_registry.whisper_models() or model_registry.has_whisper_model(name),
+    llm_available=lambda name: not model_registry.llm_models() or model_registry.has_llm_model(name),
+)
+
+job_queue = JobQueue(
+    stages=[
+        ("detect", _job_detect),
+        ("preprocess", _job_preprocess),
+        ("transcribe", _job_transcribe),
+        ("summarize", _job_summarize),
+        ("save", _job_save),
+    ],
+    max_workers=JOB_WORKERS,
+    max_pending=JOB_MAX_PENDING,
+    stage_limits=JOB_STAGE_LIMITS,
+    stage_observer=observe_stage,
+)
+
+
 # Gradio interface
 def gradio_app(
     audio, context: str, whisper_model_name: str, llm_model_name: str
-) -> tuple[str, str]:
+) -> Iterator[tuple[str, Optional[str]]]:
     """
     Gradio application to handle file upload, model selection, and summary generation.
+    The summary is streamed into the output box as the model generates it.
 
     Args:
         audio: The uploaded audio file.
@@ -429,14 +1633,41 @@ def gradio_app(
         whisper_model_name (str): The selected Whisper model name.
         llm_model_name (str): The selected language model for summarization.
 
-    Returns:
-        tuple[str, str]: A tuple containing the summary text and a downloadable transcript file.
+    Yields:
+        tuple[str, Optional[str]]: The summary so far, and the downloadable transcript file once finished.
     """
-    return translate_and_summarize(audio, context, whisper_model_name, llm_model_name)
+    logger.info(f"Processing audio file: {audio}")
+    route = route_recording(audio, whisper_model_name, llm_model_name)
+    transcript = transcribe_with_cache(audio, route.whisper_model, route.language, route.translate)
+
+    transcript_file = "transcript.txt"
+    with open(transcript_file, "w", encoding="utf-8") as transcript_f:
+        transcript_f.write(transcript)
+
+    parts = []
+    for piece in stream_summary_with_model(route.llm_model, context, transcript):
+        parts.append(piece)
+        yield "".join(parts), None
+    summary = "".join(parts)
+
+    db_manager = get_database_manager()
+    record_id = db_manager.save_transcription(
+        audio_filename=os.path.basename(audio),
+        transcript=transcript,
+        summary=summary,
+        whisper_model=route.whisper_model,
+        llm_model=route.llm_model,
+        context=context,
+        language=route.language
+    )
+    logger.info(f"Saved transcription to database with ID: {record_id}")
+
+    yield summary, transcript_file
 
 
 # Main function to launch the Gradio interface
 if __name__ == "__main__":
+    register_database_listeners()
     # Retrieve available models for Gradio dropdown input
     ollama_models = get_available_models()  # Retrieve models from Ollama server
     whisper_models = (
@@ -453,14 +1684,14 @@ if __name__ == "__main__":
                 placeholder="Provide any additional context for the summary",
             ),
             gr.Dropdown(
-                choices=whisper_models,
+                choices=[AUTO_MODEL] + whisper_models,
                 label="Select a Whisper model for audio-to-text conversion",
-                value=whisper_models[0],
+                value=AUTO_MODEL,
             ),
             gr.Dropdown(
-                choices=ollama_models,
+                choices=[AUTO_MODEL] + ollama_models,
                 label="Select a model for summarization",
-                value=ollama_models[0] if ollama_models else None,
+                value=AUTO_MODEL,
             ),
         ],
         outputs=[
@@ -0,0 +1,173 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Official whisper.cpp model names offered for transcription
+VALID_WHISPER_MODELS = ["base", "small", "medium", "large", "large-V3"]
+
+
+def _normalize_llm_name(name: str) -> str:
+    """Ollama treats "llama2" and "llama2:latest" as the same model."""
+    return name if ":" in name else f"{name}:latest"
+
+
+class ModelRegistry:
+    def __init__(self, fetch_llm_models: Callable[[], Dict[str, str]], whisper_model_dir: str,
+                 ttl_seconds: float = 60, watch_interval: float = 5):
+        """
+        Cached view of the available Ollama and whisper models.
+
+        The Ollama model list is refreshed in the background every ttl_seconds;
+        if Ollama is unreachable the last known list keeps being served. The
+        whisper models directory is rescanned only when its modification time
+        changes.
+
+        Args:
+            fetch_llm_models: Function returning {model name: digest} from Ollama
+            whisper_model_dir: Directory containing whisper.cpp ggml-*.bin files
+            ttl_seconds: Age after which the Ollama model list is refreshed
+            watch_interval: Seconds between checks of the whisper models directory
+        """
+        self.fetch_llm_models = fetch_llm_models
+        self.whisper_model_dir = whisper_model_dir
+        self.ttl_seconds = ttl_seconds
+        self.watch_interval = watch_interval
+        self._lock = threading.Lock()
+        self._llm_digests: Dict[str, str] = {}
+        self._llm_names: List[str] = []
+        self._llm_fetched_at = 0.0
+        self._llm_error: Optional[str] = None
+        self._whisper_models: List[str] = []
+        self._whisper_lookup: set = set()
+        self._whisper_mtime: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Scan the whisper models and start the background refresh thread, which loads the Ollama list."""
+        self.refresh_whisper_models()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, name="model-registry", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def llm_models(self) -> List[str]:
+        """Names of the models available on Ollama (possibly stale if Ollama is down)."""
+        if not self._llm_fetched_at and self._thread is None:
+            self.refresh_llm_models()
+        return list(self._llm_names)
+
+    def whisper_models(self) -> List[str]:
+        """Names of the downloaded whisper models."""
+        if self._thread is None:
+            self.refresh_whisper_models()
+        return list(self._whisper_models)
+
+    def has_llm_model(self, name: str) -> bool:
+        return _normalize_llm_name(name) in self._llm_digests
+
+    def has_whisper_model(self, name: str) -> bool:
+        return name in self._whisper_lookup
+
+    def get_digest(self, llm_model_name: str) -> str:
+        """Digest of an Ollama model, or an empty string if unknown."""
+        return self._llm_digests.get(_normalize_llm_name(llm_model_name), "")
+
+    def validate(self, whisper_model_name: Optional[str], llm_model_name: Optional[str]) -> Optional[str]:
+        """
+        Check requested model names against the registry.
+
+        Lists that have never been loaded are not enforced, so a missing
+        whisper directory or an Ollama outage at startup does not block uploads.
+        A name of None is not checked.
+
+        Returns:
+            An error message, or None if both models are acceptable
+        """
+        if whisper_model_name is not None and self._whisper_models and not self.has_whisper_model(whisper_model_name):
+            return (f"Whisper model '{whisper_model_name}' is not available. "
+                    f"Available models: {', '.join(self._whisper_models)}")
+        if llm_model_name is not None and self._llm_names and not self.has_llm_model(llm_model_name):
+            return (f"LLM model '{llm_model_name}' is not available. "
+                    f"Available models: {', '.join(self._llm_names)}")
+        return None
+
+    def refresh_llm_models(self) -> bool:
+        """
+        Fetch the Ollama model list now, keeping the previous list on failure.
+
+        Returns:
+            True if the list was refreshed
+        """
+        try:
+            digests = self.fetch_llm_models()
+        except Exception as e:
+            with self._lock:
+                self._llm_error = str(e)
+            logger.warning(f"Could not refresh Ollama models, serving cached list: {e}")
+            return False
+        with self._lock:
+            self._llm_digests = {_normalize_llm_name(name): digest for name, digest in digests.items()}
+            self._llm_names = list(digests.keys())
+            self._llm_fetched_at = time.time()
+            self._llm_error = None
+        return True
+
+    def refresh_whisper_models(self) -> bool:
+        """
+        Rescan the whisper models directory if it changed since the last scan.
+
+        Returns:
+            True if the list was rescanned
+        """
+        try:
+            mtime = os.stat(self.whisper_model_dir).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._whisper_mtime and self._whisper_mtime is not None:
+            return False
+
+        model_files = os.listdir(self.whisper_model_dir) if mtime is not None else []
+        # Filter out test models and models that aren't in the valid list
+        whisper_models = sorted({
+            os.path.splitext(f)[0].replace("ggml-", "")
+            for f in model_files
+            if f.endswith(".bin")
+            and any(valid_model in f for valid_model in VALID_WHISPER_MODELS)
+            and "for-tests" not in f
+        })
+        with self._lock:
+            self._whisper_models = whisper_models
+            self._whisper_lookup = set(whisper_models)
+            self._whisper_mtime = mtime
+        return True
+
+    def get_status(self) -> Dict:
+        """Cached lists with their freshness, for diagnostics."""
+        return {
+            "llm_models": list(self._llm_names),
+            "llm_fetched_at": self._llm_fetched_at or None,
+            "llm_age_seconds": round(time.time() - self._llm_fetched_at, 1) if self._llm_fetched_at else None,
+            "llm_error": self._llm_error,
+            "whisper_models": list(self._whisper_models),
+            "whisper_model_dir": self.whisper_model_dir,
+        }
+
+    def _refresh_loop(self):
+        while True:
+            if time.time() - self._llm_fetched_at >= self.ttl_seconds:
+                self.refresh_llm_models()
+            if self._stop.wait(self.watch_interval):
+                return
+            self.refresh_whisper_models()
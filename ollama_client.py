@@ -0,0 +1,250 @@
+import asyncio
+import json
+import queue
+import random
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+
+
+class OllamaError(Exception):
+    """Raised when an Ollama request fails after all retries."""
+
+
+class _RetryableStatus(Exception):
+    """A 5xx response that is worth retrying on another attempt."""
+
+
+class _Backend:
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+
+class OllamaClient:
+    def __init__(self, base_urls: List[str], connect_timeout: float = 5.0, read_timeout: float = 600.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 max_connections: int = 32, max_keepalive_connections: int = 16,
+                 failure_cooldown: float = 10.0):
+        """
+        Pooled HTTP client for one or more Ollama servers.
+
+        Requests run on an httpx.AsyncClient owned by a dedicated event loop
+        thread, so connections are kept alive and shared by every caller, while
+        the synchronous methods below can be used from worker threads. Each
+        request goes to the backend with the fewest outstanding requests.
+        Connection errors and 5xx responses are retried with jittered
+        exponential backoff, preferring a different backend; a streamed
+        response is never retried once data has been returned.
+
+        Args:
+            base_urls: Ollama server URLs, e.g. ["http://localhost:11434"]
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait between received bytes (covers model loading)
+            max_retries: Retries after the first attempt
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Maximum backoff delay in seconds
+            max_connections: Connection pool size across all backends
+            max_keepalive_connections: Idle connections kept open for reuse
+            failure_cooldown: Seconds a backend is skipped after a connection failure
+        """
+        if not base_urls:
+            raise ValueError("At least one Ollama server URL is required")
+        self.backends = [_Backend(url) for url in base_urls]
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_cooldown = failure_cooldown
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive_connections
+        )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="ollama-client", daemon=True)
+        self._thread.start()
+        self._client: httpx.AsyncClient = self._run(self._create_client())
+
+    # Synchronous API, safe to call from any thread
+
+    def get_json(self, path: str, timeout: Optional[float] = None) -> Dict:
+        """
+        Send a GET request and return the decoded JSON body.
+
+        Args:
+            path: API path, e.g. "/api/tags"
+            timeout: Optional overall timeout in seconds
+        """
+        return self._run(self._request_json("GET", path, None, timeout=timeout))
+
+    def post_json(self, path: str, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        """
+        Send a non-streaming POST request and return the decoded JSON body.
+
+        Args:
+            path: API path, e.g. "/api/embeddings"
+            payload: JSON request body
+            timeout: Optional overall timeout in seconds
+        """
+        return self._run(self._request_json("POST", path, payload, timeout=timeout))
+
+    def generate_stream(self, model: str, prompt: str, **fields) -> Iterator[Dict]:
+        """
+        Stream /api/generate, yielding each decoded NDJSON object as it arrives.
+
+        Args:
+            model: Model name
+            prompt: Prompt text
+            **fields: Extra request fields (options, keep_alive, ...)
+
+        Yields:
+            Response objects; the last one has "done": true and carries eval statistics
+        """
+        payload = {"model": model, "prompt": prompt, **fields}
+        yield from self.stream_json("/api/generate", payload)
+
+    def stream_json(self, path: str, payload: Dict) -> Iterator[Dict]:
+        """Stream an NDJSON endpoint, yielding each decoded object."""
+        items: "queue.Queue" = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._pump(path, payload, items), self._loop)
+        try:
+            while True:
+                kind, value = items.get()
+                if kind == "item":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            # Stops the request if the caller stopped reading early
+            future.cancel()
+
+    def get_statistics(self) -> List[Dict]:
+        """Per-backend request counters."""
+        return [
+            {
+                "url": backend.url,
+                "outstanding": backend.outstanding,
+                "requests": backend.requests,
+                "failures": backend.failures,
+                "available": backend.down_until <= time.monotonic(),
+            }
+            for backend in self.backends
+        ]
+
+    def close(self):
+        """Close pooled connections and stop the event loop thread."""
+        self._run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    # Internals, running on the client's event loop
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+
+    def _pick_backend(self, avoid: Optional[_Backend] = None) -> _Backend:
+        """Least outstanding requests among available backends, avoiding the one that just failed."""
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b.down_until <= now and b is not avoid]
+        if not candidates:
+            candidates = [b for b in self.backends if b is not avoid] or self.backends
+        fewest = min(b.outstanding for b in candidates)
+        return random.choice([b for b in candidates if b.outstanding == fewest])
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _mark_failed(self, backend: _Backend):
+        backend.failures += 1
+        backend.down_until = time.monotonic() + self.failure_cooldown
+
+    async def _request_json(self, method: str, path: str, payload: Optional[Dict],
+                            timeout: Optional[float] = None) -> Dict:
+        backend = None
+        attempt = 0
+        while True:
+            backend = self._pick_backend(avoid=backend if len(self.backends) > 1 else None)
+            backend.outstanding += 1
+            backend.requests += 1
+            try:
+                response = await self._client.request(
+                    method, backend.url + path, json=payload,
+                    timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                )
+                if response.status_code >= 500:
+                    raise _RetryableStatus(f"{backend.url}{path} returned {response.status_code}: {response.text}")
+                if response.status_code != 200:
+                    raise OllamaError(f"{backend.url}{path} returned {response.status_code}: {response.text}")
+                try:
+                    return response.json()
+                except ValueError:
+                    # e.g. a proxy's error page or a truncated body
+                    raise OllamaError(f"{backend.url}{path} returned invalid JSON: {response.text[:200]}")
+            except (httpx.TransportError, _RetryableStatus) as e:
+                self._mark_failed(backend)
+                if attempt >= self.max_retries:
+                    raise OllamaError(f"Ollama request failed after {attempt + 1} attempts: {e}") from e
+            finally:
+                backend.outstanding -= 1
+            attempt += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def _stream(self, path: str, payload: Dict) -> AsyncIterator[Dict]:
+        backend = None
+        attempt = 0
+        while True:
+            backend = self._pick_backend(avoid=backend if len(self.backends) > 1 else None)
+            backend.outstanding += 1
+            backend.requests += 1
+            received = False
+            try:
+                async with self._client.stream("POST", backend.url + path, json=payload) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode("utf-8", errors="replace")
+                        message = f"{backend.url}{path} returned {response.status_code}: {body}"
+                        if response.status_code >= 500:
+                            raise _RetryableStatus(message)
+                        raise OllamaError(message)
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        try:
+                            item = json.loads(line)
+                        except json.JSONDecodeError:
+                            raise OllamaError(f"Response contains invalid JSON data: {line[:200]}")
+                        if "error" in item:
+                            raise OllamaError(item["error"])
+                        received = True
+                        yield item
+                        if item.get("done", False):
+                            return
+                    return
+            except (httpx.TransportError, _RetryableStatus) as e:
+                self._mark_failed(backend)
+                if received or attempt >= self.max_retries:
+                    raise OllamaError(f"Ollama stream failed after {attempt + 1} attempts: {e}") from e
+            finally:
+                backend.outstanding -= 1
+            attempt += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def _pump(self, path: str, payload: Dict, items: "queue.Queue"):
+        """Move items from the async stream onto a thread-safe queue for stream_json."""
+        try:
+            async for item in self._stream(path, payload):
+                items.put(("item", item))
+            items.put(("end", None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            items.put(("error", e))
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+
+class HasherBusyError(Exception):
+    """Raised when too many password operations are already waiting."""
+
+
+class PasswordHasher:
+    def __init__(self, rounds: int = 12, max_workers: int = 2, max_pending: int = 64):
+        """
+        Runs bcrypt hashing and verification on a dedicated, bounded thread pool.
+
+        bcrypt releases the GIL, so a few threads use separate cores without
+        taking slots from the web server's threadpool. Requests beyond
+        max_pending are rejected instead of queueing, which keeps login
+        latency bounded during bursts.
+
+        Args:
+            rounds: bcrypt cost factor for new hashes; existing hashes with a
+                different cost are flagged for rehashing on the next login
+            max_workers: Password operations running at once
+            max_pending: Operations allowed to wait or run before HasherBusyError
+        """
+        self.context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost."""
+        return await self._submit(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a password against a stored hash."""
+        return await self._submit(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password and, if its hash uses outdated settings, compute a replacement.
+
+        Returns:
+            (whether the password matched, new hash to store or None)
+        """
+        valid, new_hash = await self._submit(self.context.verify_and_update, password, hashed_password)
+        if new_hash is not None:
+            with self._lock:
+                self._rehashed += 1
+        return valid, new_hash
+
+    def get_statistics(self) -> Dict:
+        """Queue depth and timing counters."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "completed": completed,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2) if completed else 0.0,
+                "avg_run_ms": round(self._run_seconds / completed * 1000, 2) if completed else 0.0,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    async def _submit(self, function, *args):
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                self._rejected += 1
+                raise HasherBusyError("Too many sign-in requests in progress, please try again shortly")
+            self._in_flight += 1
+        submitted_at = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(self._executor.submit(self._run, function, args, submitted_at))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _run(self, function, args, submitted_at: float):
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        try:
+            return function(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._wait_seconds += started_at - submitted_at
+                self._run_seconds += finished_at - started_at
@@ -0,0 +1,448 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ollama_client import OllamaClient, OllamaError
+from transcript_segments import parse_segments
+
+logger = logging.getLogger(__name__)
+
+# Characters of each chunk kept in the index for displaying results
+PREVIEW_CHARS = 240
+
+
+def chunk_record(transcript: str, summary: str, max_words: int = 120) -> List[Dict]:
+    """
+    Split a record into passages for embedding.
+
+    Transcript segments are grouped until max_words is reached, keeping the
+    start time of each group; the summary is split by paragraph.
+
+    Returns:
+        List of {"kind", "start_ms", "text"} dictionaries
+    """
+    chunks: List[Dict] = []
+    for paragraph in (summary or "").split("\n\n"):
+        if paragraph.strip():
+            chunks.append({"kind": "summary", "start_ms": None, "text": paragraph.strip()})
+
+    segments = parse_segments(transcript or "")
+    if not segments and (transcript or "").strip():
+        segments = [{"start_ms": None, "text": transcript}]
+    words: List[str] = []
+    start_ms = None
+    for segment in segments:
+        if not words:
+            start_ms = segment["start_ms"]
+        words.extend(segment["text"].split())
+        if len(words) >= max_words:
+            chunks.append({"kind": "transcript", "start_ms": start_ms, "text": " ".join(words)})
+            words = []
+    if words:
+        chunks.append({"kind": "transcript", "start_ms": start_ms, "text": " ".join(words)})
+    return chunks
+
+
+class OllamaEmbedder:
+    def __init__(self, client: OllamaClient, model: str = "nomic-embed-text"):
+        """Embeddings from an Ollama embedding model, through the shared client."""
+        self.client = client
+        self.model = model
+        self.name = f"ollama/{model}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        try:
+            # Batched endpoint (Ollama 0.3+)
+            vectors = self.client.post_json("/api/embed", {"model": self.model, "input": texts})["embeddings"]
+        except OllamaError:
+            vectors = [
+                self.client.post_json("/api/embeddings", {"model": self.model, "prompt": text})["embedding"]
+                for text in texts
+            ]
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class TransformersEmbedder:
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", batch_size: int = 32):
+        """Mean-pooled embeddings from a Hugging Face encoder on CPU, loaded on first use."""
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.name = f"transformers/{model_name}"
+        self._model = None
+        self._tokenizer = None
+        self._lock = threading.Lock()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        import torch
+        with self._lock:
+            if self._model is None:
+                from transformers import AutoModel, AutoTokenizer
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self._model = AutoModel.from_pretrained(self.model_name).eval()
+            batches = []
+            for i in range(0, len(texts), self.batch_size):
+                inputs = self._tokenizer(texts[i:i + self.batch_size], padding=True, truncation=True,
+                                         return_tensors="pt")
+                with torch.no_grad():
+                    hidden = self._model(**inputs).last_hidden_state
+                mask = inputs["attention_mask"].unsqueeze(-1).float()
+                batches.append(((hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)).numpy())
+        return np.concatenate(batches).astype(np.float32)
+
+
+class SemanticIndex:
+    def __init__(self, directory: Optional[str] = "cache/semantic", initial_capacity: int = 1024):
+        """
+        Cosine-similarity index over unit-normalized float32 vectors.
+
+        Vectors live in a memory-mapped file whose capacity doubles as it
+        fills, so adding a record only writes its own rows. Deleted rows are
+        masked out and reclaimed by compact(). Row metadata (record ID, owner,
+        chunk kind, start time, preview) is appended to a JSON-lines log
+        alongside, with a tombstone line per removed record, so saving after
+        an add or delete only writes what changed; the log is rewritten only
+        by compact().
+
+        Args:
+            directory: Where the index is persisted; None keeps it in memory only
+            initial_capacity: Rows allocated when the index is first created
+        """
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        self._lock = threading.RLock()
+        self.dim: Optional[int] = None
+        self.model: Optional[str] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._count = 0
+        self._live = np.zeros(0, dtype=bool)
+        # Row owners as small integer codes so per-user filtering stays vectorized; 0 means no owner
+        self._owners = np.zeros(0, dtype=np.int32)
+        self._owner_codes: Dict[Optional[str], int] = {None: 0}
+        self._rows: List[Dict] = []
+        self._rows_by_record: Dict[str, List[int]] = {}
+        self._journal: List[Dict] = []  # Row and tombstone lines not yet appended to the log
+        self._rewrite = False  # The log no longer matches the rows (after compact) and is written in full
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return int(self._live[:self._count].sum())
+
+    def add(self, record_id: str, chunks: List[Dict], vectors: np.ndarray, user_id: Optional[str] = None,
+            model: Optional[str] = None):
+        """Add a record's chunk vectors, replacing any previous ones for the record."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(chunks) != len(vectors):
+            raise ValueError("Each chunk needs exactly one vector")
+        if not len(vectors):
+            return
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self.model = model
+                self._rewrite = True
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Index holds {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+            self.remove(record_id)
+            self._reserve(self._count + len(vectors))
+            start = self._count
+            self._vectors[start:start + len(vectors)] = vectors
+            self._live[start:start + len(vectors)] = True
+            self._owners[start:start + len(vectors)] = self._owner_code(user_id)
+            for chunk in chunks:
+                row = {
+                    "record_id": record_id,
+                    "user_id": user_id,
+                    "kind": chunk.get("kind"),
+                    "start_ms": chunk.get("start_ms"),
+                    "preview": chunk["text"][:PREVIEW_CHARS],
+                }
+                self._rows.append(row)
+                if self.directory:
+                    self._journal.append(row)
+            self._rows_by_record[record_id] = list(range(start, start + len(vectors)))
+            self._count += len(vectors)
+
+    def remove(self, record_id: str) -> int:
+        """Mask out a record's rows. Returns the number of rows removed."""
+        with self._lock:
+            rows = self._rows_by_record.pop(record_id, [])
+            for row in rows:
+                self._live[row] = False
+            if rows and self.directory:
+                self._journal.append({"removed": record_id})
+            return len(rows)
+
+    def search(self, query_vectors: np.ndarray, k: int = 10, user_id: Optional[str] = None,
+               block_rows: int = 65536) -> List[List[Dict]]:
+        """
+        Top-k chunks by cosine similarity for each query.
+
+        All queries are scored together, one block of rows at a time, so a
+        batch costs one matrix multiply per block.
+
+        Args:
+            query_vectors: One query vector, or a (queries, dim) matrix
+            k: Results per query
+            user_id: Only return rows owned by this user or by nobody
+            block_rows: Rows scored per matrix multiply (bounds temporary memory)
+
+        Returns:
+            For each query, a list of row metadata with a "score", best first
+        """
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        with self._lock:
+            if self._count == 0 or k <= 0:
+                return [[] for _ in queries]
+            allowed = self._live[:self._count].copy()
+            if user_id is not None:
+                owners = self._owners[:self._count]
+                allowed &= (owners == 0) | (owners == self._owner_codes.get(user_id, -1))
+            best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+            best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+            for start in range(0, self._count, block_rows):
+                stop = min(start + block_rows, self._count)
+                scores = queries @ self._vectors[start:stop].T
+                scores[:, ~allowed[start:stop]] = -np.inf
+                rows = np.broadcast_to(np.arange(start, stop), scores.shape)
+                scores = np.concatenate([best_scores, scores], axis=1)
+                rows = np.concatenate([best_rows, rows], axis=1)
+                if scores.shape[1] > k:
+                    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                    scores = np.take_along_axis(scores, top, axis=1)
+                    rows = np.take_along_axis(rows, top, axis=1)
+                best_scores, best_rows = scores, rows
+
+            results = []
+            for scores, rows in zip(best_scores, best_rows):
+                order = np.argsort(-scores)
+                results.append([
+                    {**self._rows[rows[i]], "score": round(float(scores[i]), 4)}
+                    for i in order if np.isfinite(scores[i])
+                ])
+            return results
+
+    def compact(self):
+        """Drop deleted rows so they no longer take space or scoring time."""
+        with self._lock:
+            keep = np.flatnonzero(self._live[:self._count])
+            if len(keep) == self._count:
+                return
+            vectors = np.array(self._vectors[keep]) if self._count else None
+            rows = [self._rows[i] for i in keep]
+            owners = self._owners[keep]
+            self._vectors, self._count, self._live = None, 0, np.zeros(0, dtype=bool)
+            self._owners = np.zeros(0, dtype=np.int32)
+            self._rows, self._rows_by_record = [], {}
+            if self.directory and os.path.exists(self._vectors_path):
+                os.remove(self._vectors_path)
+            if vectors is not None and len(vectors):
+                self._reserve(len(vectors))
+                self._vectors[:len(vectors)] = vectors
+                self._live[:len(vectors)] = True
+                self._owners[:len(vectors)] = owners
+                self._count = len(vectors)
+            self._rows = rows
+            for i, row in enumerate(rows):
+                self._rows_by_record.setdefault(row["record_id"], []).append(i)
+            self._journal, self._rewrite = [], True
+
+    def save(self):
+        """
+        Flush vectors and append new row metadata and tombstones to the log, compacting
+        first if most rows are deleted. Vectors are flushed before the rows that refer to them.
+        """
+        if not self.directory:
+            return
+        with self._lock:
+            if self._count and len(self) < self._count // 2:
+                self.compact()
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            if self._rewrite:
+                self._write_atomic(self._meta_path, json.dumps({"dim": self.dim, "model": self.model}))
+                self._write_atomic(self._rows_path, "".join(json.dumps(row) + "\n" for row in self._rows))
+                self._journal, self._rewrite = [], False
+            elif self._journal:
+                with open(self._rows_path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(line) + "\n" for line in self._journal))
+                self._journal = []
+
+    def get_statistics(self) -> Dict:
+        with self._lock:
+            return {
+                "model": self.model,
+                "dim": self.dim,
+                "chunks": len(self),
+                "deleted_chunks": self._count - len(self),
+                "records": len(self._rows_by_record),
+                "capacity": len(self._live),
+            }
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    @property
+    def _rows_path(self) -> str:
+        return os.path.join(self.directory, "rows.jsonl")
+
+    @staticmethod
+    def _write_atomic(path: str, content: str):
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def _reserve(self, rows: int):
+        """Grow vector storage (doubling) to hold at least `rows` rows."""
+        capacity = len(self._live)
+        if rows <= capacity and self._vectors is not None:
+            return
+        new_capacity = max(self.initial_capacity, capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+        if self.directory:
+            # Growing a memmap: extend the file, then map it again
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            self._vectors = None
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(new_capacity * self.dim * 4)
+            vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim))
+        else:
+            vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+            if self._vectors is not None:
+                vectors[:self._count] = self._vectors[:self._count]
+        live = np.zeros(new_capacity, dtype=bool)
+        live[:capacity] = self._live
+        owners = np.zeros(new_capacity, dtype=np.int32)
+        owners[:capacity] = self._owners
+        self._vectors, self._live, self._owners = vectors, live, owners
+
+    def _load(self):
+        if not os.path.exists(self._meta_path) or not os.path.exists(self._vectors_path):
+            return
+        try:
+            with open(self._meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim, self.model = meta["dim"], meta["model"]
+            capacity = os.path.getsize(self._vectors_path) // (self.dim * 4)
+            if "rows" in meta:
+                # Older indexes kept every row in meta.json; convert them on the next save
+                rows, removed = meta["rows"], set(range(meta["count"])) - set(meta["live"])
+                self._rewrite = True
+            else:
+                rows, removed = self._read_log(capacity)
+            self._count = len(rows)
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+            self._live = np.zeros(capacity, dtype=bool)
+            self._live[:self._count] = True
+            self._live[sorted(removed)] = False
+            self._rows = rows
+            self._owners = np.zeros(capacity, dtype=np.int32)
+            self._owners[:self._count] = [self._owner_code(row["user_id"]) for row in self._rows]
+            for i in np.flatnonzero(self._live[:self._count]):
+                self._rows_by_record.setdefault(self._rows[i]["record_id"], []).append(int(i))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load semantic index, starting empty: {e}")
+            self.dim, self.model, self._vectors, self._count = None, None, None, 0
+            self._live, self._rows, self._rows_by_record = np.zeros(0, dtype=bool), [], {}
+            self._owners = np.zeros(0, dtype=np.int32)
+
+    def _read_log(self, capacity: int):
+        """Replay the row log into (rows, indices of removed rows)."""
+        rows: List[Dict] = []
+        removed = set()
+        by_record: Dict[str, List[int]] = {}
+        if not os.path.exists(self._rows_path):
+            return rows, removed
+        with open(self._rows_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A save interrupted mid-line; everything before it is intact
+                    logger.warning("Ignoring a truncated line at the end of the semantic index log")
+                    self._rewrite = True
+                    break
+                if "removed" in entry:
+                    removed.update(by_record.pop(entry["removed"], []))
+                elif len(rows) < capacity:
+                    by_record.setdefault(entry["record_id"], []).append(len(rows))
+                    rows.append(entry)
+        return rows, removed
+
+    def _owner_code(self, user_id: Optional[str]) -> int:
+        if user_id not in self._owner_codes:
+            self._owner_codes[user_id] = len(self._owner_codes)
+        return self._owner_codes[user_id]
+
+
+class SemanticSearch:
+    def __init__(self, embedder, index: SemanticIndex, chunk_words: int = 120):
+        """
+        Keeps a SemanticIndex in step with saved transcriptions.
+
+        Embedding runs on a single background thread, so saving a record is not
+        slowed down by it; records are searchable once their chunks are indexed.
+
+        Args:
+            embedder: Object with embed(texts) -> (n, dim) array and a name
+            index: Vector index to maintain
+            chunk_words: Approximate words per transcript chunk
+        """
+        self.embedder = embedder
+        self.index = index
+        self.chunk_words = chunk_words
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="semantic-index")
+        if index.model and index.model != embedder.name:
+            logger.warning(f"Semantic index was built with {index.model}; results may be poor until it is rebuilt")
+
+    def on_database_event(self, event: str, record_id: str, record: Optional[Dict]):
+        """DatabaseManager listener: index saved or updated records, drop deleted ones."""
+        if event == "deleted":
+            self._executor.submit(self._remove, record_id)
+        elif event in ("saved", "updated") and record is not None:
+            self._executor.submit(self._index_record, record_id, record)
+
+    def search(self, query: str, k: int = 10, user_id: Optional[str] = None) -> List[Dict]:
+        """Top-k chunks for a natural-language query."""
+        if not len(self.index):
+            return []
+        query_vector = self.embedder.embed([query])
+        return self.index.search(query_vector, k=k, user_id=user_id)[0]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        self.index.save()
+
+    def _index_record(self, record_id: str, record: Dict):
+        try:
+            chunks = chunk_record(record.get("transcript", ""), record.get("summary", ""), self.chunk_words)
+            if not chunks:
+                return
+            vectors = self.embedder.embed([chunk["text"] for chunk in chunks])
+            self.index.add(record_id, chunks, vectors, user_id=record.get("user_id"), model=self.embedder.name)
+            self.index.save()
+        except Exception as e:
+            logger.error(f"Error indexing transcription {record_id} for semantic search: {e}")
+
+    def _remove(self, record_id: str):
+        if self.index.remove(record_id):
+            self.index.save()
@@ -0,0 +1,203 @@
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+from cache_store import DiskLRUCache, TTLLRUCache
+
+
+class _InFlight:
+    """A generation that other callers with the same key can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Optional[str] = None
+        self.error: Optional[Exception] = None
+        self.waiters = 0  # Followers waiting for the result
+
+
+class SummaryCache:
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 24 * 3600,
+                 persist_directory: Optional[str] = "cache/summaries",
+                 persist_max_bytes: int = 64 * 1024 * 1024):
+        """
+        Memoizes LLM summaries keyed on the model, its digest and the prompt inputs.
+
+        Entries live in memory with TTL and LRU eviction, optionally backed by an
+        on-disk store so they survive restarts. Concurrent requests for the same
+        key share a single in-flight generation.
+
+        Args:
+            max_entries: Maximum number of summaries kept in memory
+            ttl_seconds: How long a summary stays valid
+            persist_directory: Directory for the on-disk backing store, or None to keep memory only
+            persist_max_bytes: Size budget of the on-disk backing store
+        """
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLLRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk = DiskLRUCache(persist_directory, persist_max_bytes) if persist_directory else None
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, _InFlight] = {}
+
+    @staticmethod
+    def make_key(llm_model_name: str, model_digest: str, context: str, transcript: str, options: str = "") -> str:
+        """
+        Build a cache key from normalized prompt inputs.
+
+        Whitespace differences in the context or transcript and an omitted
+        ``:latest`` tag on the model name do not change the key.
+        """
+        model = llm_model_name.strip().lower()
+        if ":" not in model:
+            model += ":latest"
+        parts = [
+            model,
+            model_digest or "",
+            " ".join((context or "").split()),
+            " ".join(transcript.split()),
+            options,
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached summary from memory or the backing store, or None."""
+        summary = self.memory.get(key)
+        if summary is not None or self.disk is None:
+            return summary
+        entry = self.disk.get_json(key)
+        if entry is None:
+            return None
+        remaining = entry["expires_at"] - time.time()
+        if remaining <= 0:
+            self.disk.delete(key)
+            return None
+        self.memory.set(key, entry["summary"], ttl_seconds=remaining)
+        return entry["summary"]
+
+    def set(self, key: str, summary: str):
+        """Store a summary in memory and the backing store."""
+        self.memory.set(key, summary)
+        if self.disk is not None:
+            self.disk.set_json(key, {"summary": summary, "expires_at": time.time() + self.ttl_seconds})
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> str:
+        """
+        Return the cached summary for a key, generating it at most once.
+
+        Args:
+            key: Key from make_key
+            compute: Function producing the summary on a miss
+
+        Returns:
+            The summary text
+        """
+        return "".join(self.stream_or_compute(key, lambda: iter([compute()])))
+
+    def stream_or_compute(self, key: str, stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        Yield the summary for a key, streaming it from the model on a miss.
+
+        A cached summary is yielded in one piece. If another caller is already
+        generating the same key, wait for its result instead of starting a
+        second generation. The streamed pieces are cached once the stream
+        completes. If the caller stops reading early while others are waiting
+        for the same key, the generation finishes on a background thread for them.
+
+        Args:
+            key: Key from make_key
+            stream: Function returning an iterator of summary pieces on a miss
+
+        Yields:
+            Pieces of the summary text
+        """
+        summary = self.get(key)
+        if summary is not None:
+            yield summary
+            return
+
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            yield flight.value
+            return
+
+        # Another leader may have finished between our miss and taking the lead
+        summary = self.memory.get(key)
+        if summary is not None:
+            self._finish(key, flight, value=summary)
+            yield summary
+            return
+
+        parts = []
+        pieces = None
+        try:
+            pieces = stream()
+            for piece in pieces:
+                parts.append(piece)
+                yield piece
+        except GeneratorExit:
+            # The consumer stopped reading early; keep generating only if others are waiting
+            with self._lock:
+                detach = pieces is not None and flight.waiters > 0
+                if not detach:
+                    # Decided under the lock, so no follower can join a cancelled generation
+                    del self._in_flight[key]
+            if detach:
+                threading.Thread(target=self._complete, args=(key, flight, pieces, parts),
+                                 name="summary-detached", daemon=True).start()
+            else:
+                self._finish(key, flight, error=Exception("Summary generation was cancelled"))
+            raise
+        except BaseException as e:
+            self._finish(key, flight, error=e if isinstance(e, Exception) else Exception("Summary generation failed"))
+            raise
+        self._complete(key, flight, iter(()), parts)
+
+    def _complete(self, key: str, flight: _InFlight, pieces: Iterator[str], parts: list):
+        """Consume the rest of a generation, cache it and hand it to the waiting followers."""
+        try:
+            parts.extend(pieces)
+            summary = "".join(parts)
+            self.set(key, summary)
+        except Exception as e:
+            self._finish(key, flight, error=e)
+            return
+        self._finish(key, flight, value=summary)
+
+    def _finish(self, key: str, flight: _InFlight, value: Optional[str] = None,
+                error: Optional[Exception] = None):
+        with self._lock:
+            # Followers arriving from now on start their own generation (or hit the cache)
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+            flight.value, flight.error = value, error
+        flight.event.set()
+
+    def get_statistics(self) -> Dict:
+        stats = {"memory": self.memory.get_statistics(), "coalesced": self.coalesced}
+        if self.disk is not None:
+            stats["disk"] = self.disk.get_statistics()
+        return stats
+
+
+# Singleton instance
+_summary_cache = None
+
+def get_summary_cache():
+    """Get the singleton summary cache instance."""
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = SummaryCache()
+    return _summary_cache
@@ -0,0 +1,85 @@
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from cache_store import DiskLRUCache
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """
+    Compute the SHA-256 of a file without loading it into memory.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    def __init__(self, directory: str = "cache/transcripts", max_bytes: int = 512 * 1024 * 1024):
+        """
+        Content-addressed cache of whisper transcripts.
+
+        Entries are keyed on the SHA-256 of the audio bytes together with the
+        whisper model and options, so re-uploading the same recording skips
+        ffmpeg and whisper entirely.
+
+        Args:
+            directory: Directory for cached transcripts
+            max_bytes: Size budget before least-recently-used entries are evicted
+        """
+        self.store = DiskLRUCache(directory, max_bytes)
+
+    @staticmethod
+    def make_key(audio_hash: str, whisper_model: str, whisper_options: List[str]) -> str:
+        """Build the cache key for an (audio, model, options) combination."""
+        raw = "\n".join([audio_hash, whisper_model, " ".join(whisper_options)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, audio_hash: str, whisper_model: str, whisper_options: List[str]) -> Optional[str]:
+        """
+        Look up a cached transcript.
+
+        Args:
+            audio_hash: SHA-256 of the original audio file
+            whisper_model: Whisper model name
+            whisper_options: Extra whisper command-line options
+
+        Returns:
+            The transcript, or None on a miss
+        """
+        entry = self.store.get_json(self.make_key(audio_hash, whisper_model, whisper_options))
+        return entry["transcript"] if entry else None
+
+    def set(self, audio_hash: str, whisper_model: str, whisper_options: List[str], transcript: str):
+        """Store a transcript for an (audio, model, options) combination."""
+        self.store.set_json(self.make_key(audio_hash, whisper_model, whisper_options), {
+            "audio_hash": audio_hash,
+            "whisper_model": whisper_model,
+            "whisper_options": whisper_options,
+            "transcript": transcript,
+            "created_at": datetime.now().isoformat(),
+        })
+
+    def get_statistics(self) -> Dict:
+        return self.store.get_statistics()
+
+
+# Singleton instance
+_transcript_cache = None
+
+def get_transcript_cache():
+    """Get the singleton transcript cache instance."""
+    global _transcript_cache
+    if _transcript_cache is None:
+        _transcript_cache = TranscriptCache()
+    return _transcript_cache
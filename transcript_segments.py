@@ -0,0 +1,77 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+# "[00:01:02.340 --> 00:01:05.120]  text" as printed by whisper.cpp (hours are optional)
+SEGMENT_LINE = re.compile(r"^\s*\[((?:\d+:)?\d+:\d+(?:[.,]\d+)?)\s*-->\s*((?:\d+:)?\d+:\d+(?:[.,]\d+)?)\]\s*(.*)$")
+
+
+def parse_timestamp_ms(timestamp: str) -> int:
+    """Convert "HH:MM:SS.mmm" or "MM:SS.mmm" to milliseconds."""
+    seconds = 0.0
+    for part in timestamp.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return int(round(seconds * 1000))
+
+
+def parse_segments(transcript: str) -> List[Dict]:
+    """
+    Parse whisper output into segments.
+
+    Lines without a timestamp are appended to the previous segment's text
+    (or dropped if no segment has started yet).
+
+    Args:
+        transcript: Transcript text with one "[start --> end]  text" line per segment
+
+    Returns:
+        List of {"start_ms", "end_ms", "text"} dictionaries in order
+    """
+    segments: List[Dict] = []
+    for line in transcript.splitlines():
+        match = SEGMENT_LINE.match(line)
+        if match:
+            segments.append({
+                "start_ms": parse_timestamp_ms(match.group(1)),
+                "end_ms": parse_timestamp_ms(match.group(2)),
+                "text": match.group(3).strip(),
+            })
+        elif segments and line.strip():
+            segments[-1]["text"] = f"{segments[-1]['text']} {line.strip()}".strip()
+    return segments
+
+
+def to_columns(segments: List[Dict]) -> Dict[str, List]:
+    """Store segments as parallel arrays, which take far less space in BSON than one document per segment."""
+    return {
+        "start_ms": [s["start_ms"] for s in segments],
+        "end_ms": [s["end_ms"] for s in segments],
+        "text": [s["text"] for s in segments],
+    }
+
+
+def from_columns(columns: Dict[str, List], first_index: int = 0) -> List[Dict]:
+    """Rebuild segment dictionaries from (possibly sliced) parallel arrays."""
+    return [
+        {"index": first_index + i, "start_ms": start, "end_ms": end, "text": text}
+        for i, (start, end, text) in enumerate(zip(columns["start_ms"], columns["end_ms"], columns["text"]))
+    ]
+
+
+def duration_seconds(segments: List[Dict]) -> Optional[int]:
+    """Audio duration from the last segment's end time, or None without segments."""
+    if not segments:
+        return None
+    return int(round(max(s["end_ms"] for s in segments) / 1000))
+
+
+def index_range(start_ms: List[int], end_ms: List[int], from_ms: Optional[int] = None,
+                to_ms: Optional[int] = None) -> range:
+    """
+    Indexes of the segments overlapping [from_ms, to_ms).
+
+    Segments are in time order, so both ends are found by binary search.
+    """
+    first = 0 if from_ms is None else bisect_right(end_ms, from_ms)
+    last = len(start_ms) if to_ms is None else bisect_left(start_ms, to_ms)
+    return range(first, max(first, last))
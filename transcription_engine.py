@@ -0,0 +1,681 @@
+import logging
+import os
+import re
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from audio_stream import BYTES_PER_SECOND, pcm_to_float32, pcm_to_wav_bytes, wav_duration_seconds
+from transcript_segments import parse_segments
+
+logger = logging.getLogger(__name__)
+
+# whisper.cpp's server reports languages by name; routing uses whisper's two-letter codes
+LANGUAGE_CODES = {
+    "english": "en", "spanish": "es", "hindi": "hi", "tamil": "ta", "french": "fr", "german": "de",
+    "italian": "it", "portuguese": "pt", "russian": "ru", "chinese": "zh", "japanese": "ja", "korean": "ko",
+    "arabic": "ar", "bengali": "bn", "telugu": "te", "marathi": "mr", "urdu": "ur", "kannada": "kn",
+    "malayalam": "ml", "gujarati": "gu", "punjabi": "pa", "dutch": "nl", "turkish": "tr", "indonesian": "id",
+}
+
+
+def language_code(language: str) -> str:
+    """Normalize a whisper language name or code to the two-letter code ("Tamil" -> "ta")."""
+    language = language.strip().lower()
+    return LANGUAGE_CODES.get(language, language)
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds the way whisper.cpp prints segment timestamps (HH:MM:SS.mmm)."""
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600 * 1000)
+    minutes, milliseconds = divmod(milliseconds, 60 * 1000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
+
+
+def format_segments(segments: List[Dict], offset: float = 0.0) -> str:
+    """Render segments as whisper.cpp style "[start --> end]  text" lines, shifted by offset seconds."""
+    return "\n".join(
+        f"[{format_timestamp(s['start'] + offset)} --> {format_timestamp(s['end'] + offset)}]  {s['text'].strip()}"
+        for s in segments
+    )
+
+
+class TranscriptionResult:
+    def __init__(self, text: str, model_name: str, backend: str, load_seconds: float = 0.0,
+                 inference_seconds: float = 0.0):
+        """
+        Output of a transcription request.
+
+        Args:
+            text: Transcript text, one "[start --> end]  text" line per segment
+            model_name: Whisper model used
+            backend: Name of the backend that produced the transcript
+            load_seconds: Time spent loading the model for this request (0 when already resident)
+            inference_seconds: Time spent transcribing
+        """
+        self.text = text
+        self.model_name = model_name
+        self.backend = backend
+        self.load_seconds = load_seconds
+        self.inference_seconds = inference_seconds
+        # Length of the input audio when known, and of the speech transcribed when
+        # voice activity detection dropped silence
+        self.audio_seconds: Optional[float] = None
+        self.speech_seconds: Optional[float] = None
+
+
+class TranscriptionBackend:
+    """
+    Interface for whisper backends.
+
+    A backend loads a model into a handle that the engine keeps resident
+    until it is evicted, and transcribes 16kHz mono WAV files with it.
+    Backends that set supports_pcm can also consume decoded PCM windows
+    directly, without a WAV file on disk. Backends that clear resident
+    reload the model on every transcribe call.
+    """
+
+    name = "base"
+    supports_pcm = False
+    resident = True
+
+    def load(self, model_name: str):
+        """Load a model and return a handle for transcribe/unload."""
+        raise NotImplementedError
+
+    def unload(self, handle):
+        """Release a loaded model."""
+
+    def transcribe(self, handle, wav_path: str, language: Optional[str] = None, translate: bool = False) -> str:
+        """
+        Transcribe a WAV file with a loaded model.
+
+        Args:
+            handle: Loaded model
+            wav_path: 16kHz mono WAV file
+            language: Spoken language code, or None for the backend's default
+            translate: Translate the speech to English instead of transcribing it
+        """
+        raise NotImplementedError
+
+    def transcribe_pcm(self, handle, windows: Iterator[Tuple[float, bytes]], language: Optional[str] = None,
+                       translate: bool = False) -> str:
+        """
+        Transcribe a stream of 16kHz mono s16le PCM windows with a loaded model.
+
+        Args:
+            handle: Loaded model
+            windows: (offset in seconds, PCM bytes) pairs, e.g. from audio_stream.pcm_windows
+            language: Spoken language code, or None for the backend's default
+            translate: Translate the speech to English instead of transcribing it
+        """
+        raise NotImplementedError
+
+    def transcribe_chunk(self, handle, offset: float, pcm: bytes, language: Optional[str] = None,
+                         translate: bool = False) -> str:
+        """
+        Transcribe one 16kHz mono s16le PCM chunk, with timestamps shifted by offset seconds.
+
+        Backends without PCM support get the chunk as a temporary WAV file.
+        """
+        if self.supports_pcm:
+            return self.transcribe_pcm(handle, iter([(offset, pcm)]), language, translate)
+        with _temporary_wav(pcm) as wav_path:
+            text = self.transcribe(handle, wav_path, language, translate)
+        segments = parse_segments(text)
+        if not segments:
+            return text.strip()
+        return format_segments(
+            [{"start": s["start_ms"] / 1000, "end": s["end_ms"] / 1000, "text": s["text"]} for s in segments], offset
+        )
+
+    def detect_language(self, handle, pcm: bytes) -> Tuple[str, float]:
+        """
+        Identify the spoken language of a 16kHz mono s16le PCM sample (whisper looks at the first 30 seconds).
+
+        Returns:
+            (language code, probability)
+        """
+        raise NotImplementedError
+
+    def estimate_memory(self, model_name: str) -> int:
+        """Approximate resident memory of a loaded model, in bytes."""
+        return 0
+
+
+@contextmanager
+def _temporary_wav(pcm: bytes) -> Iterator[str]:
+    """Write PCM to a temporary WAV file, yield its path and remove it afterwards."""
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        f.write(pcm_to_wav_bytes(pcm))
+    try:
+        yield f.name
+    finally:
+        os.remove(f.name)
+
+
+class WhisperCliBackend(TranscriptionBackend):
+    name = "cli"
+    resident = False
+
+    def __init__(self, executable: str, model_dir: str, options: Optional[List[str]] = None):
+        """
+        Runs the whisper.cpp command line tool once per request. Nothing stays
+        resident, so every request pays for loading the model from disk.
+
+        Args:
+            executable: Path to whisper-cli
+            model_dir: Directory containing ggml-<model>.bin files
+            options: Extra whisper-cli flags
+        """
+        self.executable = executable
+        self.model_dir = model_dir
+        self.options = options or []
+
+    def load(self, model_name: str):
+        return os.path.join(self.model_dir, f"ggml-{model_name}.bin")
+
+    # whisper.cpp logs "auto-detected language: ta (p = 0.912345)" to stderr
+    DETECTED_LANGUAGE = re.compile(r"auto-detected language: (\w+) \(p = ([0-9.]+)\)")
+
+    def transcribe(self, handle, wav_path: str, language: Optional[str] = None, translate: bool = False) -> str:
+        # Later flags win, so these override a language set in options
+        command = [self.executable, "-m", handle, "-f", wav_path, *self.options]
+        if language:
+            command += ["-l", language]
+        if translate:
+            command.append("-tr")
+        result = subprocess.run(command, check=True, capture_output=True, encoding="utf-8", errors="replace")
+        return result.stdout
+
+    def detect_language(self, handle, pcm: bytes) -> Tuple[str, float]:
+        with _temporary_wav(pcm) as wav_path:
+            # -dl stops after language detection
+            result = subprocess.run([self.executable, "-m", handle, "-f", wav_path, "-l", "auto", "-dl"],
+                                    check=True, capture_output=True, encoding="utf-8", errors="replace")
+        match = self.DETECTED_LANGUAGE.search(result.stderr + result.stdout)
+        if match is None:
+            raise RuntimeError("whisper-cli did not report a detected language")
+        return match.group(1), float(match.group(2))
+
+
+class WhisperServerBackend(TranscriptionBackend):
+    name = "server"
+    supports_pcm = True
+
+    def __init__(self, executable: str, model_dir: str, options: Optional[List[str]] = None,
+                 host: str = "127.0.0.1", startup_timeout: float = 120, request_timeout: float = 3600):
+        """
+        Keeps one whisper.cpp server process per model running, so the model is
+        loaded once and each request only pays for inference.
+
+        Args:
+            executable: Path to whisper-server
+            model_dir: Directory containing ggml-<model>.bin files
+            options: Extra whisper-server flags (threads, language, ...)
+            host: Interface the server processes listen on
+            startup_timeout: Seconds to wait for a server to load its model
+            request_timeout: Seconds to wait for a transcription
+        """
+        self.executable = executable
+        self.model_dir = model_dir
+        self.options = options or []
+        self.host = host
+        self.startup_timeout = startup_timeout
+        self._client = httpx.Client(timeout=httpx.Timeout(request_timeout, connect=5))
+
+    def load(self, model_name: str):
+        model_path = os.path.join(self.model_dir, f"ggml-{model_name}.bin")
+        port = self._free_port()
+        process = subprocess.Popen(
+            [self.executable, "-m", model_path, "--host", self.host, "--port", str(port), *self.options],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        url = f"http://{self.host}:{port}"
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"whisper-server exited with code {process.returncode} while loading {model_name}")
+            try:
+                self._client.get(url + "/", timeout=1)
+                return {"process": process, "url": url}
+            except httpx.TransportError:
+                time.sleep(0.2)
+        process.kill()
+        raise RuntimeError(f"whisper-server did not start within {self.startup_timeout}s for {model_name}")
+
+    def unload(self, handle):
+        handle["process"].terminate()
+        try:
+            handle["process"].wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            handle["process"].kill()
+
+    def transcribe(self, handle, wav_path: str, language: Optional[str] = None, translate: bool = False) -> str:
+        with open(wav_path, "rb") as f:
+            return self._inference(handle, os.path.basename(wav_path), f, 0.0, language, translate)
+
+    def transcribe_pcm(self, handle, windows: Iterator[Tuple[float, bytes]], language: Optional[str] = None,
+                       translate: bool = False) -> str:
+        # Each window is sent as an in-memory WAV; nothing touches the disk
+        return "\n".join(
+            text for text in (
+                self._inference(handle, "window.wav", pcm_to_wav_bytes(pcm), offset, language, translate)
+                for offset, pcm in windows
+            ) if text
+        )
+
+    def detect_language(self, handle, pcm: bytes) -> Tuple[str, float]:
+        body = self._post(handle, "sample.wav", pcm_to_wav_bytes(pcm), {"language": "auto", "detect_language": "true"})
+        language = body.get("detected_language") or body.get("language")
+        if not language:
+            raise RuntimeError("whisper-server did not report a detected language")
+        return language_code(language), float(body.get("detected_language_probability", 1.0))
+
+    def _inference(self, handle, filename: str, content, offset: float, language: Optional[str] = None,
+                   translate: bool = False) -> str:
+        fields = {}
+        if language:
+            fields["language"] = language
+        if translate:
+            fields["translate"] = "true"
+        body = self._post(handle, filename, content, fields)
+        if body.get("segments"):
+            return format_segments(body["segments"], offset)
+        return body.get("text", "").strip()
+
+    def _post(self, handle, filename: str, content, fields: Dict) -> Dict:
+        response = self._client.post(
+            handle["url"] + "/inference",
+            files={"file": (filename, content, "audio/wav")},
+            data={"response_format": "verbose_json", **fields},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def estimate_memory(self, model_name: str) -> int:
+        try:
+            return os.path.getsize(os.path.join(self.model_dir, f"ggml-{model_name}.bin"))
+        except OSError:
+            return 0
+
+    def _free_port(self) -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind((self.host, 0))
+            return s.getsockname()[1]
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    name = "openai"
+    supports_pcm = True
+
+    # Approximate resident size on CPU (fp32 weights plus working memory)
+    MODEL_MEMORY = {
+        "tiny": 400 * 1024 ** 2,
+        "base": 600 * 1024 ** 2,
+        "small": 1500 * 1024 ** 2,
+        "medium": 4 * 1024 ** 3,
+        "large": 8 * 1024 ** 3,
+    }
+
+    def __init__(self, device: str = "cpu", transcribe_options: Optional[Dict] = None):
+        """
+        In-process transcription with the openai-whisper package. Models stay
+        loaded in this process until evicted.
+
+        Args:
+            device: Torch device to run on
+            transcribe_options: Extra keyword arguments for model.transcribe
+        """
+        self.device = device
+        self.transcribe_options = transcribe_options or {}
+
+    def load(self, model_name: str):
+        import whisper
+        # openai-whisper names the latest large model "large-v3"
+        return {"model": whisper.load_model(model_name.lower(), device=self.device), "lock": threading.Lock()}
+
+    def transcribe(self, handle, wav_path: str, language: Optional[str] = None, translate: bool = False) -> str:
+        # A model instance is not safe to use from several threads at once
+        with handle["lock"]:
+            result = handle["model"].transcribe(wav_path, fp16=False, **self._options(language, translate))
+        return format_segments(result["segments"])
+
+    def transcribe_pcm(self, handle, windows: Iterator[Tuple[float, bytes]], language: Optional[str] = None,
+                       translate: bool = False) -> str:
+        lines = []
+        previous_text = None
+        options = self._options(language, translate)
+        for offset, pcm in windows:
+            with handle["lock"]:
+                result = handle["model"].transcribe(
+                    pcm_to_float32(pcm), fp16=False, initial_prompt=previous_text, **options
+                )
+            if result["segments"]:
+                lines.append(format_segments(result["segments"], offset))
+                # Carry the end of this window over as context for the next one
+                previous_text = result["text"][-200:]
+        return "\n".join(lines)
+
+    def detect_language(self, handle, pcm: bytes) -> Tuple[str, float]:
+        import whisper
+        model = handle["model"]
+        audio = whisper.pad_or_trim(pcm_to_float32(pcm))
+        mel = whisper.log_mel_spectrogram(audio, model.dims.n_mels).to(model.device)
+        with handle["lock"]:
+            _, probabilities = model.detect_language(mel)
+        language = max(probabilities, key=probabilities.get)
+        return language, float(probabilities[language])
+
+    def _options(self, language: Optional[str], translate: bool) -> Dict:
+        options = dict(self.transcribe_options)
+        if language:
+            options["language"] = language
+        if translate:
+            options["task"] = "translate"
+        return options
+
+    def estimate_memory(self, model_name: str) -> int:
+        return self.MODEL_MEMORY.get(model_name.lower().split("-")[0].split(".")[0], 2 * 1024 ** 3)
+
+
+class _LoadedModel:
+    def __init__(self, handle, memory: int):
+        self.handle = handle
+        self.memory = memory
+        self.in_use = 0
+
+
+class TranscriptionEngine:
+    def __init__(self, backend: TranscriptionBackend, fallback: Optional[TranscriptionBackend] = None,
+                 memory_budget_bytes: int = 4 * 1024 ** 3):
+        """
+        Keeps whisper models loaded between requests.
+
+        Loaded models are evicted least-recently-used first when the estimated
+        memory of all resident models exceeds the budget; models currently in
+        use are never evicted. If the backend fails, the request is retried on
+        the fallback backend.
+
+        Args:
+            backend: Primary backend
+            fallback: Backend used when the primary one fails (typically WhisperCliBackend)
+            memory_budget_bytes: Memory allowed for resident models
+        """
+        self.backend = backend
+        self.fallback = fallback
+        self.memory_budget_bytes = memory_budget_bytes
+        self.loads = 0
+        self.evictions = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[str, _LoadedModel]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def transcribe(self, wav_path: str, model_name: str, language: Optional[str] = None,
+                   translate: bool = False) -> TranscriptionResult:
+        """
+        Transcribe a 16kHz mono WAV file.
+
+        Args:
+            wav_path: Path to the WAV file
+            model_name: Whisper model name
+            language: Spoken language code, or None for the backend's default
+            translate: Translate the speech to English instead of transcribing it
+
+        Returns:
+            The transcript with model-load and inference timings
+        """
+        try:
+            return self._transcribe_with(self.backend, wav_path, model_name, True, language, translate)
+        except Exception as e:
+            if self.fallback is None:
+                raise
+            logger.warning(f"Transcription backend '{self.backend.name}' failed, "
+                           f"falling back to '{self.fallback.name}': {e}")
+            self.fallbacks += 1
+            return self._transcribe_with(self.fallback, wav_path, model_name, False, language, translate)
+
+    def detect_language(self, pcm: bytes, model_name: str) -> Tuple[str, float]:
+        """
+        Identify the spoken language of a PCM sample with a multilingual whisper model.
+
+        Args:
+            pcm: 16kHz mono s16le PCM; only the first 30 seconds are used
+            model_name: Whisper model name (not an English-only ".en" model)
+
+        Returns:
+            (language code, probability)
+        """
+        start = time.perf_counter()
+        try:
+            model = self._acquire(model_name)
+            try:
+                language, probability = self.backend.detect_language(model.handle, pcm)
+            finally:
+                self._release(model)
+        except Exception as e:
+            if self.fallback is None:
+                raise
+            logger.warning(f"Language detection with '{self.backend.name}' failed, "
+                           f"falling back to '{self.fallback.name}': {e}")
+            with self._lock:
+                self.fallbacks += 1
+            handle = self.fallback.load(model_name)
+            try:
+                language, probability = self.fallback.detect_language(handle, pcm)
+            finally:
+                self.fallback.unload(handle)
+        logger.info(f"Detected language {language} (p={probability:.2f}) with {model_name} "
+                    f"in {time.perf_counter() - start:.2f}s")
+        return language, probability
+
+    @property
+    def supports_pcm(self) -> bool:
+        """Whether the primary backend can transcribe decoded PCM without a WAV file."""
+        return self.backend.supports_pcm
+
+    def transcribe_pcm(self, windows: Iterator[Tuple[float, bytes]], model_name: str, language: Optional[str] = None,
+                       translate: bool = False) -> TranscriptionResult:
+        """
+        Transcribe a stream of PCM windows with the primary backend.
+
+        There is no fallback here because the stream cannot be replayed; callers
+        should retry through transcribe() with a WAV file if this fails.
+
+        Args:
+            windows: (offset in seconds, PCM bytes) pairs
+            model_name: Whisper model name
+            language: Spoken language code, or None for the backend's default
+            translate: Translate the speech to English instead of transcribing it
+
+        Returns:
+            The transcript with model-load and inference (including decode) timings
+        """
+        load_start = time.perf_counter()
+        model = self._acquire(model_name)
+        load_seconds = time.perf_counter() - load_start
+        inference_start = time.perf_counter()
+        audio_bytes = 0
+
+        def counted():
+            nonlocal audio_bytes
+            for offset, pcm in windows:
+                audio_bytes += len(pcm)
+                yield offset, pcm
+
+        try:
+            text = self.backend.transcribe_pcm(model.handle, counted(), language, translate)
+        finally:
+            self._release(model)
+        inference_seconds = time.perf_counter() - inference_start
+        logger.info(f"Transcribed stream with {self.backend.name}/{model_name}: "
+                    f"model load {load_seconds:.2f}s, inference {inference_seconds:.2f}s")
+        result = TranscriptionResult(text, model_name, self.backend.name, load_seconds, inference_seconds)
+        result.audio_seconds = audio_bytes / BYTES_PER_SECOND
+        return result
+
+    def transcribe_chunks(self, chunks: Iterator[Tuple[float, bytes]], model_name: str, workers: int = 1,
+                          language: Optional[str] = None, translate: bool = False) -> TranscriptionResult:
+        """
+        Transcribe independent PCM chunks (e.g. from vad.VoiceActivityDetector) in parallel
+        and stitch the transcripts back together in order.
+
+        At most 2 * workers chunks are held in memory at once. A chunk the primary
+        backend fails on is retried on the fallback backend. Backends that are not
+        resident transcribe one chunk at a time, since every chunk reloads the model.
+
+        Args:
+            chunks: (offset in seconds, PCM bytes) pairs in order
+            model_name: Whisper model name
+            workers: Chunks transcribed at once
+            language: Spoken language code, or None for the backend's default
+            translate: Translate the speech to English instead of transcribing it
+
+        Returns:
+            The transcript with model-load and wall-clock inference timings
+        """
+        if not self.backend.resident:
+            workers = 1
+        load_start = time.perf_counter()
+        model = self._acquire(model_name)
+        load_seconds = time.perf_counter() - load_start
+        inference_start = time.perf_counter()
+        texts = []
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper-chunk")
+        try:
+            for offset, pcm in chunks:
+                pending.append(executor.submit(self._transcribe_chunk, model, model_name, offset, pcm,
+                                               language, translate))
+                while len(pending) >= 2 * workers:
+                    texts.append(pending.popleft().result())
+            while pending:
+                texts.append(pending.popleft().result())
+        finally:
+            # On failure, chunks not yet started are dropped
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._release(model)
+        inference_seconds = time.perf_counter() - inference_start
+        logger.info(f"Transcribed {len(texts)} chunks with {self.backend.name}/{model_name} ({workers} workers): "
+                    f"model load {load_seconds:.2f}s, inference {inference_seconds:.2f}s")
+        return TranscriptionResult("\n".join(text for text in texts if text), model_name, self.backend.name,
+                                   load_seconds, inference_seconds)
+
+    def get_statistics(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": self.backend.name,
+                "fallback": self.fallback.name if self.fallback else None,
+                "resident_models": list(self._loaded.keys()),
+                "resident_bytes": sum(m.memory for m in self._loaded.values()),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "fallbacks": self.fallbacks,
+            }
+
+    def shutdown(self):
+        """Unload every resident model."""
+        with self._lock:
+            loaded = list(self._loaded.values())
+            self._loaded.clear()
+        for model in loaded:
+            self.backend.unload(model.handle)
+
+    def _transcribe_with(self, backend: TranscriptionBackend, wav_path: str, model_name: str, resident: bool,
+                         language: Optional[str] = None, translate: bool = False) -> TranscriptionResult:
+        load_start = time.perf_counter()
+        if resident:
+            model = self._acquire(model_name)
+            handle = model.handle
+        else:
+            handle = backend.load(model_name)
+        load_seconds = time.perf_counter() - load_start
+
+        inference_start = time.perf_counter()
+        try:
+            text = backend.transcribe(handle, wav_path, language, translate)
+        finally:
+            if resident:
+                self._release(model)
+            else:
+                backend.unload(handle)
+        inference_seconds = time.perf_counter() - inference_start
+
+        logger.info(f"Transcribed with {backend.name}/{model_name}: "
+                    f"model load {load_seconds:.2f}s, inference {inference_seconds:.2f}s")
+        result = TranscriptionResult(text, model_name, backend.name, load_seconds, inference_seconds)
+        result.audio_seconds = wav_duration_seconds(wav_path)
+        return result
+
+    def _transcribe_chunk(self, model: _LoadedModel, model_name: str, offset: float, pcm: bytes,
+                          language: Optional[str] = None, translate: bool = False) -> str:
+        try:
+            return self.backend.transcribe_chunk(model.handle, offset, pcm, language, translate)
+        except Exception as e:
+            if self.fallback is None:
+                raise
+            logger.warning(f"Transcription backend '{self.backend.name}' failed on chunk at {offset:.1f}s, "
+                           f"falling back to '{self.fallback.name}': {e}")
+            with self._lock:
+                self.fallbacks += 1
+            handle = self.fallback.load(model_name)
+            try:
+                return self.fallback.transcribe_chunk(handle, offset, pcm, language, translate)
+            finally:
+                self.fallback.unload(handle)
+
+    def _acquire(self, model_name: str) -> _LoadedModel:
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_name, threading.Lock())
+        # Only one thread loads a given model; others wait and reuse it
+        with load_lock:
+            with self._lock:
+                model = self._loaded.get(model_name)
+                if model is not None:
+                    self._loaded.move_to_end(model_name)
+                    model.in_use += 1
+                    return model
+            memory = self.backend.estimate_memory(model_name)
+            self._make_room(memory)
+            handle = self.backend.load(model_name)
+            model = _LoadedModel(handle, memory)
+            model.in_use = 1
+            with self._lock:
+                self._loaded[model_name] = model
+                self.loads += 1
+            return model
+
+    def _release(self, model: _LoadedModel):
+        with self._lock:
+            model.in_use -= 1
+
+    def _make_room(self, needed: int):
+        """Unload idle models, least recently used first, until the new model fits the budget."""
+        to_unload = []
+        with self._lock:
+            used = sum(m.memory for m in self._loaded.values())
+            for name in list(self._loaded.keys()):
+                if used + needed <= self.memory_budget_bytes:
+                    break
+                model = self._loaded[name]
+                if model.in_use:
+                    continue
+                del self._loaded[name]
+                used -= model.memory
+                self.evictions += 1
+                to_unload.append(model)
+        for model in to_unload:
+            self.backend.unload(model.handle)
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import re
+import uuid
+from typing import Tuple
+
+import aiofiles
+from fastapi import UploadFile
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+def _safe_extension(filename: str) -> str:
+    """Keep a short alphanumeric extension so ffmpeg can still guess the format."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    return extension if re.fullmatch(r"\.[a-z0-9]{1,10}", extension) else ""
+
+
+async def save_upload(upload: UploadFile, upload_dir: str, max_bytes: int,
+                      chunk_size: int = 1024 * 1024) -> Tuple[str, str, int]:
+    """
+    Stream an uploaded file to disk under a content-addressed name.
+
+    The file is copied in chunks while its SHA-256 is computed, so memory use
+    is O(chunk_size). It is written to a unique temporary name first and then
+    renamed to ``<sha256><ext>``, so concurrent uploads never overwrite each
+    other and identical uploads share one file.
+
+    Args:
+        upload: The uploaded file
+        upload_dir: Directory to store uploads in
+        max_bytes: Maximum accepted size; larger uploads are rejected as soon as the limit is crossed
+        chunk_size: Bytes read and written per step
+
+    Returns:
+        Tuple of (stored file path, SHA-256 hex digest, size in bytes)
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_bytes
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    temp_path = os.path.join(upload_dir, f".upload-{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Upload exceeds the maximum size of {max_bytes // (1024 * 1024)} MB"
+                    )
+                digest.update(chunk)
+                await f.write(chunk)
+
+        audio_hash = digest.hexdigest()
+        final_path = os.path.join(upload_dir, f"{audio_hash}{_safe_extension(upload.filename)}")
+        if os.path.exists(final_path):
+            # Same content already stored
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, final_path)
+        return final_path, audio_hash, size
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
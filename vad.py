@@ -0,0 +1,152 @@
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from audio_stream import BYTES_PER_SAMPLE, SAMPLE_RATE
+
+
+class VoiceActivityDetector:
+    def __init__(self, frame_ms: int = 30, threshold_db: float = -45.0, margin_db: float = 10.0,
+                 padding_seconds: float = 0.3, min_silence_seconds: float = 0.5,
+                 max_gap_seconds: Optional[float] = None, min_chunk_seconds: float = 30.0,
+                 max_chunk_seconds: float = 60.0,
+                 floor_rise_db_per_second: float = 1.0):
+        """
+        Energy-based voice activity detection on streamed 16kHz mono s16le PCM.
+
+        Frames louder than both threshold_db (dBFS) and the tracked noise floor
+        plus margin_db count as speech. Speech is grouped into chunks that end at
+        a pause of at least min_silence_seconds once they are min_chunk_seconds
+        long (or at any pause of max_gap_seconds, if set); audio between chunks
+        is dropped. Chunks longer than max_chunk_seconds are split at their
+        quietest frame.
+
+        whisper pads every chunk to 30 seconds, so shorter chunks cost as much
+        as full ones: pauses inside a chunk shorter than min_chunk_seconds are
+        kept rather than cut, and only silence between chunks is skipped.
+
+        One instance handles one stream; audio_seconds, speech_seconds and
+        chunk_count describe it once split() is exhausted.
+
+        Args:
+            frame_ms: Analysis frame length
+            threshold_db: Frames quieter than this (dBFS) are never speech
+            margin_db: How far above the noise floor speech must be
+            padding_seconds: Audio kept before and after each speech region
+            min_silence_seconds: Shortest pause a chunk may end at
+            max_gap_seconds: Pauses this long always end a chunk (None: only once it is min_chunk_seconds long)
+            min_chunk_seconds: Chunks shorter than this only end at max_gap_seconds pauses
+            max_chunk_seconds: Longest chunk emitted
+            floor_rise_db_per_second: How quickly the noise floor follows a louder background
+        """
+        self.frame_samples = SAMPLE_RATE * frame_ms // 1000
+        self.frame_seconds = self.frame_samples / SAMPLE_RATE
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.padding_frames = self._frames(padding_seconds)
+        self.min_silence_frames = self._frames(min_silence_seconds)
+        self.max_gap_frames = self._frames(max_gap_seconds) if max_gap_seconds is not None else None
+        self.min_chunk_frames = self._frames(min_chunk_seconds)
+        self.max_chunk_frames = self._frames(max_chunk_seconds)
+        self.floor_rise_db = floor_rise_db_per_second * self.frame_seconds
+        self.audio_seconds = 0.0
+        self.speech_seconds = 0.0
+        self.chunk_count = 0
+
+    @property
+    def skipped_seconds(self) -> float:
+        return self.audio_seconds - self.speech_seconds
+
+    def frame_energies(self, pcm: bytes) -> np.ndarray:
+        """RMS energy in dBFS of each whole frame in pcm."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        frames = samples[:len(samples) - len(samples) % self.frame_samples].reshape(-1, self.frame_samples)
+        power = np.mean(np.square(frames, dtype=np.float64), axis=1) / (32768.0 ** 2)
+        return 10 * np.log10(power + 1e-12)
+
+    def split(self, chunks: Iterator[bytes]) -> Iterator[Tuple[float, bytes]]:
+        """
+        Drop silence from a PCM stream and yield the speech in chunks.
+
+        Args:
+            chunks: PCM buffers, e.g. from audio_stream.stream_pcm
+
+        Yields:
+            (offset in seconds of the chunk's start in the original audio, PCM bytes)
+        """
+        frame_bytes = self.frame_samples * BYTES_PER_SAMPLE
+        buffer = bytearray()  # PCM from frame buffer_start onwards
+        buffer_start = 0
+        energies: List[float] = []  # Energies of the frames in buffer
+        frame = 0  # Index of the next frame to classify
+        floor = None
+        chunk_start = None
+        last_speech = None
+        emitted_until = 0
+
+        def emit(start: int, end: int):
+            data = bytes(buffer[(start - buffer_start) * frame_bytes:(end - buffer_start) * frame_bytes])
+            self.speech_seconds += len(data) / (SAMPLE_RATE * BYTES_PER_SAMPLE)
+            self.chunk_count += 1
+            return start * self.frame_seconds, data
+
+        def trim(keep_from: int):
+            nonlocal buffer_start
+            if keep_from > buffer_start:
+                del buffer[:(keep_from - buffer_start) * frame_bytes]
+                del energies[:keep_from - buffer_start]
+                buffer_start = keep_from
+
+        for chunk in chunks:
+            self.audio_seconds += len(chunk) / (SAMPLE_RATE * BYTES_PER_SAMPLE)
+            classified_bytes = (frame - buffer_start) * frame_bytes
+            buffer.extend(chunk)
+            new_energies = self.frame_energies(bytes(buffer[classified_bytes:]))
+            energies.extend(new_energies.tolist())
+            for energy in new_energies:
+                floor = energy if floor is None else min(energy, floor + self.floor_rise_db)
+                if energy > max(self.threshold_db, floor + self.margin_db):
+                    if chunk_start is None:
+                        chunk_start = max(emitted_until, buffer_start, frame - self.padding_frames)
+                    last_speech = frame
+                frame += 1
+                if chunk_start is None:
+                    continue
+
+                gap = frame - 1 - last_speech
+                length = frame - chunk_start
+                long_gap = self.max_gap_frames is not None and gap >= self.max_gap_frames
+                if long_gap or (gap >= self.min_silence_frames and length >= self.min_chunk_frames):
+                    end = min(last_speech + 1 + self.padding_frames, frame)
+                    yield emit(chunk_start, end)
+                    emitted_until, chunk_start = end, None
+                elif length >= self.max_chunk_frames:
+                    # Cut at the quietest frame of the chunk's last quarter
+                    search_from = frame - max(1, length // 4)
+                    window = energies[search_from - buffer_start:frame - buffer_start]
+                    end = search_from + int(np.argmin(window)) + 1
+                    yield emit(chunk_start, end)
+                    emitted_until, chunk_start = end, end
+                    if last_speech < end:
+                        chunk_start = None
+
+            if chunk_start is not None:
+                trim(chunk_start)
+            else:
+                trim(max(emitted_until, frame - self.padding_frames))
+
+        if chunk_start is not None:
+            end = min(last_speech + 1 + self.padding_frames, frame)
+            # Include a trailing partial frame when the speech runs to the end
+            if end == frame:
+                data_end = len(buffer)
+                start_byte = (chunk_start - buffer_start) * frame_bytes
+                data = bytes(buffer[start_byte:data_end])
+                self.speech_seconds += len(data) / (SAMPLE_RATE * BYTES_PER_SAMPLE)
+                self.chunk_count += 1
+                yield chunk_start * self.frame_seconds, data
+            else:
+                yield emit(chunk_start, end)
+
+    def _frames(self, seconds: float) -> int:
+        return max(1, int(round(seconds / self.frame_seconds)))